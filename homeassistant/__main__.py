@@ -119,6 +119,16 @@ def get_arguments() -> argparse.Namespace:
         help="Skip pip install of specific packages on startup",
     )
 
+    parser.add_argument(
+        "--compact-storage",
+        action="store_true",
+        help="Store the registries in a compact encoding instead of plain JSON",
+    )
+    parser.add_argument(
+        "--preimport-integrations",
+        action="store_true",
+        help="Import the integrations on a separate pool of threads while setting up",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging to file."
     )
@@ -196,6 +206,8 @@ def main() -> int:
         log_no_color=args.log_no_color,
         skip_pip=args.skip_pip,
         skip_pip_packages=args.skip_pip_packages,
+        compact_storage=args.compact_storage,
+        preimport_integrations=args.preimport_integrations,
         recovery_mode=args.recovery_mode,
         debug=args.debug,
         open_ui=args.open_ui,
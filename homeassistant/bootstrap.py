@@ -83,6 +83,7 @@ from .helpers import (
     restore_state,
     template,
     translation,
+    warm_start,
 )
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.storage import get_internal_store_manager
@@ -91,6 +92,10 @@ from .helpers.typing import ConfigType
 from .setup import (
     BASE_PLATFORMS,
     DATA_SETUP_STARTED,
+    SetupPhases,
+    SetupTimelineSpan,
+    async_add_setup_timeline_span,
+    async_get_setup_critical_path,
     async_get_setup_timings,
     async_notify_setup_error,
     async_set_domains_to_be_loaded,
@@ -256,6 +261,8 @@ async def async_setup_hass(
     hass.config.safe_mode = runtime_config.safe_mode
     hass.config.skip_pip = runtime_config.skip_pip
     hass.config.skip_pip_packages = runtime_config.skip_pip_packages
+    hass.config.compact_storage = runtime_config.compact_storage
+    hass.config.preimport_integrations = runtime_config.preimport_integrations
     if runtime_config.skip_pip or runtime_config.skip_pip_packages:
         _LOGGER.warning(
             "Skipping pip installation of required modules. This may cause issues"
@@ -383,7 +390,8 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
     entity.async_setup(hass)
     template.async_setup(hass)
     await asyncio.gather(
-        create_eager_task(get_internal_store_manager(hass).async_initialize()),
+        # The registries which are in the warm start snapshot wait for it
+        create_eager_task(warm_start.async_load(hass)),
         create_eager_task(area_registry.async_load(hass)),
         create_eager_task(category_registry.async_load(hass)),
         create_eager_task(device_registry.async_load(hass)),
@@ -391,6 +399,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(floor_registry.async_load(hass)),
         create_eager_task(issue_registry.async_load(hass)),
         create_eager_task(label_registry.async_load(hass)),
+        create_eager_task(loader.async_load_integration_index(hass)),
         hass.async_add_executor_job(_cache_uname_processor),
         create_eager_task(template.async_load_custom_templates(hass)),
         create_eager_task(restore_state.async_load(hass)),
@@ -895,16 +904,74 @@ async def _async_resolve_domains_to_setup(
     # so we do not have to wait for it to be loaded when we need it
     # in the setup process.
     hass.async_create_background_task(
-        get_internal_store_manager(hass).async_preload(
-            [*PRELOAD_STORAGE, *domains_to_setup]
-        ),
+        _async_preload_storage(hass, [*PRELOAD_STORAGE, *domains_to_setup]),
         "preload storage",
         eager_start=True,
     )
 
+    # When enabled, import the integrations we are going to set up and the
+    # platforms used in the configuration ahead of time on a separate pool
+    # of threads, so their setup does not have to wait in line for the
+    # import executor. It is opt-in as importing on several threads can
+    # run into import lock deadlocks and has not shown a speedup yet.
+    if hass.config.preimport_integrations:
+        platforms: defaultdict[str, set[str]] = defaultdict(set)
+        for base_platform, platform_domains in platform_integrations.items():
+            for platform_domain in platform_domains:
+                platforms[platform_domain].add(base_platform)
+        hass.async_create_background_task(
+            _async_preimport_integrations(
+                hass,
+                [
+                    integration_cache[domain]
+                    for domain in domains_to_setup
+                    if domain in integration_cache
+                ],
+                platforms,
+            ),
+            "preimport integrations",
+            eager_start=True,
+        )
+
     return domains_to_setup, integration_cache
 
 
+async def _async_preimport_integrations(
+    hass: core.HomeAssistant,
+    integrations: list[loader.Integration],
+    platforms: dict[str, set[str]],
+) -> None:
+    """Pre-import integrations and log the import lock contention."""
+    stats = await loader.async_preimport_integrations(hass, integrations, platforms)
+    _LOGGER.debug(
+        "Pre-imported %s modules in %.2fs, %s failed, %s waited %.2fs for imports"
+        " in other threads",
+        stats.modules,
+        stats.duration,
+        stats.failed,
+        stats.contended,
+        stats.contended_wait,
+    )
+
+
+async def _async_preload_storage(hass: core.HomeAssistant, keys: list[str]) -> None:
+    """Preload storage and add the time it took to the setup timeline."""
+    manager = get_internal_store_manager(hass)
+    await manager.async_preload(keys)
+    for key, (started, finished, size) in manager.async_get_preload_timings().items():
+        async_add_setup_timeline_span(
+            hass,
+            SetupTimelineSpan(
+                "storage",
+                key,
+                SetupPhases.PRELOAD_STORAGE,
+                started,
+                finished,
+                {"size": size},
+            ),
+        )
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> None:
@@ -1016,3 +1083,10 @@ async def _async_set_up_integrations(
             "Integration setup times: %s",
             dict(sorted(setup_time.items(), key=itemgetter(1), reverse=True)),
         )
+        _LOGGER.debug(
+            "Integration setup critical path: %s",
+            " -> ".join(
+                f"{step['domain']} ({step['end'] - step['start']:.2f}s)"
+                for step in async_get_setup_critical_path(hass)
+            ),
+        )
@@ -7,7 +7,7 @@ from collections.abc import Callable, Iterable, MutableMapping
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
-from typing import Any, cast
+from typing import Any
 
 import voluptuous as vol
 
@@ -35,7 +35,7 @@ from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
@@ -63,35 +63,116 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_stream)
 
 
+def _significant_states_json(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> tuple[json_fragment, float]:
+    """Convert the significant states to json while they are fetched.
+
+    Only the json of the states is kept in memory, each batch of states is
+    released as soon as it is converted. Returns the json fragment of the
+    states by entity_id and the timestamp of the last state.
+    """
+    buffer = bytearray(b"{")
+    last_time_ts = 0.0
+    current_entity_id: str | None = None
+    for entity_id, states in history.stream_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    ):
+        if entity_id == current_entity_id:
+            buffer += b","
+        else:
+            if current_entity_id is not None:
+                buffer += b"],"
+            current_entity_id = entity_id
+            buffer += json_bytes(entity_id)
+            buffer += b":["
+        # Add the states without the brackets of the list
+        buffer += memoryview(json_bytes(states))[1:-1]
+        last_time_ts = max(last_time_ts, states[-1][COMPRESSED_STATE_LAST_UPDATED])
+    if current_entity_id is not None:
+        buffer += b"]"
+    buffer += b"}"
+    return json_fragment(bytes(buffer)), last_time_ts
+
+
 def _ws_get_significant_states(
     hass: HomeAssistant,
     msg_id: int,
     start_time: dt,
     end_time: dt | None,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
+    states, _ = _significant_states_json(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    )
+    return json_bytes(messages.result_message(msg_id, states))
+
+
+def _ws_get_downsampled_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    resolution: int,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> bytes:
+    """Fetch history states downsampled to a resolution and convert them to json.
+
+    Falls back to the significant states if no history tier matches the resolution.
+    """
+    states = history.get_downsampled_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        resolution,
+        include_start_time_state,
+        significant_changes_only,
+        no_attributes,
+    )
+    if states is None:
+        return _ws_get_significant_states(
+            hass,
             msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
         )
-    )
+    return json_bytes(messages.result_message(msg_id, states))
 
 
 @websocket_api.websocket_command(
@@ -104,6 +185,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("resolution"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -155,9 +237,28 @@ async def ws_get_history_during_period(
 
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
+    instance = get_instance(hass)
+
+    if resolution := msg.get("resolution"):
+        connection.send_message(
+            await instance.async_add_read_executor_job(
+                _ws_get_downsampled_states,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                entity_ids,
+                resolution,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
+        return
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await instance.async_add_read_executor_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -173,7 +274,7 @@ async def ws_get_history_during_period(
 
 
 def _generate_stream_message(
-    states: MutableMapping[str, list[dict[str, Any]]],
+    states: MutableMapping[str, list[dict[str, Any]]] | json_fragment,
     start_day: dt,
     end_day: dt,
 ) -> dict[str, Any]:
@@ -201,7 +302,7 @@ def _generate_websocket_response(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    states: MutableMapping[str, list[dict[str, Any]]],
+    states: MutableMapping[str, list[dict[str, Any]]] | json_fragment,
 ) -> bytes:
     """Generate a websocket response."""
     return json_bytes(
@@ -216,7 +317,7 @@ def _generate_historical_response(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
@@ -224,29 +325,16 @@ def _generate_historical_response(
     send_empty: bool,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
-    states = cast(
-        MutableMapping[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    states, last_time_ts = _significant_states_json(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
-    last_time_ts = 0.0
-    for state_list in states.values():
-        if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
-        ):
-            last_time_ts = cast(float, state_last_time)
 
     if last_time_ts == 0:
         # If we did not send any states ever, we need to send an empty response
@@ -271,7 +359,7 @@ async def _async_send_historical_states(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    entity_ids: list[str] | None,
+    entity_ids: list[str],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
@@ -280,7 +368,7 @@ async def _async_send_historical_states(
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+    last_time_ts, last_time_dt, payload = await instance.async_add_read_executor_job(
         _generate_historical_response,
         hass,
         msg_id,
@@ -22,7 +22,13 @@ from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.setup import (
+    async_get_setup_critical_path,
+    async_get_setup_trace_events,
+)
+from homeassistant.util.file import write_utf8_file
 
 from .const import DOMAIN
 
@@ -37,6 +43,7 @@ SERVICE_LRU_STATS = "lru_stats"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
+SERVICE_DUMP_SETUP_TIMELINE = "dump_setup_timeline"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -59,6 +66,7 @@ SERVICES = (
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
+    SERVICE_DUMP_SETUP_TIMELINE,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -270,6 +278,31 @@ async def async_setup_entry(  # noqa: C901
             base_logger.setLevel(logging.INFO)
         hass.loop.set_debug(enabled)
 
+    async def _async_dump_setup_timeline(call: ServiceCall) -> None:
+        """Write the startup timeline in the Trace Event Format."""
+        start_time = int(time.time() * 1000000)
+        critical_path = async_get_setup_critical_path(hass)
+        timeline_path = hass.config.path(f"setup_timeline.{start_time}.json")
+        await hass.async_add_executor_job(
+            write_utf8_file,
+            timeline_path,
+            json_dumps(
+                {
+                    **async_get_setup_trace_events(hass),
+                    "otherData": {"critical_path": critical_path},
+                }
+            ),
+        )
+        persistent_notification.async_create(
+            hass,
+            (
+                f"Wrote startup timeline to {timeline_path}. The critical path was:"
+                f" {' -> '.join(step['domain'] for step in critical_path)}"
+            ),
+            title="Startup timeline",
+            notification_id=f"profiler_setup_timeline_{start_time}",
+        )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -372,6 +405,13 @@ async def async_setup_entry(  # noqa: C901
         schema=vol.Schema({vol.Optional(CONF_ENABLED, default=True): cv.boolean}),
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_DUMP_SETUP_TIMELINE,
+        _async_dump_setup_timeline,
+    )
+
     return True
 
 
@@ -37,6 +37,7 @@ from .const import (  # noqa: F401
     SupportedDialect,
 )
 from .core import Recorder
+from .partitions import PARTITION_INTERVALS
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -60,6 +61,12 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_COMPACT_NUMERIC_STATES = "compact_numeric_states"
+CONF_PURGE_RATE = "purge_rate"
+CONF_PARTITION_INTERVAL = "partition_interval"
+CONF_DB_READ_URL = "db_read_url"
+CONF_DB_READ_WORKERS = "db_read_workers"
+CONF_HISTORY_TIERS = "history_tiers"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -112,6 +119,18 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_COMPACT_NUMERIC_STATES, default=False
+                    ): cv.boolean,
+                    vol.Optional(CONF_PURGE_RATE): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                    vol.Optional(CONF_PARTITION_INTERVAL): vol.In(PARTITION_INTERVALS),
+                    vol.Optional(CONF_DB_READ_URL): vol.All(cv.string, validate_db_url),
+                    vol.Optional(CONF_DB_READ_WORKERS): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                    vol.Optional(CONF_HISTORY_TIERS, default=False): cv.boolean,
                 }
             ),
         )
@@ -142,6 +161,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    compact_numeric_states = conf[CONF_COMPACT_NUMERIC_STATES]
+    purge_rate = conf.get(CONF_PURGE_RATE)
+    partition_interval = PARTITION_INTERVALS.get(conf.get(CONF_PARTITION_INTERVAL, ""))
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
@@ -161,9 +183,16 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        compact_numeric_states=compact_numeric_states,
+        purge_rate=purge_rate,
+        partition_interval=partition_interval,
+        read_uri=conf.get(CONF_DB_READ_URL),
+        read_workers=conf.get(CONF_DB_READ_WORKERS),
+        history_tiers=conf[CONF_HISTORY_TIERS],
     )
     instance.async_initialize()
     instance.async_register()
+    await instance.async_load_state_attributes_index()
     instance.start()
     async_register_services(hass, instance)
     websocket_api.async_setup(hass)
@@ -0,0 +1,254 @@
+"""Write states in bulk without creating ORM objects.
+
+Creating a States object, and StatesMeta and StateAttributes objects when
+needed, for every state_changed event and letting the session flush them
+at the commit dominates the time the recorder thread spends on busy
+systems.
+
+Instead, the column values of the states are buffered until the commit,
+the metadata_ids and attributes_ids of all of them are resolved with a
+single lookup each, and the new rows are written with multi row
+INSERT ... RETURNING statements. The old_state_id of a state whose
+previous state is in the same commit is only known once the previous
+state was written, so the states are written in generations: the first
+state of each entity, then the second state of each entity and so on.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event
+
+from .db_schema import StateAttributes, States, StatesMeta
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+# We need to cast __table__ to Table, explanation in
+# https://github.com/sqlalchemy/sqlalchemy/issues/9130
+_STATES_TABLE = cast(Table, States.__table__)
+_STATES_META_TABLE = cast(Table, StatesMeta.__table__)
+_STATE_ATTRIBUTES_TABLE = cast(Table, StateAttributes.__table__)
+
+
+class _PendingState:
+    """A state which is waiting for the next commit."""
+
+    __slots__ = (
+        "entity_id",
+        "values",
+        "shared_attrs",
+        "shared_attrs_bytes",
+        "removed",
+        "previous",
+        "generation",
+        "state_id",
+    )
+
+    def __init__(
+        self, entity_id: str, values: dict[str, Any], shared_attrs_bytes: bytes
+    ) -> None:
+        """Initialize the pending state."""
+        self.entity_id = entity_id
+        self.values = values
+        self.shared_attrs = shared_attrs_bytes.decode("utf-8")
+        self.shared_attrs_bytes = shared_attrs_bytes
+        self.removed = False
+        self.previous: _PendingState | None = None
+        self.generation = 0
+        self.state_id: int | None = None
+
+
+class StatesBulkWriter:
+    """Buffer states and write them in bulk when the event session is committed."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the states bulk writer."""
+        self.recorder = recorder
+        self._pending: list[_PendingState] = []
+        # The last pending state of each entity that was not removed,
+        # which becomes the old state of the next state of the entity
+        self._last_pending: dict[str, _PendingState] = {}
+        # The ids of the rows inserted while writing, which are only
+        # added to the caches of the table managers after the commit
+        self._new_metadata_ids: dict[str, int] = {}
+        self._new_attributes_ids: dict[str, int] = {}
+
+    def add(self, event: Event, shared_attrs_bytes: bytes) -> None:
+        """Add a state_changed event to be written at the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        entity_id: str = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        states_manager = self.recorder.states_manager
+        values = States.values_from_event(event)
+        pending = _PendingState(entity_id, values, shared_attrs_bytes)
+
+        if previous := self._last_pending.pop(entity_id, None):
+            pending.previous = previous
+            pending.generation = previous.generation + 1
+            if old_state:
+                previous.values["last_reported_ts"] = old_state.last_reported_timestamp
+        elif old_state_id := states_manager.pop_committed(entity_id):
+            values["old_state_id"] = old_state_id
+            if old_state:
+                states_manager.update_pending_last_reported(
+                    old_state_id, old_state.last_reported_timestamp
+                )
+
+        if event.data.get("new_state") is None:
+            pending.removed = True
+            values["state"] = None
+        else:
+            self._last_pending[entity_id] = pending
+
+        if self.recorder.states_meta_manager.active:
+            values["entity_id"] = None
+
+        self._pending.append(pending)
+
+    def write(self, session: Session) -> None:
+        """Write the pending states with the connection of the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        with session.no_autoflush:
+            metadata_ids = self._resolve_metadata_ids(session)
+            attributes_ids = self._resolve_attributes_ids(session)
+
+            generations: list[list[_PendingState]] = []
+            for pending in self._pending:
+                if (metadata_id := metadata_ids.get(pending.entity_id)) is None:
+                    # The entity was removed and it either never existed
+                    # or was just renamed, so there is nothing to record
+                    continue
+                pending.values["metadata_id"] = metadata_id
+                pending.values["attributes_id"] = attributes_ids[pending.shared_attrs]
+                while len(generations) <= pending.generation:
+                    generations.append([])
+                generations[pending.generation].append(pending)
+
+            for generation in generations:
+                for pending in generation:
+                    if pending.previous is not None:
+                        pending.values["old_state_id"] = pending.previous.state_id
+                state_ids = session.execute(
+                    insert(_STATES_TABLE).returning(
+                        _STATES_TABLE.c.state_id, sort_by_parameter_order=True
+                    ),
+                    [pending.values for pending in generation],
+                ).scalars()
+                for pending, state_id in zip(generation, state_ids, strict=True):
+                    pending.state_id = state_id
+
+    def _resolve_metadata_ids(self, session: Session) -> dict[str, int | None]:
+        """Resolve the metadata_ids of the pending states and insert missing ones."""
+        states_meta_manager = self.recorder.states_meta_manager
+        metadata_ids = states_meta_manager.get_many(
+            {pending.entity_id for pending in self._pending}, session, True
+        )
+        # If the entity was removed, we don't need to add it to the
+        # StatesMeta table if it does not have a metadata_id allocated
+        missing = list(
+            {
+                pending.entity_id: None
+                for pending in self._pending
+                if metadata_ids[pending.entity_id] is None
+                and not (states_meta_manager.active and pending.removed)
+            }
+        )
+        self._new_metadata_ids = {}
+        if missing:
+            new_metadata_ids = session.execute(
+                insert(_STATES_META_TABLE).returning(
+                    _STATES_META_TABLE.c.metadata_id, sort_by_parameter_order=True
+                ),
+                [{"entity_id": entity_id} for entity_id in missing],
+            ).scalars()
+            self._new_metadata_ids = dict(zip(missing, new_metadata_ids, strict=True))
+            metadata_ids.update(self._new_metadata_ids)
+        return metadata_ids
+
+    def _resolve_attributes_ids(self, session: Session) -> dict[str, int]:
+        """Resolve the attributes_ids of the pending states and insert missing ones."""
+        state_attributes_manager = self.recorder.state_attributes_manager
+        attributes_ids: dict[str, int] = {}
+        missing: dict[str, int] = {}
+        for pending in self._pending:
+            shared_attrs = pending.shared_attrs
+            if shared_attrs in attributes_ids or shared_attrs in missing:
+                continue
+            if (
+                attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
+            ) is not None:
+                attributes_ids[shared_attrs] = attributes_id
+            else:
+                missing[shared_attrs] = StateAttributes.hash_shared_attrs_bytes(
+                    pending.shared_attrs_bytes
+                )
+
+        self._new_attributes_ids = {}
+        if not missing:
+            return attributes_ids
+
+        to_insert: list[dict[str, Any]] = []
+        found = state_attributes_manager.get_many(missing.items(), session)
+        for shared_attrs, data_hash in missing.items():
+            if (attributes_id := found.get(shared_attrs)) is not None:
+                attributes_ids[shared_attrs] = attributes_id
+            else:
+                to_insert.append({"shared_attrs": shared_attrs, "hash": data_hash})
+        if to_insert:
+            new_attributes_ids = session.execute(
+                insert(_STATE_ATTRIBUTES_TABLE).returning(
+                    _STATE_ATTRIBUTES_TABLE.c.attributes_id,
+                    sort_by_parameter_order=True,
+                ),
+                to_insert,
+            ).scalars()
+            self._new_attributes_ids = {
+                row["shared_attrs"]: attributes_id
+                for row, attributes_id in zip(
+                    to_insert, new_attributes_ids, strict=True
+                )
+            }
+            attributes_ids.update(self._new_attributes_ids)
+        return attributes_ids
+
+    def post_commit(self) -> None:
+        """Call after commit to load the ids of the written rows into the caches.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        states_manager = self.recorder.states_manager
+        for entity_id, pending in self._last_pending.items():
+            if pending.state_id is not None:
+                states_manager.add_committed(entity_id, pending.state_id)
+        states_meta_manager = self.recorder.states_meta_manager
+        for entity_id, metadata_id in self._new_metadata_ids.items():
+            states_meta_manager.add_committed(entity_id, metadata_id)
+        state_attributes_manager = self.recorder.state_attributes_manager
+        for shared_attrs, attributes_id in self._new_attributes_ids.items():
+            state_attributes_manager.add_committed(shared_attrs, attributes_id)
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+        self._last_pending.clear()
+        self._new_metadata_ids = {}
+        self._new_attributes_ids = {}
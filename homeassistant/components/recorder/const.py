@@ -21,6 +21,10 @@ DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
+# The attributes_ids which were cached when the recorder was stopped
+STATE_ATTRIBUTES_INDEX_STORAGE_KEY = "recorder.state_attributes_index"
+STATE_ATTRIBUTES_INDEX_STORAGE_VERSION = 1
+
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 ESTIMATED_QUEUE_ITEM_SIZE = 10240
 QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY = 0.65
@@ -40,6 +44,7 @@ SQLITE_MODERN_MAX_BIND_VARS = 4000
 DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
+DB_READER_PREFIX = "DbReader"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
@@ -50,21 +55,27 @@ ATTR_APPLY_FILTER = "apply_filter"
 KEEPALIVE_TIME = 30
 
 STATISTICS_ROWS_SCHEMA_VERSION = 23
+STATE_ATTRIBUTES_SCHEMA_VERSION = 25
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+STATES_NUMERIC_CHUNKS_SCHEMA_VERSION = 44
+HISTORY_TIERS_SCHEMA_VERSION = 45
+STATISTICS_ROLLUPS_SCHEMA_VERSION = 46
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
 INTEGRATION_PLATFORM_COMPILE_STATISTICS = "compile_statistics"
 INTEGRATION_PLATFORM_VALIDATE_STATISTICS = "validate_statistics"
 INTEGRATION_PLATFORM_LIST_STATISTIC_IDS = "list_statistic_ids"
+INTEGRATION_PLATFORM_RECORD_STATE_CHANGED = "record_state_changed"
 
 INTEGRATION_PLATFORMS_LOAD_IN_RECORDER_THREAD = {
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_VALIDATE_STATISTICS,
     INTEGRATION_PLATFORM_LIST_STATISTIC_IDS,
+    INTEGRATION_PLATFORM_RECORD_STATE_CHANGED,
 }
 
 
@@ -37,15 +37,20 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
+from homeassistant.util.executor import InterruptibleThreadPoolExecutor
 
-from . import migration, statistics
+from . import migration, numeric_chunks, partitions, statistics
+from .bulk_insert import StatesBulkWriter
 from .const import (
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     DOMAIN,
     ESTIMATED_QUEUE_ITEM_SIZE,
+    HISTORY_TIERS_SCHEMA_VERSION,
     KEEPALIVE_TIME,
     LAST_REPORTED_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
@@ -57,6 +62,10 @@ from .const import (
     QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
+    STATE_ATTRIBUTES_INDEX_STORAGE_KEY,
+    STATE_ATTRIBUTES_INDEX_STORAGE_VERSION,
+    STATE_ATTRIBUTES_SCHEMA_VERSION,
+    STATES_NUMERIC_CHUNKS_SCHEMA_VERSION,
     STATISTICS_ROWS_SCHEMA_VERSION,
     SupportedDialect,
 )
@@ -76,11 +85,14 @@ from .db_schema import (
     StatisticsShortTerm,
 )
 from .executor import DBInterruptibleThreadPoolExecutor
+from .group_commit import GroupCommit
+from .history_tiers import HistoryTiersManager, has_tiers
 from .migration import (
     EntityIDMigration,
     EventsContextIDMigration,
     EventTypeIDMigration,
     StatesContextIDMigration,
+    StatisticsRollupsMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
@@ -93,11 +105,13 @@ from .table_managers.states import StatesManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
+    AddPartitionsTask,
     AdjustLRUSizeTask,
     AdjustStatisticsTask,
     ChangeStatisticsUnitTask,
     ClearStatisticsTask,
     CommitTask,
+    CompactNumericStatesTask,
     CompileMissingStatisticsTask,
     DatabaseLockTask,
     EntityIDPostMigrationTask,
@@ -107,6 +121,7 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    StatisticsRollupsTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -114,11 +129,13 @@ from .tasks import (
     UpdateStatisticsMetadataTask,
     WaitTask,
 )
+from .throttled_purge import ThrottledPurge
 from .util import (
     async_create_backup_failure_issue,
     build_mysqldb_conv,
     dburl_to_path,
     end_incomplete_runs,
+    execute_on_connection,
     execute_stmt_lambda_element,
     get_index_by_name,
     is_second_sunday,
@@ -156,6 +173,27 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
+MYSQL_URL_PREFIXES = (
+    MARIADB_URL_PREFIX,
+    MARIADB_PYMYSQL_URL_PREFIX,
+    MYSQLDB_URL_PREFIX,
+    MYSQLDB_PYMYSQL_URL_PREFIX,
+)
+
+
+def _mysql_connect_args(db_url: str) -> dict[str, Any]:
+    """Return the connect args of a MySQL or MariaDB database."""
+    connect_args: dict[str, Any] = {"charset": "utf8mb4"}
+    if db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
+        # If they have configured MySQLDB but don't have
+        # the MySQLDB module installed this will throw
+        # an ImportError which we suppress here since
+        # sqlalchemy will give them a better error when
+        # it tried to import it below.
+        with contextlib.suppress(ImportError):
+            connect_args["conv"] = build_mysqldb_conv()
+    return connect_args
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
@@ -174,6 +212,12 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_event_types: set[str],
+        compact_numeric_states: bool = False,
+        purge_rate: int | None = None,
+        partition_interval: timedelta | None = None,
+        read_uri: str | None = None,
+        read_workers: int | None = None,
+        history_tiers: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -183,13 +227,40 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.compact_numeric_states = compact_numeric_states
+        # Purge continuously within a budget of rows per second if set
+        self.throttled_purge = (
+            ThrottledPurge(hass, self, purge_rate) if purge_rate else None
+        )
+        self.partition_interval = partition_interval
+        # Set once connected if the states and events tables are partitioned
+        self.partitioned_tables = False
+        # If any states were compacted, history queries also read the chunks
+        self.numeric_chunks_recorded = False
+        # Aggregate the written states into the history tiers if enabled
+        self.history_tiers = HistoryTiersManager(self) if history_tiers else None
+        # If any history tiers were recorded, purge also deletes them
+        self.history_tiers_recorded = False
+        # Set once the daily and monthly rollups of the statistics are complete
+        self.statistics_rollups_active = False
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        self.group_commit = GroupCommit(commit_interval)
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        # History, logbook and statistics queries use a separate engine
+        # and executor if a read url or a number of read workers is set
+        self.db_read_url = read_uri
+        self.db_read_workers = read_workers or MAX_DB_EXECUTOR_WORKERS
+        self.use_read_engine = bool(read_uri) or (
+            bool(read_workers) and not self._using_memory_sqlite
+        )
+        self.read_engine: Engine | None = None
+        self._get_read_session: Callable[[], Session] | None = None
+        self._db_read_executor: InterruptibleThreadPoolExecutor | None = None
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -208,6 +279,9 @@ class Recorder(threading.Thread):
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # The platforms which are fed the state changed events
+        # written by the recorder, in the recorder thread
+        self.state_changed_platforms: list[Callable[[HomeAssistant, Event], None]] = []
 
         self.schema_version = 0
         self._commits_without_expire = 0
@@ -220,6 +294,17 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self._state_attributes_index_store = Store[dict[str, list[int]]](
+            hass,
+            STATE_ATTRIBUTES_INDEX_STORAGE_VERSION,
+            STATE_ATTRIBUTES_INDEX_STORAGE_KEY,
+            private=True,
+        )
+        self._state_attributes_index: list[int] | None = None
+        self.states_bulk_writer = StatesBulkWriter(self)
+        # Set once connected if the database supports writing
+        # the states with the states bulk writer
+        self.bulk_insert_states = False
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
@@ -234,7 +319,6 @@ class Recorder(threading.Thread):
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
         self._keep_alive_listener: CALLBACK_TYPE | None = None
-        self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
         self._dialect_name: SupportedDialect | None = None
@@ -257,6 +341,11 @@ class Recorder(threading.Thread):
         """Return the dialect the recorder uses."""
         return self._dialect_name
 
+    @property
+    def _using_memory_sqlite(self) -> bool:
+        """Short version to check if we are using an in-memory sqlite3 database."""
+        return self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url
+
     @property
     def _using_file_sqlite(self) -> bool:
         """Short version to check if we are using sqlite3 as a file."""
@@ -275,6 +364,16 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for read only queries.
+
+        The session is bound to the read engine if there is one, except in
+        the recorder thread which has to see its own writes.
+        """
+        if self._get_read_session is None or threading.get_ident() == self.thread_id:
+            return self.get_session()
+        return self._get_read_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
@@ -291,6 +390,11 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        if self.use_read_engine:
+            self._db_read_executor = InterruptibleThreadPoolExecutor(
+                thread_name_prefix=DB_READER_PREFIX,
+                max_workers=self.db_read_workers,
+            )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
@@ -364,8 +468,24 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_read_executor_job(
+        self, target: Callable[..., T], *args: Any
+    ) -> asyncio.Future[T]:
+        """Add an executor job for read only queries from within the event loop.
+
+        The job runs in the read executor if there is one so that large
+        queries do not hold up the db executor.
+        """
+        return self.hass.loop.run_in_executor(
+            self._db_read_executor or self._db_executor, target, *args
+        )
+
     def _stop_executor(self) -> None:
         """Stop the executor."""
+        if self._db_read_executor is not None:
+            self._db_read_executor.shutdown()
+            self._db_read_executor = None
         if self._db_executor is None:
             return
         self._db_executor.shutdown()
@@ -432,15 +552,14 @@ class Recorder(threading.Thread):
         if self._keep_alive_listener:
             self._keep_alive_listener()
             self._keep_alive_listener = None
-        if self._commit_listener:
-            self._commit_listener()
-            self._commit_listener = None
         if self._nightly_listener:
             self._nightly_listener()
             self._nightly_listener = None
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
+        if self.throttled_purge:
+            self.throttled_purge.async_stop()
 
     async def _async_close(self, event: Event) -> None:
         """Empty the queue if its still present at close."""
@@ -467,6 +586,19 @@ class Recorder(threading.Thread):
         self.queue_task(StopTask())
         self._async_stop_listeners()
         await self.hass.async_add_executor_job(self.join)
+        if attributes_ids := self.state_attributes_manager.recently_used_ids():
+            await self._state_attributes_index_store.async_save(
+                {"attributes_ids": attributes_ids}
+            )
+
+    async def async_load_state_attributes_index(self) -> None:
+        """Load the attributes_ids which were cached when the recorder was stopped.
+
+        They are loaded into the cache of the state attributes manager before
+        the first events are processed.
+        """
+        if data := await self._state_attributes_index_store.async_load():
+            self._state_attributes_index = data["attributes_ids"]
 
     @callback
     def _async_hass_started(self, hass: HomeAssistant) -> None:
@@ -541,15 +673,37 @@ class Recorder(threading.Thread):
             # until after the database is vacuumed
             repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
-            self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
+            if self.throttled_purge:
+                self.throttled_purge.async_start(purge_before, True, repack)
+            else:
+                self.queue_task(
+                    PurgeTask(purge_before, repack=repack, apply_filter=False)
+                )
         else:
             self.queue_task(PerodicCleanupTask())
+        if self.partitioned_tables:
+            self.queue_task(AddPartitionsTask())
+        if self.compact_numeric_states:
+            entity_filter = self.entity_filter
+            entity_ids = [
+                state.entity_id
+                for state in self.hass.states.async_all()
+                if numeric_chunks.parse_numeric_state(state.state) is not None
+                and entity_filter(state.entity_id)
+            ]
+            compact_before = dt_util.utcnow() - timedelta(days=1)
+            self.queue_task(CompactNumericStatesTask(entity_ids, compact_before))
 
     @callback
     def _async_five_minute_tasks(self, now: datetime) -> None:
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if self.auto_purge and self.throttled_purge:
+            # Keep deleting the rows as they expire instead of all at night
+            self.throttled_purge.async_start(
+                dt_util.utcnow() - timedelta(days=self.keep_days)
+            )
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -657,14 +811,9 @@ class Recorder(threading.Thread):
                 name="Recorder keep alive",
             )
 
-        # If the commit interval is not 0, we need to commit periodically
-        if self.commit_interval:
-            self._commit_listener = async_track_time_interval(
-                self.hass,
-                self._async_commit,
-                timedelta(seconds=self.commit_interval),
-                name="Recorder commit",
-            )
+        if self.partitioned_tables:
+            # Add the partitions missed while Home Assistant was stopped
+            self.queue_task(AddPartitionsTask())
 
         # Run nightly tasks at 4:12am
         self._nightly_listener = async_track_time_change(
@@ -790,6 +939,10 @@ class Recorder(threading.Thread):
             schema_version = self.schema_version
             if schema_version >= STATISTICS_ROWS_SCHEMA_VERSION:
                 self.statistics_meta_manager.load(session)
+            if schema_version >= STATES_NUMERIC_CHUNKS_SCHEMA_VERSION:
+                self.numeric_chunks_recorded = numeric_chunks.has_chunks(session)
+            if schema_version >= HISTORY_TIERS_SCHEMA_VERSION:
+                self.history_tiers_recorded = has_tiers(session)
 
             migration_changes: dict[str, int] = {
                 row[0]: row[1]
@@ -827,6 +980,15 @@ class Recorder(threading.Thread):
                     ):
                         self.queue_task(EntityIDPostMigrationTask())
 
+            migrator = StatisticsRollupsMigration(
+                session, schema_version, migration_changes
+            )
+            if migrator.needs_migrate():
+                self.queue_task(migrator.task())
+            else:
+                _LOGGER.debug("Activating statistics rollups as all data is compiled")
+                self.statistics_rollups_active = True
+
             if self.schema_version > LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION:
                 with contextlib.suppress(SQLAlchemyError):
                     # If the index of event_ids on the states table is still present
@@ -862,8 +1024,16 @@ class Recorder(threading.Thread):
         del startup_task_or_events
 
         self.stop_requested = False
+        group_commit = self.group_commit
         while not self.stop_requested:
-            self._guarded_process_one_task_or_event_or_recover(queue_.get())
+            # Only wait for the next event as long as the pending writes can wait
+            try:
+                task_or_event = queue_.get(
+                    timeout=group_commit.timeout(self._event_session_has_pending_writes)
+                )
+            except queue.Empty:
+                task_or_event = COMMIT_TASK
+            self._guarded_process_one_task_or_event_or_recover(task_or_event)
 
     def _pre_process_startup_events(
         self, startup_task_or_events: list[RecorderTask | Event]
@@ -889,6 +1059,9 @@ class Recorder(threading.Thread):
         self.event_data_manager.load(non_state_change_events, session)
         self.event_type_manager.load(non_state_change_events, session)
         self.states_meta_manager.load(state_change_events, session)
+        if self.schema_version >= STATE_ATTRIBUTES_SCHEMA_VERSION:
+            self.state_attributes_manager.warm_up(self._state_attributes_index, session)
+        self._state_attributes_index = None
         self.state_attributes_manager.load(state_change_events, session)
 
     def _guarded_process_one_task_or_event_or_recover(
@@ -1027,11 +1200,22 @@ class Recorder(threading.Thread):
         if not self.enabled:
             return
         if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
+            # The states bulk writer only writes the current schema
+            if self.bulk_insert_states and self.schema_version == SCHEMA_VERSION:
+                self._process_state_changed_event_into_bulk_writer(event)
+            else:
+                self._process_state_changed_event_into_session(event)
+            if (
+                history_tiers := self.history_tiers
+            ) and self.schema_version >= HISTORY_TIERS_SCHEMA_VERSION:
+                history_tiers.add_event(event)
+            for record_state_changed in self.state_changed_platforms:
+                record_state_changed(self.hass, event)
         else:
             self._process_non_state_changed_event_into_session(event)
-        # Commit if the commit interval is zero
-        if not self.commit_interval:
+        # Commit if the commit size or latency is reached, which
+        # is after every event if the commit interval is zero
+        if self.group_commit.add_event():
             self._commit_event_session_or_retry()
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
@@ -1080,6 +1264,14 @@ class Recorder(threading.Thread):
 
         self._add_to_session(session, dbevent)
 
+    def _process_state_changed_event_into_bulk_writer(self, event: Event) -> None:
+        """Process a state_changed event into the states bulk writer."""
+        if shared_attrs_bytes := self.state_attributes_manager.serialize_from_event(
+            event
+        ):
+            self.states_bulk_writer.add(event, shared_attrs_bytes)
+            self._event_session_has_pending_writes = True
+
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
         state_attributes_manager = self.state_attributes_manager
@@ -1199,6 +1391,7 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        self.states_bulk_writer.write(session)
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1214,18 +1407,26 @@ class Recorder(threading.Thread):
                         for state_id, last_reported_timestamp in pending_last_reported.items()
                     ],
                 )
+        if (
+            history_tiers := self.history_tiers
+        ) and self.schema_version >= HISTORY_TIERS_SCHEMA_VERSION:
+            history_tiers.flush(session, time.time())
         session.commit()
 
         self._event_session_has_pending_writes = False
+        self.group_commit.committed()
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
         # into the LRU or committed now.
         self.states_manager.post_commit_pending()
+        self.states_bulk_writer.post_commit()
         self.state_attributes_manager.post_commit_pending()
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if self.history_tiers is not None:
+            self.history_tiers.post_commit()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1247,12 +1448,18 @@ class Recorder(threading.Thread):
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        # The pending writes are rolled back
+        self._event_session_has_pending_writes = False
+        self.group_commit.reset()
         self.states_manager.reset()
+        self.states_bulk_writer.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        if self.history_tiers is not None:
+            self.history_tiers.reset()
 
         if not self.event_session:
             return
@@ -1293,6 +1500,10 @@ class Recorder(threading.Thread):
         """Migrate entity_ids if needed."""
         return migration.migrate_entity_ids(self)
 
+    def _migrate_statistics_rollups(self, task: StatisticsRollupsTask) -> bool:
+        """Compile the statistics rollups if needed."""
+        return migration.migrate_statistics_rollups(self, task)
+
     def _post_migrate_entity_ids(self) -> bool:
         """Post migrate entity_ids if needed."""
         return migration.post_migrate_entity_ids(self)
@@ -1400,30 +1611,15 @@ class Recorder(threading.Thread):
         kwargs: dict[str, Any] = {}
         self._completed_first_database_setup = False
 
-        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+        if self._using_memory_sqlite:
             kwargs["connect_args"] = {"check_same_thread": False}
             kwargs["poolclass"] = MutexPool
             MutexPool.pool_lock = threading.RLock()
             kwargs["pool_reset_on_return"] = None
         elif self.db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["poolclass"] = RecorderPool
-        elif self.db_url.startswith(
-            (
-                MARIADB_URL_PREFIX,
-                MARIADB_PYMYSQL_URL_PREFIX,
-                MYSQLDB_URL_PREFIX,
-                MYSQLDB_PYMYSQL_URL_PREFIX,
-            )
-        ):
-            kwargs["connect_args"] = {"charset": "utf8mb4"}
-            if self.db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
-                # If they have configured MySQLDB but don't have
-                # the MySQLDB module installed this will throw
-                # an ImportError which we suppress here since
-                # sqlalchemy will give them a better error when
-                # it tried to import it below.
-                with contextlib.suppress(ImportError):
-                    kwargs["connect_args"]["conv"] = build_mysqldb_conv()
+        elif self.db_url.startswith(MYSQL_URL_PREFIXES):
+            kwargs["connect_args"] = _mysql_connect_args(self.db_url)
 
         # Disable extended logging for non SQLite databases
         if not self.db_url.startswith(SQLITE_URL_PREFIX):
@@ -1436,12 +1632,71 @@ class Recorder(threading.Thread):
         self._dialect_name = try_parse_enum(SupportedDialect, self.engine.dialect.name)
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
+        if self.partition_interval and partitions.partitioning_supported(
+            self._dialect_name
+        ):
+            migration.create_partitioned_tables(self.engine, self.partition_interval)
+            self.partitioned_tables = True
         Base.metadata.create_all(self.engine)
+        # The ids returned by a multi row INSERT ... RETURNING statement
+        # must be in the order of the rows to use the states bulk writer
+        self.bulk_insert_states = (
+            self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
+        if self.use_read_engine:
+            self._setup_read_connection()
+
+    def _setup_read_connection(self) -> None:
+        """Set up the engine for read only queries.
+
+        Without a read url, a pool of read only connections to the recorder
+        database is used, which works well with the WAL of SQLite.
+        """
+        read_url = self.db_read_url or self.db_url
+        kwargs: dict[str, Any] = {"pool_size": self.db_read_workers, "echo": False}
+        if read_url.startswith(SQLITE_URL_PREFIX):
+            kwargs["connect_args"] = {"check_same_thread": False}
+        elif read_url.startswith(MYSQL_URL_PREFIXES):
+            kwargs["connect_args"] = _mysql_connect_args(read_url)
+
+        read_engine = create_engine(read_url, **kwargs, future=True)
+        assert self.engine is not None
+        if read_engine.dialect.name != self.engine.dialect.name:
+            _LOGGER.error(
+                "The read database uses %s while the recorder database uses %s, "
+                "the recorder database is used for all queries",
+                read_engine.dialect.name,
+                self.engine.dialect.name,
+            )
+            read_engine.dispose()
+            return
+        self.read_engine = read_engine
+        sqlalchemy_event.listen(
+            read_engine, "connect", self._setup_read_connection_for_dialect
+        )
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=read_engine, future=True)
+        )
+        _LOGGER.debug("Connected to read database")
+
+    def _setup_read_connection_for_dialect(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific connection settings of the read engine."""
+        assert self.read_engine is not None
+        dialect_name = self.read_engine.dialect.name
+        setup_connection_for_dialect(self, dialect_name, dbapi_connection, False)
+        if dialect_name == SupportedDialect.SQLITE:
+            execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
 
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self.read_engine:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self._get_read_session = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
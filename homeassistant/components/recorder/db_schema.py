@@ -68,7 +68,7 @@ class Base(DeclarativeBase):
     """Base class for tables."""
 
 
-SCHEMA_VERSION = 43
+SCHEMA_VERSION = 46
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -78,10 +78,14 @@ TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_STATES_META = "states_meta"
+TABLE_STATES_NUMERIC_CHUNKS = "states_numeric_chunks"
+TABLE_STATES_TIERS = "states_tiers"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_DAILY = "statistics_daily"
 TABLE_STATISTICS_META = "statistics_meta"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
@@ -103,8 +107,12 @@ ALL_TABLES = [
     TABLE_SCHEMA_CHANGES,
     TABLE_MIGRATION_CHANGES,
     TABLE_STATES_META,
+    TABLE_STATES_NUMERIC_CHUNKS,
+    TABLE_STATES_TIERS,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_MONTHLY,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
 ]
@@ -208,6 +216,9 @@ DOUBLE_PRECISION_TYPE_SQL = "DOUBLE PRECISION"
 CONTEXT_BINARY_TYPE = LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH).with_variant(
     NativeLargeBinary(CONTEXT_ID_BIN_MAX_LENGTH), "mysql", "mariadb", "sqlite"
 )
+CHUNK_BINARY_TYPE = LargeBinary().with_variant(
+    NativeLargeBinary(), "mysql", "mariadb", "sqlite"
+)
 
 TIMESTAMP_TYPE = DOUBLE_TYPE
 
@@ -516,6 +527,41 @@ class States(Base):
 
         return dbstate
 
+    @staticmethod
+    def values_from_event(event: Event) -> dict[str, Any]:
+        """Return the column values of a state_changed event.
+
+        The values are the same as the ones of the object created by from_event,
+        without the overhead of creating the object.
+        """
+        state: State | None = event.data.get("new_state")
+        context = event.context
+        values: dict[str, Any] = {
+            "entity_id": event.data["entity_id"],
+            "state": "",
+            "last_updated_ts": event.time_fired_timestamp,
+            "last_changed_ts": None,
+            "last_reported_ts": None,
+            "old_state_id": None,
+            "attributes_id": None,
+            "metadata_id": None,
+            "context_id_bin": ulid_to_bytes_or_none(context.id),
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+        }
+        # None state means the state was removed from the state machine
+        if state is None:
+            return values
+
+        values["state"] = state.state
+        values["last_updated_ts"] = state.last_updated_timestamp
+        if state.last_updated != state.last_changed:
+            values["last_changed_ts"] = state.last_changed_timestamp
+        if state.last_updated != state.last_reported:
+            values["last_reported_ts"] = state.last_reported_timestamp
+        return values
+
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
         context = Context(
@@ -643,6 +689,75 @@ class StatesMeta(Base):
         )
 
 
+class StatesNumericChunks(Base):
+    """Numeric states of an entity compressed in a chunk."""
+
+    __table_args__ = (
+        # Used for fetching the chunks of entities in a time range
+        Index(
+            "ix_states_numeric_chunks_metadata_id_start_ts", "metadata_id", "start_ts"
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_NUMERIC_CHUNKS
+    chunk_id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    metadata_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("states_meta.metadata_id")
+    )
+    attributes_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
+    start_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+    end_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    count: Mapped[int | None] = mapped_column(Integer)
+    flags: Mapped[int | None] = mapped_column(SmallInteger)
+    data: Mapped[bytes | None] = mapped_column(CHUNK_BINARY_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesNumericChunks("
+            f"id={self.chunk_id}, metadata_id={self.metadata_id},"
+            f" start_ts={self.start_ts}, end_ts={self.end_ts}, count={self.count}"
+            ")>"
+        )
+
+
+class StatesTiers(Base):
+    """Downsampled states of an entity in a period of a history tier."""
+
+    __table_args__ = (
+        # Used for fetching the periods of entities in a time range
+        Index(
+            "ix_states_tiers_metadata_id_period_start_ts",
+            "metadata_id",
+            "period",
+            "start_ts",
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_TIERS
+    tier_id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    metadata_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("states_meta.metadata_id")
+    )
+    period: Mapped[int | None] = mapped_column(Integer)
+    start_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    min: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    max: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    state: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    last_updated_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesTiers("
+            f"id={self.tier_id}, metadata_id={self.metadata_id},"
+            f" period={self.period}, start_ts={self.start_ts}, state='{self.state}'"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -738,6 +853,56 @@ class StatisticsShortTerm(Base, StatisticsBase):
     __tablename__ = TABLE_STATISTICS_SHORT_TERM
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Statistics rollup base class.
+
+    A rollup summarizes the long term statistics of a local day or month,
+    the end of its period is stored since it depends on the time zone.
+    """
+
+    end_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+    # The number of hourly means in the period, a monthly mean is compiled
+    # from the daily means weighted by their number of hourly means
+    mean_count: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDaily(Base, StatisticsRollupBase):
+    """Daily rollups of the long term statistics."""
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsRollupBase):
+    """Monthly rollups of the long term statistics."""
+
+    # The longest month, the actual end of a month is stored in end_ts
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class StatisticsMeta(Base):
     """Statistics meta data."""
 
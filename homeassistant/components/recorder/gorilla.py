@@ -0,0 +1,206 @@
+"""Compress time series of numbers as described in the Gorilla paper.
+
+Pelkonen et al., "Gorilla: A Fast, Scalable, In-Memory Time Series Database"
+
+The timestamps are integer microseconds. The first one is stored as is and
+the ones after it as the difference of the difference to the previous one,
+which is zero for samples taken at a fixed interval.
+
+The values are floats. The first one is stored as is and the ones after it
+as the XOR with the previous one, which is zero if the value didn't change
+and otherwise usually only has a few meaningful bits in the middle.
+"""
+
+from __future__ import annotations
+
+import struct
+
+_UINT64 = struct.Struct(">Q")
+
+# The control bits, their number and the number of bits of
+# the delta of deltas of the timestamps which fit in them
+_TIMESTAMP_BUCKETS = ((0b10, 2, 14), (0b110, 3, 20), (0b1110, 4, 32))
+_TIMESTAMP_LARGEST_BUCKET = (0b1111, 4, 64)
+
+
+class _BitWriter:
+    """Write integers of up to 64 bits to bytes, most significant bit first."""
+
+    __slots__ = ("_buffer", "_pending", "_pending_bits")
+
+    def __init__(self) -> None:
+        """Initialize the writer."""
+        self._buffer = bytearray()
+        # The bits which were not written to the buffer yet
+        self._pending = 0
+        self._pending_bits = 0
+
+    def write(self, value: int, size: int) -> None:
+        """Write the lowest size bits of a non negative value."""
+        pending = (self._pending << size) | value
+        pending_bits = self._pending_bits + size
+        if pending_bits >= 64:
+            pending_bits -= 64
+            self._buffer += _UINT64.pack(pending >> pending_bits)
+            pending &= (1 << pending_bits) - 1
+        self._pending = pending
+        self._pending_bits = pending_bits
+
+    def to_bytes(self) -> bytes:
+        """Return the written bits padded with zeros to a whole byte."""
+        padding = -self._pending_bits % 8
+        return bytes(self._buffer) + (self._pending << padding).to_bytes(
+            (self._pending_bits + padding) // 8, "big"
+        )
+
+
+def encode(timestamps: list[int], values: list[float]) -> bytes:
+    """Encode the timestamps and values of a time series.
+
+    The timestamps are integer microseconds in ascending order.
+    """
+    if not timestamps or len(timestamps) != len(values):
+        raise ValueError("Expected the same non zero number of timestamps and values")
+    writer = _BitWriter()
+    write = writer.write
+    write(timestamps[0], 64)
+    previous_timestamp = timestamps[0]
+    previous_delta = 0
+    for timestamp in timestamps[1:]:
+        delta = timestamp - previous_timestamp
+        delta_of_delta = delta - previous_delta
+        previous_timestamp = timestamp
+        previous_delta = delta
+        if delta_of_delta == 0:
+            write(0, 1)
+            continue
+        for control, control_size, size in (
+            *_TIMESTAMP_BUCKETS,
+            _TIMESTAMP_LARGEST_BUCKET,
+        ):
+            offset = 1 << (size - 1)
+            if -offset <= delta_of_delta < offset:
+                write(control, control_size)
+                write(delta_of_delta + offset, size)
+                break
+
+    # The IEEE 754 representations of the values as integers
+    count = len(values)
+    values_bits = struct.unpack(f">{count}Q", struct.pack(f">{count}d", *values))
+    previous_bits = values_bits[0]
+    write(previous_bits, 64)
+    # The window of meaningful bits of the previous XOR
+    previous_leading = previous_trailing = -1
+    for value_bits in values_bits[1:]:
+        xor = value_bits ^ previous_bits
+        previous_bits = value_bits
+        if xor == 0:
+            write(0, 1)
+            continue
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if previous_leading != -1 and (
+            leading >= previous_leading and trailing >= previous_trailing
+        ):
+            # The meaningful bits fit in the window of the previous XOR
+            write(0b10, 2)
+            write(xor >> previous_trailing, 64 - previous_leading - previous_trailing)
+            continue
+        size = 64 - leading - trailing
+        # The control bits, the number of leading zeros and the size
+        # minus one, which always fits in 6 bits, as a single write
+        write((0b11 << 11) | (leading << 6) | (size - 1), 13)
+        write(xor >> trailing, size)
+        previous_leading = leading
+        previous_trailing = trailing
+
+    return writer.to_bytes()
+
+
+def decode(data: bytes, count: int) -> tuple[list[int], list[float]]:
+    """Decode the timestamps and values of a time series of count samples."""
+    # The bits are loaded 8 bytes at a time into a window of which the
+    # lowest window_bits bits were not read yet. Loading is inlined as
+    # this is the read path of the compacted states. The window is loaded
+    # before the bits of a sample are known, so it can be loaded past the
+    # end of the data, which the padding allows.
+    data += bytes(16)
+    unpack_from = _UINT64.unpack_from
+    timestamp: int = unpack_from(data, 0)[0]
+    window: int = unpack_from(data, 8)[0]
+    window_bits = 64
+    offset = 16
+
+    timestamps = [timestamp]
+    delta = 0
+    for _ in range(count - 1):
+        # The control bits of the timestamps are at most 4 bits
+        if window_bits < 4:
+            window = ((window & ((1 << window_bits) - 1)) << 64) | unpack_from(
+                data, offset
+            )[0]
+            window_bits += 64
+            offset += 8
+        window_bits -= 1
+        if (window >> window_bits) & 1:
+            for _control, _control_size, bucket_size in _TIMESTAMP_BUCKETS:
+                window_bits -= 1
+                if not (window >> window_bits) & 1:
+                    size = bucket_size
+                    break
+            else:
+                size = _TIMESTAMP_LARGEST_BUCKET[2]
+            if window_bits < size:
+                window = ((window & ((1 << window_bits) - 1)) << 64) | unpack_from(
+                    data, offset
+                )[0]
+                window_bits += 64
+                offset += 8
+            window_bits -= size
+            delta += ((window >> window_bits) & ((1 << size) - 1)) - (1 << (size - 1))
+        timestamp += delta
+        timestamps.append(timestamp)
+
+    if window_bits < 64:
+        window = ((window & ((1 << window_bits) - 1)) << 64) | unpack_from(
+            data, offset
+        )[0]
+        window_bits += 64
+        offset += 8
+    window_bits -= 64
+    value_bits = (window >> window_bits) & 0xFFFFFFFFFFFFFFFF
+    values_bits = [value_bits]
+    leading = trailing = 0
+    for _ in range(count - 1):
+        # The control bits and the window of the meaningful bits are at most
+        # 13 bits, the meaningful bits are loaded after them
+        if window_bits < 13:
+            window = ((window & ((1 << window_bits) - 1)) << 64) | unpack_from(
+                data, offset
+            )[0]
+            window_bits += 64
+            offset += 8
+        window_bits -= 1
+        if (window >> window_bits) & 1:
+            window_bits -= 1
+            if (window >> window_bits) & 1:
+                window_bits -= 11
+                meaningful_window = (window >> window_bits) & 0b11111111111
+                leading = meaningful_window >> 6
+                size = (meaningful_window & 0b111111) + 1
+                trailing = 64 - leading - size
+            else:
+                size = 64 - leading - trailing
+            if window_bits < size:
+                window = ((window & ((1 << window_bits) - 1)) << 64) | unpack_from(
+                    data, offset
+                )[0]
+                window_bits += 64
+                offset += 8
+            window_bits -= size
+            value_bits ^= ((window >> window_bits) & ((1 << size) - 1)) << trailing
+        values_bits.append(value_bits)
+
+    # Converting the values at once is faster than one by one
+    values = list(struct.unpack(f">{count}d", struct.pack(f">{count}Q", *values_bits)))
+    return timestamps, values
@@ -0,0 +1,109 @@
+"""Group the writes of the recorder into commits.
+
+The recorder commits the writes of the event session on whichever
+comes first of:
+
+- COMMIT_MAX_EVENTS events written since the last commit, which bounds
+  the size of the commits during bursts;
+- the oldest uncommitted write reaching the commit interval, which bounds
+  the time until history reflects new states;
+- no new events for COMMIT_IDLE_SECONDS, which flushes the writes as soon
+  as a burst is over.
+
+The recorder thread only wakes up to commit when there are pending writes.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+
+# Commit once this many events are written into the session
+COMMIT_MAX_EVENTS = 1000
+# Commit once no events arrived for this many seconds
+COMMIT_IDLE_SECONDS = 1.0
+
+# Upper bounds of the buckets of the commit size and latency histograms
+COMMIT_SIZE_BUCKETS = (1, 10, 100, 1000)
+COMMIT_LATENCY_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Histogram:
+    """Count values in buckets of upper bounds."""
+
+    def __init__(self, bounds: tuple[float, ...], unit: str = "") -> None:
+        """Initialize the histogram."""
+        self.bounds = bounds
+        self.unit = unit
+        self.counts = [0] * (len(bounds) + 1)
+
+    def add(self, value: float) -> None:
+        """Count a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+
+    @property
+    def total(self) -> int:
+        """Return the number of counted values."""
+        return sum(self.counts)
+
+    def summary(self) -> str:
+        """Return the counts of the buckets which are not empty."""
+        buckets = [f"≤{bound:g}{self.unit}" for bound in self.bounds]
+        buckets.append(f">{self.bounds[-1]:g}{self.unit}")
+        return ", ".join(
+            f"{bucket}: {count}"
+            for bucket, count in zip(buckets, self.counts, strict=True)
+            if count
+        )
+
+
+class GroupCommit:
+    """Decide when the recorder commits and keep the commit histograms."""
+
+    def __init__(self, commit_interval: float) -> None:
+        """Initialize the group commit."""
+        self.commit_interval = commit_interval
+        self.idle_seconds = min(COMMIT_IDLE_SECONDS, commit_interval)
+        self.pending_events = 0
+        self.pending_since: float | None = None
+        self.size_histogram = Histogram(COMMIT_SIZE_BUCKETS)
+        self.latency_histogram = Histogram(COMMIT_LATENCY_BUCKETS, " s")
+
+    def add_event(self) -> bool:
+        """Count an event written into the session.
+
+        Returns True if the session should be committed now.
+        """
+        self.pending_events += 1
+        now = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = now
+        return (
+            self.pending_events >= COMMIT_MAX_EVENTS
+            or now - self.pending_since >= self.commit_interval
+        )
+
+    def timeout(self, pending_writes: bool) -> float | None:
+        """Return the seconds to wait for the next event before committing."""
+        if not pending_writes:
+            return None
+        now = time.monotonic()
+        if self.pending_since is None:
+            # The writes of a task
+            self.pending_since = now
+        return max(
+            0.0,
+            min(self.idle_seconds, self.pending_since + self.commit_interval - now),
+        )
+
+    def committed(self) -> None:
+        """Count a commit in the histograms."""
+        if self.pending_since is not None:
+            self.size_histogram.add(self.pending_events)
+            self.latency_histogram.add(time.monotonic() - self.pending_since)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the pending writes."""
+        self.pending_events = 0
+        self.pending_since = None
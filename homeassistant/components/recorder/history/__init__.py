@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from collections.abc import MutableMapping
-from datetime import datetime
-from typing import Any
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime, timedelta
+import math
+from typing import Any, cast
 
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
 
 from ... import recorder
 from ..filters import Filters
+from ..history_tiers import tier_compressed_states, tier_period_for_resolution
+from ..util import session_scope
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
@@ -19,17 +23,20 @@ from .modern import (
     get_significant_states as _modern_get_significant_states,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
+    stream_significant_states as _modern_stream_significant_states,
 )
 
 # These are the APIs of this package
 __all__ = [
     "NEED_ATTRIBUTE_DOMAINS",
     "SIGNIFICANT_DOMAINS",
+    "get_downsampled_states",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
     "get_significant_states_with_session",
     "state_changes_during_period",
+    "stream_significant_states",
 ]
 
 
@@ -182,3 +189,126 @@ def state_changes_during_period(
         limit,
         include_start_time_state,
     )
+
+
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Yield batches of significant states in the compressed state format."""
+    if recorder.get_instance(hass).states_meta_manager.active:
+        return _modern_stream_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+    # The legacy queries can't be streamed
+    from .legacy import (  # pylint: disable=import-outside-toplevel
+        get_significant_states as _legacy_get_significant_states,
+    )
+
+    states = _legacy_get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+    )
+    return iter(cast(MutableMapping[str, list[dict[str, Any]]], states).items())
+
+
+def get_downsampled_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    resolution: float,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    no_attributes: bool = False,
+) -> dict[str, list[dict[str, Any]]] | None:
+    """Return the states during a time period downsampled to a resolution.
+
+    The states are read from the history tier matching the resolution,
+    except the states before its first period in the time period and the
+    states after its last recorded period, which are read as usual. The
+    states are returned in the compressed state format with a minimal
+    response. Returns None if no history tier matches the resolution.
+    """
+    instance = recorder.get_instance(hass)
+    if (
+        (history_tiers := instance.history_tiers) is None
+        or not instance.states_meta_manager.active
+        or (period := tier_period_for_resolution(resolution)) is None
+        or (flushed_until_ts := history_tiers.flushed_until(period)) is None
+    ):
+        return None
+    end_time_ts = (end_time or dt_util.utcnow()).timestamp()
+    tiers_start = dt_util.utc_from_timestamp(
+        math.ceil(start_time.timestamp() / period) * period
+    )
+    tiers_end = dt_util.utc_from_timestamp(min(flushed_until_ts, end_time_ts))
+    if tiers_start >= tiers_end:
+        return None
+    with session_scope(hass=hass, read_only=True) as session:
+        states_before = get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            tiers_start,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            True,
+            no_attributes,
+            True,
+        )
+        tier_states = tier_compressed_states(
+            session,
+            instance.states_meta_manager.get_many(entity_ids, session, False),
+            period,
+            tiers_start,
+            tiers_end,
+        )
+        # The states after the tiers start at the end of the last period,
+        # the states queries only include the states after their start time
+        states_after = get_significant_states_with_session(
+            hass,
+            session,
+            tiers_end - timedelta(microseconds=1),
+            end_time,
+            entity_ids,
+            None,
+            False,
+            significant_changes_only,
+            True,
+            True,
+            True,
+        )
+    result: dict[str, list[dict[str, Any]]] = {}
+    for entity_id in entity_ids:
+        states = [
+            *cast(list[dict[str, Any]], states_before.get(entity_id, [])),
+            *tier_states.get(entity_id, []),
+            *cast(list[dict[str, Any]], states_after.get(entity_id, [])),
+        ]
+        if states:
+            result[entity_id] = states
+    return result
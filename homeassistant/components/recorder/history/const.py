@@ -19,3 +19,5 @@ NEED_ATTRIBUTE_DOMAINS = {
     "thermostat",
     "water_heater",
 }
+# The maximum number of states of an entity in a batch of streamed states
+STREAM_BATCH_SIZE = 1000
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator, MutableMapping
 from datetime import datetime
-from itertools import groupby
+from itertools import groupby, islice
 from operator import itemgetter
 from typing import Any, cast
 
@@ -37,12 +37,18 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
+from ..numeric_chunks import (
+    merge_numeric_chunk_rows,
+    numeric_chunk_rows,
+    numeric_chunk_start_rows,
+)
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
     STATE_KEY,
+    STREAM_BATCH_SIZE,
 )
 
 _FIELD_MAP = {
@@ -229,6 +235,99 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+            False,
+        )
+    ):
+        return {}
+    rows, entity_id_to_metadata_id, start_time_ts = query
+    return _sorted_states_to_dict(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Yield batches of significant states in the compressed state format.
+
+    Unlike get_significant_states, the states are not collected in a dict.
+    The rows of periods longer than a day are fetched from the database in
+    partitions and converted while they are fetched, so only a batch of
+    states is held in memory at a time. The states of an entity are yielded
+    in order, possibly split in several consecutive batches.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        if not (
+            query := _significant_states_query(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+                True,
+            )
+        ):
+            return
+        rows, entity_id_to_metadata_id, start_time_ts = query
+        yield from cast(
+            Iterator[tuple[str, list[dict[str, Any]]]],
+            _sorted_states_to_batches(
+                rows,
+                start_time_ts,
+                entity_ids,
+                entity_id_to_metadata_id,
+                minimal_response,
+                True,
+                no_attributes,
+                STREAM_BATCH_SIZE,
+            ),
+        )
+
+
+def _significant_states_query(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    stream: bool,
+) -> tuple[Iterable[Row], dict[str, int | None], float | None] | None:
+    """Query the significant states of the entities.
+
+    Returns the sorted rows, the metadata_ids of the entities and the start
+    time if the states at the start time are included, or None if none of
+    the entities are recorded. When streaming, the rows of periods longer
+    than a day are fetched in partitions.
+    """
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = recorder.get_instance(hass)
@@ -237,7 +336,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -275,14 +374,38 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
-        entity_ids,
+    if instance.numeric_chunks_recorded:
+        # The chunks are read before the states since the states
+        # rows may be fetched in batches with the same connection
+        chunk_rows = numeric_chunk_rows(
+            session, metadata_ids, start_time_ts, end_time_ts, no_attributes
+        )
+        start_rows = (
+            numeric_chunk_start_rows(
+                session,
+                metadata_ids,
+                start_time_ts,
+                None if single_metadata_id else run_start_ts,
+                no_attributes,
+            )
+            if include_start_time_state
+            else {}
+        )
+        rows = merge_numeric_chunk_rows(
+            execute_stmt_lambda_element(
+                session, stmt, start_time if stream else None, end_time, orm_rows=False
+            ),
+            chunk_rows,
+            start_rows,
+        )
+    else:
+        rows = execute_stmt_lambda_element(
+            session, stmt, start_time if stream else None, end_time, orm_rows=False
+        )
+    return (
+        rows,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
+        start_time_ts if include_start_time_state else None,
     )
 
 
@@ -692,6 +815,47 @@ def _sorted_states_to_dict(
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
     """
+    # Set all entity IDs to empty lists in result set to maintain the order
+    result: dict[str, list[State | dict[str, Any]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    for entity_id, entity_states in _sorted_states_to_batches(
+        states,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes,
+        None,
+    ):
+        result[entity_id].extend(entity_states)
+
+    if descending:
+        for ent_results in result.values():
+            ent_results.reverse()
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _sorted_states_to_batches(
+    states: Iterable[Row],
+    start_time_ts: float | None,
+    entity_ids: list[str],
+    entity_id_to_metadata_id: dict[str, int | None],
+    minimal_response: bool,
+    compressed_state_format: bool,
+    no_attributes: bool,
+    batch_size: int | None,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """Convert SQL results into batches of states of an entity.
+
+    States must be sorted by entity_id and last_updated
+
+    The states of an entity are yielded in order, in batches of at most
+    batch_size states or in a single batch if batch_size is None.
+    """
     field_map = _FIELD_MAP
     state_class: Callable[
         [Row, dict[str, dict[str, Any]], float | None, str, str, float | None, bool],
@@ -699,18 +863,9 @@ def _sorted_states_to_dict(
     ]
     if compressed_state_format:
         state_class = row_to_compressed_state
-        attr_time = COMPRESSED_STATE_LAST_UPDATED
-        attr_state = COMPRESSED_STATE_STATE
     else:
         state_class = LazyState
-        attr_time = LAST_CHANGED_KEY
-        attr_state = STATE_KEY
 
-    # Set all entity IDs to empty lists in result set to maintain the order
-    result: dict[str, list[State | dict[str, Any]]] = {
-        entity_id: [] for entity_id in entity_ids
-    }
-    metadata_id_to_entity_id: dict[int, str] = {}
     metadata_id_to_entity_id = {
         v: k for k, v in entity_id_to_metadata_id.items() if v is not None
     }
@@ -731,13 +886,13 @@ def _sorted_states_to_dict(
     # Append all changes to it
     for metadata_id, group in states_iter:
         entity_id = metadata_id_to_entity_id[metadata_id]
-        attr_cache: dict[str, dict[str, Any]] = {}
-        ent_results = result[entity_id]
+        entity_states: Iterator[State | dict[str, Any]]
         if (
             not minimal_response
             or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
         ):
-            ent_results.extend(
+            attr_cache: dict[str, dict[str, Any]] = {}
+            entity_states = (
                 state_class(
                     db_state,
                     attr_cache,
@@ -749,62 +904,78 @@ def _sorted_states_to_dict(
                 )
                 for db_state in group
             )
-            continue
-
-        prev_state: str | None = None
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            if (first_state := next(group, None)) is None:
-                continue
-            prev_state = first_state[state_idx]
-            ent_results.append(
-                state_class(
-                    first_state,
-                    attr_cache,
-                    start_time_ts,
-                    entity_id,
-                    prev_state,  # type: ignore[arg-type]
-                    first_state[last_updated_ts_idx],
-                    no_attributes,
-                )
-            )
-
-        #
-        # minimal_response only makes sense with last_updated == last_updated
-        #
-        # We use last_updated for for last_changed since its the same
-        #
-        # With minimal response we do not care about attribute
-        # changes so we can filter out duplicate states
-        if compressed_state_format:
-            # Compressed state format uses the timestamp directly
-            ent_results.extend(
-                {
-                    attr_state: (prev_state := state),
-                    attr_time: row[last_updated_ts_idx],
-                }
-                for row in group
-                if (state := row[state_idx]) != prev_state
+        else:
+            entity_states = _minimal_response_states(
+                group,
+                state_class,
+                start_time_ts,
+                entity_id,
+                compressed_state_format,
+                no_attributes,
             )
+        if batch_size is None:
+            if batch := list(entity_states):
+                yield entity_id, batch
             continue
+        while batch := list(islice(entity_states, batch_size)):
+            yield entity_id, batch
 
-        # Non-compressed state format returns an ISO formatted string
-        _utc_from_timestamp = dt_util.utc_from_timestamp
-        ent_results.extend(
-            {
-                attr_state: (prev_state := state),
-                attr_time: _utc_from_timestamp(row[last_updated_ts_idx]).isoformat(),
-            }
-            for row in group
-            if (state := row[state_idx]) != prev_state
-        )
 
-    if descending:
-        for ent_results in result.values():
-            ent_results.reverse()
+def _minimal_response_states(
+    group: Iterator[Row],
+    state_class: Callable[
+        [Row, dict[str, dict[str, Any]], float | None, str, str, float | None, bool],
+        State | dict[str, Any],
+    ],
+    start_time_ts: float | None,
+    entity_id: str,
+    compressed_state_format: bool,
+    no_attributes: bool,
+) -> Iterator[State | dict[str, Any]]:
+    """Yield the minimal response states of an entity."""
+    state_idx = _FIELD_MAP["state"]
+    last_updated_ts_idx = _FIELD_MAP["last_updated_ts"]
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if (first_state := next(group, None)) is None:
+        return
+    prev_state: str = first_state[state_idx]
+    yield state_class(
+        first_state,
+        {},
+        start_time_ts,
+        entity_id,
+        prev_state,
+        first_state[last_updated_ts_idx],
+        no_attributes,
+    )
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    #
+    # minimal_response only makes sense with last_updated == last_updated
+    #
+    # We use last_updated for for last_changed since its the same
+    #
+    # With minimal response we do not care about attribute
+    # changes so we can filter out duplicate states
+    if compressed_state_format:
+        # Compressed state format uses the timestamp directly
+        for row in group:
+            if (state := row[state_idx]) != prev_state:
+                yield {
+                    COMPRESSED_STATE_STATE: (prev_state := state),
+                    COMPRESSED_STATE_LAST_UPDATED: row[last_updated_ts_idx],
+                }
+        return
+
+    # Non-compressed state format returns an ISO formatted string
+    _utc_from_timestamp = dt_util.utc_from_timestamp
+    for row in group:
+        if (state := row[state_idx]) != prev_state:
+            yield {
+                STATE_KEY: (prev_state := state),
+                LAST_CHANGED_KEY: _utc_from_timestamp(
+                    row[last_updated_ts_idx]
+                ).isoformat(),
+            }
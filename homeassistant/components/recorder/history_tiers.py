@@ -0,0 +1,230 @@
+"""Keep downsampled tiers of the history of the entities.
+
+Long range history graphs only show a few points per pixel, but reading
+the history returns every state. When history tiers are enabled, the
+recorder also aggregates the states of every entity into periods of one
+minute and of fifteen minutes while they are written. Each period of an
+entity with states is stored as a row of the states_tiers table with the
+minimum and the maximum of the numeric states and the last state.
+
+The periods are aggregated in memory and written with the first commit
+after they ended. The periods which did not end yet are lost when the
+recorder stops, so the periods around a restart only include the states
+recorded after the restart.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import math
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+from homeassistant.core import Event
+
+from .db_schema import StatesTiers
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+# The periods of the tiers in seconds, from the finest to the coarsest
+TIER_PERIODS = (60, 900)
+
+# The keys of the minimum and maximum in the compressed states of the tiers
+COMPRESSED_STATE_MIN = "min"
+COMPRESSED_STATE_MAX = "max"
+
+
+def tier_period_for_resolution(resolution: float) -> int | None:
+    """Return the period of the coarsest tier finer than the resolution.
+
+    Returns None if the resolution needs the raw states.
+    """
+    tier_period: int | None = None
+    for period in TIER_PERIODS:
+        if period <= resolution:
+            tier_period = period
+    return tier_period
+
+
+def _parse_value(state: str) -> float | None:
+    """Return the value of a numeric state."""
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+class _Period:
+    """The aggregated states of an entity in a period of a tier."""
+
+    __slots__ = ("last_updated_ts", "max", "min", "start_ts", "state")
+
+    def __init__(self, start_ts: float, state: str, last_updated_ts: float) -> None:
+        """Initialize the period with its first state."""
+        self.start_ts = start_ts
+        self.state = state
+        self.last_updated_ts = last_updated_ts
+        self.min = self.max = _parse_value(state)
+
+    def add(self, state: str, last_updated_ts: float) -> None:
+        """Add a state to the period."""
+        self.state = state
+        self.last_updated_ts = last_updated_ts
+        if (value := _parse_value(state)) is None:
+            return
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+
+class HistoryTiersManager:
+    """Aggregate the written states into the periods of the tiers.
+
+    This class is not thread-safe and must be used from the recorder thread,
+    except for flushed_until which may be read by the history queries.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the history tiers manager."""
+        self.recorder = recorder
+        self._open: dict[tuple[str, int], _Period] = {}
+        self._ended: list[tuple[str, int, _Period]] = []
+        # The ended periods which were added to the session
+        # and are kept until it is committed
+        self._pending_ended: list[tuple[str, int, _Period]] = []
+        self._next_end_ts = 0.0
+        self._pending_flushed_until: dict[int, float] = {}
+        self._flushed_until: dict[int, float] = {}
+
+    def add_event(self, event: Event) -> None:
+        """Add the new state of a state changed event to the tiers."""
+        if (new_state := event.data.get("new_state")) is None:
+            return
+        entity_id = new_state.entity_id
+        state = new_state.state
+        last_updated_ts = new_state.last_updated_timestamp
+        for period in TIER_PERIODS:
+            start_ts = last_updated_ts - last_updated_ts % period
+            key = (entity_id, period)
+            open_period = self._open.get(key)
+            if open_period is not None and open_period.start_ts == start_ts:
+                open_period.add(state, last_updated_ts)
+                continue
+            if open_period is not None:
+                self._ended.append((entity_id, period, open_period))
+            self._open[key] = _Period(start_ts, state, last_updated_ts)
+
+    def flush(self, session: Session, now_ts: float) -> None:
+        """Add the periods which ended before now to the session."""
+        if now_ts >= self._next_end_ts:
+            for key, open_period in list(self._open.items()):
+                entity_id, period = key
+                if open_period.start_ts + period <= now_ts:
+                    self._ended.append((entity_id, period, self._open.pop(key)))
+            finest_period = TIER_PERIODS[0]
+            self._next_end_ts = now_ts - now_ts % finest_period + finest_period
+            for period in TIER_PERIODS:
+                self._pending_flushed_until[period] = now_ts - now_ts % period
+        if not self._ended:
+            return
+        metadata_ids = self.recorder.states_meta_manager.get_many(
+            {entity_id for entity_id, _, _ in self._ended}, session, True
+        )
+        not_flushed: list[tuple[str, int, _Period]] = []
+        for ended in self._ended:
+            entity_id, period, ended_period = ended
+            if (metadata_id := metadata_ids[entity_id]) is None:
+                # The entity_id is not committed yet
+                not_flushed.append(ended)
+                continue
+            self._pending_ended.append(ended)
+            session.add(
+                StatesTiers(
+                    metadata_id=metadata_id,
+                    period=period,
+                    start_ts=ended_period.start_ts,
+                    min=ended_period.min,
+                    max=ended_period.max,
+                    state=ended_period.state,
+                    last_updated_ts=ended_period.last_updated_ts,
+                )
+            )
+        self._ended = not_flushed
+        self.recorder.history_tiers_recorded = True
+
+    def post_commit(self) -> None:
+        """Call after commit to make the flushed periods visible to history."""
+        self._pending_ended = []
+        if self._pending_flushed_until:
+            self._flushed_until.update(self._pending_flushed_until)
+            self._pending_flushed_until = {}
+
+    def reset(self) -> None:
+        """Queue the flushed periods of a session that was rolled back again."""
+        self._ended = self._pending_ended + self._ended
+        self._pending_ended = []
+        self._pending_flushed_until = {}
+        self._next_end_ts = 0.0
+
+    def flushed_until(self, period: int) -> float | None:
+        """Return the timestamp until which the periods of a tier are committed."""
+        return self._flushed_until.get(period)
+
+
+def has_tiers(session: Session) -> bool:
+    """Return if any history tiers were recorded."""
+    return session.execute(select(StatesTiers.tier_id).limit(1)).first() is not None
+
+
+def tier_compressed_states(
+    session: Session,
+    metadata_ids: dict[str, int | None],
+    period: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the periods of a tier in the compressed state format by entity_id.
+
+    Each period is returned as its last state, with the minimum and
+    the maximum of the numeric states of the period.
+    """
+    metadata_id_to_entity_id = {
+        metadata_id: entity_id
+        for entity_id, metadata_id in metadata_ids.items()
+        if metadata_id is not None
+    }
+    result: dict[str, list[dict[str, Any]]] = {}
+    if not metadata_id_to_entity_id:
+        return result
+    stmt = (
+        select(
+            StatesTiers.metadata_id,
+            StatesTiers.state,
+            StatesTiers.last_updated_ts,
+            StatesTiers.min,
+            StatesTiers.max,
+        )
+        .filter(StatesTiers.metadata_id.in_(metadata_id_to_entity_id))
+        .filter(StatesTiers.period == period)
+        .filter(StatesTiers.start_ts >= start_time.timestamp())
+        .filter(StatesTiers.start_ts < end_time.timestamp())
+        .order_by(StatesTiers.metadata_id, StatesTiers.start_ts)
+    )
+    for metadata_id, state, last_updated_ts, min_, max_ in session.execute(stmt):
+        compressed_state: dict[str, Any] = {
+            COMPRESSED_STATE_STATE: state,
+            COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+        }
+        if min_ is not None:
+            compressed_state[COMPRESSED_STATE_MIN] = min_
+            compressed_state[COMPRESSED_STATE_MAX] = max_
+        result.setdefault(metadata_id_to_entity_id[metadata_id], []).append(
+            compressed_state
+        )
+    return result
@@ -29,9 +29,11 @@ from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.ulid import ulid_at_time, ulid_to_bytes
 
+from . import partitions
 from .auto_repairs.events.schema import (
     correct_db_schema as events_correct_db_schema,
     validate_db_schema as events_validate_db_schema,
@@ -52,6 +54,7 @@ from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUPS_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
@@ -63,6 +66,7 @@ from .db_schema import (
     MYSQL_DEFAULT_CHARSET,
     SCHEMA_VERSION,
     STATISTICS_TABLES,
+    TABLE_EVENTS,
     TABLE_STATES,
     Base,
     Events,
@@ -71,8 +75,12 @@ from .db_schema import (
     SchemaChanges,
     States,
     StatesMeta,
+    StatesNumericChunks,
+    StatesTiers,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -92,11 +100,16 @@ from .queries import (
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
     has_states_context_ids_to_migrate,
+    has_statistics_to_rollup,
     has_used_states_event_ids,
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import get_start_time
+from .statistics import (
+    compile_statistics_rollups_before,
+    get_start_time,
+    statistics_rollups_match_time_zone,
+)
 from .tasks import (
     CommitTask,
     EntityIDMigrationTask,
@@ -105,6 +118,7 @@ from .tasks import (
     PostSchemaMigrationTask,
     RecorderTask,
     StatesContextIDMigrationTask,
+    StatisticsRollupsTask,
     StatisticsTimestampMigrationCleanupTask,
 )
 from .util import (
@@ -1089,6 +1103,17 @@ def _apply_update(  # noqa: C901
             "states",
             [f"last_reported_ts {_column_types.timestamp_type}"],
         )
+    elif new_version == 44:
+        # Create the table for the compacted numeric states
+        cast(Table, StatesNumericChunks.__table__).create(engine, checkfirst=True)
+    elif new_version == 45:
+        # Create the table for the history tiers
+        cast(Table, StatesTiers.__table__).create(engine, checkfirst=True)
+    elif new_version == 46:
+        # Create the tables for the daily and monthly statistics rollups,
+        # they are filled by the StatisticsRollupsMigration
+        cast(Table, StatisticsDaily.__table__).create(engine, checkfirst=True)
+        cast(Table, StatisticsMonthly.__table__).create(engine, checkfirst=True)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1692,6 +1717,26 @@ def migrate_entity_ids(instance: Recorder) -> bool:
     return is_done
 
 
+@retryable_database_job("migrate statistics rollups")
+def migrate_statistics_rollups(instance: Recorder, task: StatisticsRollupsTask) -> bool:
+    """Compile the daily and monthly rollups of the existing statistics.
+
+    The rollups are compiled one month at a time from the newest
+    statistics to the oldest, the task keeps where it stopped.
+    """
+    _LOGGER.debug("Migrating statistics rollups before %s", task.before_ts)
+    with session_scope(session=instance.get_session()) as session:
+        before_ts = compile_statistics_rollups_before(session, task.before_ts)
+        # If there is more work to do return False
+        # so that we can be called again
+        if is_done := before_ts is None:
+            _mark_migration_done(session, StatisticsRollupsMigration)
+
+    task.before_ts = before_ts
+    _LOGGER.debug("Migrating statistics rollups done=%s", is_done)
+    return is_done
+
+
 @retryable_database_job("post migrate states entity_ids to states_meta")
 def post_migrate_entity_ids(instance: Recorder) -> bool:
     """Remove old entity_id strings from states.
@@ -1793,6 +1838,50 @@ def initialize_database(session_maker: Callable[[], Session]) -> bool:
         return False
 
 
+def create_partitioned_tables(engine: Engine, interval: timedelta) -> None:
+    """Create the states and events tables of a new database partitioned.
+
+    The tables of an existing database keep their layout, partitioning them
+    would rewrite all rows.
+    """
+    dialect = try_parse_enum(SupportedDialect, engine.dialect.name)
+    assert dialect is not None
+    inspector = sqlalchemy.inspect(engine)
+    if inspector.has_table(TABLE_STATES) or inspector.has_table(TABLE_EVENTS):
+        with Session(engine) as session:
+            partitioned = partitions.list_partitions(
+                session, dialect, partitions.PARTITIONED_TABLES[0]
+            )
+        if not partitioned:
+            _LOGGER.warning(
+                "The states and events tables of an existing database are not"
+                " partitioned, the partition interval only applies to new databases"
+            )
+        return
+    partitioned_tables = {table.name for table in partitions.PARTITIONED_TABLES}
+    # The tables referenced by the partitioned tables have to exist first
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            table
+            for name, table in Base.metadata.tables.items()
+            if name not in partitioned_tables
+        ],
+    )
+    now = dt_util.utcnow()
+    with engine.begin() as connection:
+        for partitioned_table in partitions.PARTITIONED_TABLES:
+            _LOGGER.debug("Creating partitioned table %s", partitioned_table.name)
+            partitions.create_partitioned_table(
+                connection,
+                Base.metadata.tables[partitioned_table.name],
+                partitioned_table,
+                dialect,
+                interval,
+                now,
+            )
+
+
 class BaseRunTimeMigration(ABC):
     """Base class for run time migrations."""
 
@@ -1885,6 +1974,33 @@ class EntityIDMigration(BaseRunTimeMigration):
         return has_entity_ids_to_migrate()
 
 
+class StatisticsRollupsMigration(BaseRunTimeMigration):
+    """Migration to compile the rollups of the existing statistics."""
+
+    required_schema_version = STATISTICS_ROLLUPS_SCHEMA_VERSION
+    migration_id = "statistics_rollups"
+    task = StatisticsRollupsTask
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Check if there are statistics to rollup."""
+        return has_statistics_to_rollup()
+
+    def needs_migrate(self) -> bool:
+        """Return if the migration needs to run.
+
+        The periods of the rollups are local days and months, so the
+        rollups are compiled again if the time zone was changed.
+        """
+        if not super().needs_migrate():
+            if statistics_rollups_match_time_zone(self.session):
+                return False
+            _LOGGER.info("The time zone changed, compiling the statistics rollups")
+            self.session.query(MigrationChanges).filter(
+                MigrationChanges.migration_id == self.migration_id
+            ).delete()
+        return True
+
+
 def _mark_migration_done(
     session: Session, migration: type[BaseRunTimeMigration]
 ) -> None:
@@ -0,0 +1,453 @@
+"""Store the numeric states of entities compressed in chunks.
+
+Most of the states rows are written for sensors reporting a number. When
+compacting is enabled, runs of numeric states recorded before the last day
+are moved from the states table to the states_numeric_chunks table, where
+each run of states of an entity within a time window is stored as a single
+row with the timestamps and values compressed with the gorilla encoding.
+
+Only states which can be restored exactly are compacted: the state must be
+the representation of its value, it must not have a separate last_changed
+or last_reported timestamp, and all states of a chunk share their attributes.
+The context of the states is not kept.
+
+The history queries read the chunks together with the states rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+import heapq
+import logging
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from sqlalchemy import Row, Select, Table, and_, func, insert, or_, select
+from sqlalchemy.orm.session import Session
+
+from . import gorilla
+from .db_schema import StateAttributes, States, StatesNumericChunks
+from .queries import delete_states_rows, disconnect_states_rows
+from .util import chunked, session_scope
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# The states of a chunk are in the same window of this many seconds
+CHUNK_SECONDS = 7200
+# The maximum number of states of a chunk
+MAX_CHUNK_STATES = 1024
+# Runs shorter than this are left in the states table
+MIN_CHUNK_STATES = 2
+# The number of states rows of an entity to read at once
+COMPACT_STATES_PER_BATCH = 4096
+# The number of states rows to compact per recorder task
+COMPACT_STATES_PER_RUN = 20000
+
+# The states of the chunk are formatted as integers
+FLAG_INTEGERS = 1
+
+_MICROSECONDS = 1_000_000
+
+# We need to cast __table__ to Table, explanation in
+# https://github.com/sqlalchemy/sqlalchemy/issues/9130
+_STATES_NUMERIC_CHUNKS_TABLE = cast(Table, StatesNumericChunks.__table__)
+
+
+class NumericChunkRow(NamedTuple):
+    """A state decoded from a chunk, with the columns of a history row."""
+
+    metadata_id: int
+    state: str
+    last_updated_ts: float
+    last_changed_ts: float | None
+    last_reported_ts: float | None
+    attributes: str | None
+
+
+def parse_numeric_state(state: str | None) -> tuple[float, bool] | None:
+    """Return the value of a state and if the state is formatted as an integer.
+
+    Returns None if the state can't be restored exactly from its value.
+    """
+    if not state:
+        return None
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    if repr(value) == state:
+        return value, False
+    if value.is_integer() and str(int(value)) == state:
+        return value, True
+    return None
+
+
+def _format_value(value: float, integers: bool) -> str:
+    """Return the state of a value."""
+    return str(int(value)) if integers else repr(value)
+
+
+def _timestamp_to_microseconds(timestamp: float) -> int | None:
+    """Return the timestamp in microseconds if it can be restored exactly."""
+    microseconds = round(timestamp * _MICROSECONDS)
+    return microseconds if microseconds / _MICROSECONDS == timestamp else None
+
+
+class _Run:
+    """A run of numeric states of an entity which are stored in a chunk."""
+
+    __slots__ = ("key", "start_index", "state_ids", "timestamps", "values")
+
+    def __init__(self, key: tuple[int, int | None, bool], start_index: int) -> None:
+        """Initialize the run."""
+        self.key = key
+        self.start_index = start_index
+        self.state_ids: list[int] = []
+        self.timestamps: list[int] = []
+        self.values: list[float] = []
+
+
+def _runs_from_rows(rows: Sequence[Row]) -> Iterator[_Run]:
+    """Split the states rows of an entity in runs of states which can be compacted."""
+    run: _Run | None = None
+    for index, (
+        state_id,
+        state,
+        last_updated_ts,
+        last_changed_ts,
+        last_reported_ts,
+        attrs_id,
+    ) in enumerate(rows):
+        if (
+            (last_changed_ts is not None and last_changed_ts != last_updated_ts)
+            or (last_reported_ts is not None and last_reported_ts != last_updated_ts)
+            or (parsed := parse_numeric_state(state)) is None
+            or (timestamp := _timestamp_to_microseconds(last_updated_ts)) is None
+        ):
+            if run is not None:
+                yield run
+            run = None
+            continue
+        value, integers = parsed
+        key = (int(last_updated_ts // CHUNK_SECONDS), attrs_id, integers)
+        if run is None or run.key != key or len(run.state_ids) == MAX_CHUNK_STATES:
+            if run is not None:
+                yield run
+            run = _Run(key, index)
+        run.state_ids.append(state_id)
+        run.timestamps.append(timestamp)
+        run.values.append(value)
+    if run is not None:
+        yield run
+
+
+def _find_states_to_compact(
+    metadata_id: int, after: tuple[float, int] | None, before_ts: float
+) -> Select:
+    """Find the states of an entity to compact after a last_updated_ts and state_id.
+
+    States with the same last_updated_ts are ordered by their state_id, so
+    a batch can end between them.
+    """
+    stmt = select(
+        States.state_id,
+        States.state,
+        States.last_updated_ts,
+        States.last_changed_ts,
+        States.last_reported_ts,
+        States.attributes_id,
+    ).where(States.metadata_id == metadata_id, States.last_updated_ts < before_ts)
+    if after is not None:
+        after_ts, after_state_id = after
+        stmt = stmt.where(
+            or_(
+                States.last_updated_ts > after_ts,
+                and_(
+                    States.last_updated_ts == after_ts,
+                    States.state_id > after_state_id,
+                ),
+            )
+        )
+    return stmt.order_by(States.last_updated_ts, States.state_id).limit(
+        COMPACT_STATES_PER_BATCH
+    )
+
+
+def _compact_entity(
+    instance: Recorder,
+    session: Session,
+    metadata_id: int,
+    after: tuple[float, int] | None,
+    before_ts: float,
+) -> tuple[int, tuple[float, int] | None]:
+    """Compact a batch of the states of an entity recorded before before_ts.
+
+    Returns the number of states rows read and the last_updated_ts and
+    state_id to continue after, or None if all states of the entity were
+    compacted.
+    """
+    rows = session.execute(_find_states_to_compact(metadata_id, after, before_ts)).all()
+    # The last state is left in the states table since it may still be
+    # the current state of the entity, it's compacted with the next states
+    runs = list(_runs_from_rows(rows[:-1]))
+    resume_after: tuple[float, int] | None = None
+    if len(rows) == COMPACT_STATES_PER_BATCH:
+        # The last run may continue in the next batch
+        resume_index = len(rows) - 1
+        if len(runs) > 1:
+            resume_index = runs.pop().start_index
+        resume_row = rows[resume_index - 1]
+        resume_after = (resume_row.last_updated_ts, resume_row.state_id)
+
+    chunks: list[dict[str, Any]] = []
+    state_ids: list[int] = []
+    for run in runs:
+        if len(run.state_ids) < MIN_CHUNK_STATES:
+            continue
+        _, attributes_id, integers = run.key
+        chunks.append(
+            {
+                "metadata_id": metadata_id,
+                "attributes_id": attributes_id,
+                "start_ts": run.timestamps[0] / _MICROSECONDS,
+                "end_ts": run.timestamps[-1] / _MICROSECONDS,
+                "count": len(run.state_ids),
+                "flags": FLAG_INTEGERS if integers else 0,
+                "data": gorilla.encode(run.timestamps, run.values),
+            }
+        )
+        state_ids.extend(run.state_ids)
+
+    if not chunks:
+        return len(rows), resume_after
+
+    session.execute(insert(_STATES_NUMERIC_CHUNKS_TABLE), chunks)
+    for state_ids_chunk in chunked(state_ids, instance.max_bind_vars):
+        # Update old_state_id to NULL before deleting to ensure
+        # the delete does not fail due to a foreign key constraint
+        session.execute(disconnect_states_rows(state_ids_chunk))
+        session.execute(delete_states_rows(state_ids_chunk))
+    instance.states_manager.evict_purged_state_ids(set(state_ids))
+    instance.numeric_chunks_recorded = True
+    _LOGGER.debug(
+        "Compacted %s states of metadata_id %s in %s chunks",
+        len(state_ids),
+        metadata_id,
+        len(chunks),
+    )
+    return len(rows), resume_after
+
+
+def compact_numeric_states(
+    instance: Recorder,
+    entity_ids: list[str],
+    resume_after: dict[str, tuple[float, int]],
+    compact_before: datetime,
+) -> bool:
+    """Compact the numeric states of the entities recorded before compact_before.
+
+    The compacted entities are removed from entity_ids, and the last_updated_ts
+    and state_id to continue after are kept in resume_after for the entity
+    being compacted.
+    Returns True when all entities are compacted, or False if it should be
+    called again.
+    """
+    before_ts = compact_before.timestamp() // CHUNK_SECONDS * CHUNK_SECONDS
+    remaining = COMPACT_STATES_PER_RUN
+    with session_scope(session=instance.get_session()) as session:
+        metadata_ids = instance.states_meta_manager.get_many(entity_ids, session, True)
+        while entity_ids and remaining > 0:
+            entity_id = entity_ids[-1]
+            if (metadata_id := metadata_ids.get(entity_id)) is None:
+                entity_ids.pop()
+                continue
+            if (after := resume_after.pop(entity_id, None)) is None:
+                end_ts = session.execute(
+                    select(func.max(StatesNumericChunks.end_ts)).where(
+                        StatesNumericChunks.metadata_id == metadata_id
+                    )
+                ).scalar()
+                # The compacted states were deleted, so the states which
+                # are left at the end of the last chunk are compacted too
+                after = None if end_ts is None else (end_ts, 0)
+            rows, entity_resume_after = _compact_entity(
+                instance, session, metadata_id, after, before_ts
+            )
+            session.commit()
+            remaining -= rows
+            if entity_resume_after is None:
+                entity_ids.pop()
+            else:
+                resume_after[entity_id] = entity_resume_after
+    return not entity_ids
+
+
+def has_chunks(session: Session) -> bool:
+    """Return if any numeric states were compacted."""
+    return (
+        session.execute(select(StatesNumericChunks.chunk_id).limit(1)).first()
+        is not None
+    )
+
+
+def _decode_chunk(
+    row: Row, start_ts: float, end_ts: float | None, no_attributes: bool
+) -> Iterator[NumericChunkRow]:
+    """Decode the states of a chunk between start_ts and end_ts."""
+    metadata_id, count, flags, data = row[:4]
+    attributes = None if no_attributes else row[4]
+    integers = bool(flags & FLAG_INTEGERS)
+    timestamps, values = gorilla.decode(data, count)
+    for timestamp, value in zip(timestamps, values, strict=True):
+        last_updated_ts = timestamp / _MICROSECONDS
+        if last_updated_ts <= start_ts or (end_ts and last_updated_ts >= end_ts):
+            continue
+        yield NumericChunkRow(
+            metadata_id,
+            _format_value(value, integers),
+            last_updated_ts,
+            None,
+            None,
+            attributes,
+        )
+
+
+def _chunk_columns(no_attributes: bool) -> list[Any]:
+    """Return the columns to select to decode chunks."""
+    columns: list[Any] = [
+        StatesNumericChunks.metadata_id,
+        StatesNumericChunks.count,
+        StatesNumericChunks.flags,
+        StatesNumericChunks.data,
+    ]
+    if not no_attributes:
+        columns.append(StateAttributes.shared_attrs)
+    return columns
+
+
+def _with_attributes(stmt: Select, no_attributes: bool) -> Select:
+    """Join the attributes of the chunks."""
+    if no_attributes:
+        return stmt
+    return stmt.outerjoin(
+        StateAttributes,
+        StatesNumericChunks.attributes_id == StateAttributes.attributes_id,
+    )
+
+
+def numeric_chunk_rows(
+    session: Session,
+    metadata_ids: list[int],
+    start_time_ts: float,
+    end_time_ts: float | None,
+    no_attributes: bool,
+) -> list[NumericChunkRow]:
+    """Return the states in chunks between start_time_ts and end_time_ts.
+
+    The states are sorted by metadata_id and last_updated_ts.
+    """
+    stmt = select(*_chunk_columns(no_attributes)).where(
+        StatesNumericChunks.metadata_id.in_(metadata_ids),
+        StatesNumericChunks.end_ts > start_time_ts,
+    )
+    if end_time_ts:
+        stmt = stmt.where(StatesNumericChunks.start_ts < end_time_ts)
+    stmt = _with_attributes(stmt, no_attributes).order_by(
+        StatesNumericChunks.metadata_id, StatesNumericChunks.start_ts
+    )
+    return [
+        chunk_row
+        for row in session.execute(stmt)
+        for chunk_row in _decode_chunk(row, start_time_ts, end_time_ts, no_attributes)
+    ]
+
+
+def numeric_chunk_start_rows(
+    session: Session,
+    metadata_ids: list[int],
+    start_time_ts: float,
+    run_start_ts: float | None,
+    no_attributes: bool,
+) -> dict[int, NumericChunkRow]:
+    """Return the states at start_time_ts which are in chunks.
+
+    The state of an entity is only returned if it's more recent than the
+    last state of the entity in the states table before start_time_ts. Like
+    the start states of the states table, its last_updated_ts is 0.
+    """
+    latest_chunks = (
+        select(
+            StatesNumericChunks.metadata_id.label("max_metadata_id"),
+            func.max(StatesNumericChunks.start_ts).label("max_start_ts"),
+        )
+        .where(
+            StatesNumericChunks.metadata_id.in_(metadata_ids),
+            StatesNumericChunks.start_ts < start_time_ts,
+        )
+        .group_by(StatesNumericChunks.metadata_id)
+        .subquery()
+    )
+    stmt = select(*_chunk_columns(no_attributes)).join(
+        latest_chunks,
+        and_(
+            StatesNumericChunks.metadata_id == latest_chunks.c.max_metadata_id,
+            StatesNumericChunks.start_ts == latest_chunks.c.max_start_ts,
+        ),
+    )
+    start_rows: dict[int, tuple[float, NumericChunkRow]] = {}
+    for row in session.execute(_with_attributes(stmt, no_attributes)):
+        for chunk_row in _decode_chunk(row, 0, start_time_ts, no_attributes):
+            if run_start_ts is None or chunk_row.last_updated_ts >= run_start_ts:
+                start_rows[chunk_row.metadata_id] = (
+                    chunk_row.last_updated_ts,
+                    chunk_row._replace(last_updated_ts=0),
+                )
+    if not start_rows:
+        return {}
+
+    states_last_updated = cast(
+        dict[int, float],
+        dict(
+            session.execute(
+                select(States.metadata_id, func.max(States.last_updated_ts))
+                .where(
+                    States.metadata_id.in_(start_rows),
+                    States.last_updated_ts < start_time_ts,
+                )
+                .group_by(States.metadata_id)
+            )
+            .tuples()
+            .all()
+        ),
+    )
+    return {
+        metadata_id: start_row
+        for metadata_id, (last_updated_ts, start_row) in start_rows.items()
+        if last_updated_ts > states_last_updated.get(metadata_id, 0)
+    }
+
+
+def merge_numeric_chunk_rows(
+    rows: Iterable[Row],
+    chunk_rows: list[NumericChunkRow],
+    start_rows: dict[int, NumericChunkRow],
+) -> Iterable[Row]:
+    """Merge the states in chunks with the sorted history rows.
+
+    The start states in start_rows replace the start states of the rows.
+    The decoded states have the columns the history rows are read with.
+    """
+    if not chunk_rows and not start_rows:
+        return rows
+    if start_rows:
+        rows = (
+            row
+            for row in rows
+            if row[2] != 0 or row[0] not in start_rows  # last_updated_ts, metadata_id
+        )
+        chunk_rows = sorted([*start_rows.values(), *chunk_rows], key=itemgetter(0, 2))
+    return cast(Iterable[Row], heapq.merge(rows, chunk_rows, key=itemgetter(0, 2)))
@@ -0,0 +1,490 @@
+"""Time partitioned states and events tables.
+
+On PostgreSQL and MariaDB, the states and events tables of a new database
+can be created partitioned, so old data is purged by dropping whole
+partitions instead of deleting the rows one batch at a time.
+
+PostgreSQL partitions the tables by ranges of last_updated_ts and
+time_fired_ts, which also lets it skip the partitions outside of the
+period of history and logbook queries. A default partition keeps any
+rows which do not fit in the partitions created ahead of time.
+
+MariaDB can only partition by integer expressions, so the tables are
+partitioned by ranges of their primary keys. New rows are written to an
+open ended last partition, which is split off at the start of each period.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+from sqlalchemy import (
+    Column,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util import dt as dt_util
+
+from .const import SupportedDialect
+from .db_schema import TABLE_EVENTS, TABLE_STATES
+from .util import session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+PARTITION_INTERVALS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+# The number of periods to create partitions for ahead of time on PostgreSQL
+PARTITIONS_AHEAD = 2
+
+# The open ended last partition on MariaDB
+MAX_PARTITION = "pmax"
+
+_POSTGRESQL_BOUND = re.compile(r"FROM \('?([^')]+)'?\) TO \('?([^')]+)'?\)")
+
+
+class PartitionedTable(NamedTuple):
+    """A table which can be partitioned."""
+
+    name: str
+    id_column: str
+    time_column: str
+    # The column linking to the shared data, which may be unused
+    # once a partition is dropped
+    linked_column: str
+
+
+PARTITIONED_TABLES = (
+    PartitionedTable(TABLE_STATES, "state_id", "last_updated_ts", "attributes_id"),
+    PartitionedTable(TABLE_EVENTS, "event_id", "time_fired_ts", "data_id"),
+)
+
+
+class Partition(NamedTuple):
+    """A partition of a table."""
+
+    name: str
+    # The end of the range of the partition, a timestamp on PostgreSQL
+    # and an id on MariaDB, None for the default or last partition
+    end: float | None
+
+
+def partitioning_supported(dialect_name: SupportedDialect | None) -> bool:
+    """Return if the states and events tables can be partitioned."""
+    return dialect_name in (SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL)
+
+
+def partition_start(now: datetime, interval: timedelta) -> datetime:
+    """Return the start of the partition period containing now.
+
+    Daily periods start at midnight UTC and weekly periods on Monday.
+    """
+    start = dt_util.as_utc(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval >= timedelta(weeks=1):
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def _partition_name(
+    dialect_name: SupportedDialect, table: PartitionedTable, start: datetime
+) -> str:
+    """Return the name of the partition of a period."""
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        return f"{table.name}_p{start:%Y%m%d}"
+    return f"p{start:%Y%m%d}"
+
+
+def partitioned_table_definition(
+    table: Table, partitioned_table: PartitionedTable, dialect_name: SupportedDialect
+) -> Table:
+    """Return the definition of the partitioned version of a table.
+
+    Every unique key has to include the columns the table is partitioned
+    by. On PostgreSQL the primary key also includes the time column, and
+    the ids are taken from a sequence since identity columns are not
+    supported. Foreign keys referencing the table itself are not supported
+    by PostgreSQL, and MariaDB does not support foreign keys at all.
+    """
+    metadata = MetaData()
+    is_postgresql = dialect_name == SupportedDialect.POSTGRESQL
+    columns: list[Column] = []
+    for column in table.columns:
+        if column.name == partitioned_table.id_column:
+            if is_postgresql:
+                columns.append(
+                    Column(
+                        column.name,
+                        Integer,
+                        primary_key=True,
+                        autoincrement=False,
+                        server_default=text(
+                            f"nextval('{_sequence_name(partitioned_table)}')"
+                        ),
+                    )
+                )
+            else:
+                columns.append(
+                    Column(column.name, Integer, primary_key=True, autoincrement=True)
+                )
+        elif column.name == partitioned_table.time_column and is_postgresql:
+            columns.append(
+                Column(column.name, column.type, primary_key=True, autoincrement=False)
+            )
+        else:
+            columns.append(Column(column.name, column.type, nullable=column.nullable))
+
+    constraints: list[ForeignKeyConstraint] = []
+    if is_postgresql:
+        for constraint in table.foreign_key_constraints:
+            referred_table = constraint.referred_table
+            if referred_table.name == table.name:
+                continue
+            # Define the referred columns so the constraint can be rendered
+            if referred_table.name not in metadata.tables:
+                Table(
+                    referred_table.name,
+                    metadata,
+                    *(Column(column.name, Integer) for column in referred_table.c),
+                )
+            constraints.append(
+                ForeignKeyConstraint(
+                    constraint.column_keys,
+                    [
+                        f"{referred_table.name}.{element.column.name}"
+                        for element in constraint.elements
+                    ],
+                )
+            )
+
+    table_kwargs = dict(table.dialect_kwargs)
+    if is_postgresql:
+        table_kwargs["postgresql_partition_by"] = (
+            f"RANGE ({partitioned_table.time_column})"
+        )
+    partitioned = Table(table.name, metadata, *columns, *constraints, **table_kwargs)
+    for index in table.indexes:
+        Index(
+            index.name,
+            *(partitioned.c[column.name] for column in index.columns),
+            **index.dialect_kwargs,
+        )
+    return partitioned
+
+
+def _sequence_name(partitioned_table: PartitionedTable) -> str:
+    """Return the name of the sequence of the ids on PostgreSQL."""
+    return f"{partitioned_table.name}_{partitioned_table.id_column}_seq"
+
+
+def create_partitioned_table(
+    connection: Connection,
+    table: Table,
+    partitioned_table: PartitionedTable,
+    dialect_name: SupportedDialect,
+    interval: timedelta,
+    now: datetime,
+) -> None:
+    """Create a partitioned table and its first partitions."""
+    definition = partitioned_table_definition(table, partitioned_table, dialect_name)
+    name = partitioned_table.name
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        sequence = _sequence_name(partitioned_table)
+        connection.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {sequence}"))
+        definition.create(connection)
+        connection.execute(
+            text(
+                f"ALTER SEQUENCE {sequence} OWNED BY"
+                f" {name}.{partitioned_table.id_column}"
+            )
+        )
+        connection.execute(
+            text(f"CREATE TABLE {name}_default PARTITION OF {name} DEFAULT")
+        )
+        _add_postgresql_partitions(connection, partitioned_table, [], interval, now)
+        return
+    definition.create(connection)
+    connection.execute(
+        text(
+            f"ALTER TABLE {name} PARTITION BY RANGE ({partitioned_table.id_column})"
+            f" (PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE)"
+        )
+    )
+
+
+def list_partitions(
+    session: Session,
+    dialect_name: SupportedDialect,
+    partitioned_table: PartitionedTable,
+) -> list[Partition]:
+    """Return the partitions of a table ordered by their range.
+
+    A table which is not partitioned has no partitions.
+    """
+    partitions: list[Partition] = []
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        for name, bound in session.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+                " FROM pg_inherits"
+                " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+                " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+                " WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+            ),
+            {"table": partitioned_table.name},
+        ):
+            if match := _POSTGRESQL_BOUND.search(bound):
+                partitions.append(Partition(name, float(match.group(2))))
+            else:
+                partitions.append(Partition(name, None))
+    elif dialect_name == SupportedDialect.MYSQL:
+        for name, description in session.execute(
+            text(
+                "SELECT partition_name, partition_description"
+                " FROM information_schema.partitions"
+                " WHERE table_schema = DATABASE() AND table_name = :table"
+                " AND partition_name IS NOT NULL"
+            ),
+            {"table": partitioned_table.name},
+        ):
+            end = None if description == "MAXVALUE" else float(description)
+            partitions.append(Partition(name, end))
+    partitions.sort(key=lambda partition: (partition.end is None, partition.end))
+    return partitions
+
+
+def add_partitions(instance: Recorder, now: datetime) -> None:
+    """Add the partitions of the current and the upcoming periods.
+
+    On PostgreSQL the partitions are created ahead of time. On MariaDB the
+    rows written since the start of the last period are split off the last
+    partition once a new period started.
+    """
+    assert instance.partition_interval is not None
+    dialect_name = instance.dialect_name
+    assert dialect_name is not None
+    for partitioned_table in PARTITIONED_TABLES:
+        try:
+            with session_scope(session=instance.get_session()) as session:
+                partitions = list_partitions(session, dialect_name, partitioned_table)
+                if not partitions:
+                    continue
+                if dialect_name == SupportedDialect.POSTGRESQL:
+                    _add_postgresql_partitions(
+                        session.connection(),
+                        partitioned_table,
+                        partitions,
+                        instance.partition_interval,
+                        now,
+                    )
+                else:
+                    _split_mysql_partition(
+                        session,
+                        partitioned_table,
+                        partitions,
+                        instance.partition_interval,
+                        now,
+                    )
+        except SQLAlchemyError as err:
+            _LOGGER.warning(
+                "Could not add partitions to the %s table: %s",
+                partitioned_table.name,
+                err,
+            )
+
+
+def _add_postgresql_partitions(
+    connection: Connection,
+    partitioned_table: PartitionedTable,
+    partitions: list[Partition],
+    interval: timedelta,
+    now: datetime,
+) -> None:
+    """Create the partitions of the current and the upcoming periods.
+
+    Each partition is created in its own savepoint, so a period which can't
+    be added does not keep the other periods from being added.
+    """
+    existing = {partition.name for partition in partitions}
+    # Partitions created with another interval may cover the period
+    last_end = max(
+        (partition.end for partition in partitions if partition.end is not None),
+        default=0.0,
+    )
+    start = partition_start(now, interval)
+    for _ in range(PARTITIONS_AHEAD + 1):
+        end = start + interval
+        name = _partition_name(SupportedDialect.POSTGRESQL, partitioned_table, start)
+        if name not in existing and start.timestamp() >= last_end:
+            try:
+                with connection.begin_nested():
+                    _add_postgresql_partition(
+                        connection, partitioned_table, name, start, end
+                    )
+            except SQLAlchemyError as err:
+                _LOGGER.warning(
+                    "Could not add partition %s to the %s table: %s",
+                    name,
+                    partitioned_table.name,
+                    err,
+                )
+        start = end
+
+
+def _add_postgresql_partition(
+    connection: Connection,
+    partitioned_table: PartitionedTable,
+    name: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    """Create the partition of a period.
+
+    Rows of the period which were written before the partition existed
+    are in the default partition, which would conflict with the new
+    partition. They are moved to the new partition while the default
+    partition is detached.
+    """
+    table = partitioned_table.name
+    default = f"{table}_default"
+    time_column = partitioned_table.time_column
+    in_period = f"{time_column} >= :start AND {time_column} < :end"
+    bounds = {"start": start.timestamp(), "end": end.timestamp()}
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {table}"
+        f" FOR VALUES FROM ({start.timestamp()}) TO ({end.timestamp()})"
+    )
+    if (
+        connection.execute(
+            text(f"SELECT 1 FROM {default} WHERE {in_period} LIMIT 1"),  # noqa: S608
+            bounds,
+        ).first()
+        is None
+    ):
+        _LOGGER.debug("Adding partition %s", name)
+        connection.execute(create)
+        return
+    _LOGGER.debug("Adding partition %s with the rows of %s", name, default)
+    connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    connection.execute(create)
+    connection.execute(
+        text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_period}"),  # noqa: S608
+        bounds,
+    )
+    connection.execute(text(f"DELETE FROM {default} WHERE {in_period}"), bounds)  # noqa: S608
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+def _split_mysql_partition(
+    session: Session,
+    partitioned_table: PartitionedTable,
+    partitions: list[Partition],
+    interval: timedelta,
+    now: datetime,
+) -> None:
+    """Split the rows written until now off the last partition."""
+    start = partition_start(now, interval)
+    name = _partition_name(SupportedDialect.MYSQL, partitioned_table, start)
+    if any(
+        partition.name == name or partition.name > name
+        for partition in partitions
+        if partition.name != MAX_PARTITION
+    ):
+        return
+    table = partitioned_table.name
+    id_column = partitioned_table.id_column
+    max_id = session.execute(text(f"SELECT MAX({id_column}) FROM {table}")).scalar()  # noqa: S608
+    last_end = max(
+        (partition.end for partition in partitions if partition.end is not None),
+        default=0.0,
+    )
+    if max_id is None or max_id < last_end:
+        return
+    _LOGGER.debug("Adding partition %s to the %s table", name, table)
+    session.execute(
+        text(
+            f"ALTER TABLE {table} REORGANIZE PARTITION {MAX_PARTITION} INTO"
+            f" (PARTITION {name} VALUES LESS THAN ({max_id + 1}),"
+            f" PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE)"
+        )
+    )
+
+
+def _partition_from_clause(
+    dialect_name: SupportedDialect,
+    partitioned_table: PartitionedTable,
+    partition: Partition,
+) -> str:
+    """Return the FROM clause selecting the rows of a partition."""
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        return partition.name
+    return f"{partitioned_table.name} PARTITION ({partition.name})"
+
+
+def partition_expired(
+    session: Session,
+    dialect_name: SupportedDialect,
+    partitioned_table: PartitionedTable,
+    partition: Partition,
+    purge_before_ts: float,
+) -> bool:
+    """Return if all rows of a partition are older than purge_before_ts."""
+    if partition.end is None:
+        return False
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        return partition.end <= purge_before_ts
+    newest_ts = session.execute(
+        text(
+            f"SELECT MAX({partitioned_table.time_column}) FROM"  # noqa: S608
+            f" {_partition_from_clause(dialect_name, partitioned_table, partition)}"
+        )
+    ).scalar()
+    return newest_ts is None or newest_ts < purge_before_ts
+
+
+def drop_partition(
+    session: Session,
+    dialect_name: SupportedDialect,
+    partitioned_table: PartitionedTable,
+    partition: Partition,
+) -> tuple[set[int], int | None]:
+    """Drop a partition.
+
+    Returns the ids linked by the rows of the partition and the newest id
+    of the partition.
+    """
+    from_clause = _partition_from_clause(dialect_name, partitioned_table, partition)
+    linked_column = partitioned_table.linked_column
+    linked_ids: set[int] = set(
+        session.execute(
+            text(
+                f"SELECT DISTINCT {linked_column} FROM {from_clause}"  # noqa: S608
+                f" WHERE {linked_column} IS NOT NULL"
+            )
+        ).scalars()
+    )
+    max_id: int | None = session.execute(
+        text(f"SELECT MAX({partitioned_table.id_column}) FROM {from_clause}")  # noqa: S608
+    ).scalar()
+    _LOGGER.debug("Dropping partition %s", partition.name)
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        session.execute(text(f"DROP TABLE {partition.name}"))
+    else:
+        session.execute(
+            text(
+                f"ALTER TABLE {partitioned_table.name} DROP PARTITION {partition.name}"
+            )
+        )
+    return linked_ids, max_id
@@ -7,13 +7,16 @@ from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from .db_schema import Events, States, StatesMeta
+from . import partitions
+from .db_schema import TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
+    attributes_ids_exist_in_numeric_chunks,
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
     data_ids_exist_in_events,
@@ -21,6 +24,8 @@ from .queries import (
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
+    delete_history_tiers_rows,
+    delete_numeric_chunks_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
     delete_states_meta_rows,
@@ -30,13 +35,22 @@ from .queries import (
     disconnect_states_rows,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
+    find_events_in_id_range,
     find_events_to_purge,
+    find_events_to_purge_id_range,
+    find_history_tiers_metadata_ids,
+    find_history_tiers_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_numeric_chunks_metadata_ids,
+    find_numeric_chunks_of_metadata_ids_to_purge,
+    find_numeric_chunks_to_purge,
     find_short_term_statistics_to_purge,
+    find_states_in_id_range,
     find_states_to_purge,
+    find_states_to_purge_id_range,
     find_statistics_runs_to_purge,
 )
 from .repack import repack_database
@@ -52,6 +66,17 @@ DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
 
+class PurgeRangeResult(NamedTuple):
+    """Result of purging a range of states or events."""
+
+    purged_rows: int
+    # The first and last ids left to purge, None once there are none
+    state_ids: tuple[int, int] | None
+    event_ids: tuple[int, int] | None
+    # The number of states and events to purge, if the ranges were found
+    total_rows: int | None
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -84,12 +109,22 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
+            if instance.partitioned_tables:
+                _drop_expired_partitions(instance, session, purge_before)
             has_more_to_purge |= _purge_states_and_attributes_ids(
                 instance, session, states_batch_size, purge_before
             )
             has_more_to_purge |= _purge_events_and_data_ids(
                 instance, session, events_batch_size, purge_before
             )
+            if instance.numeric_chunks_recorded:
+                has_more_to_purge |= _purge_numeric_chunks(
+                    instance, session, purge_before
+                )
+            if instance.history_tiers_recorded:
+                has_more_to_purge |= _purge_history_tiers(
+                    instance, session, purge_before
+                )
 
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
@@ -126,6 +161,129 @@ def purge_old_data(
     return True
 
 
+def purge_old_data_range(
+    instance: Recorder,
+    purge_before: datetime,
+    state_ids: tuple[int, int] | None,
+    event_ids: tuple[int, int] | None,
+    max_rows: int,
+    find_ranges: bool,
+) -> PurgeRangeResult:
+    """Purge the states or events older than purge_before in a range of ids.
+
+    If find_ranges is set, the ranges of ids of the states and events to
+    purge are looked up first instead of using state_ids and event_ids.
+    The states are purged before the events. At most max_rows consecutive
+    ids are looked at, so each transaction stays small.
+    """
+    purge_before_ts = purge_before.timestamp()
+    total_rows: int | None = None
+    purged_rows = 0
+    with session_scope(session=instance.get_session()) as session:
+        if instance.use_legacy_events_index and _purging_legacy_format(session):
+            # The states are still linked to the events by the event_ids
+            # and have to be purged together by the regular purge
+            _LOGGER.debug("Not purging by range as there are legacy rows remaining")
+            return PurgeRangeResult(0, None, None, None)
+        if find_ranges:
+            state_count, state_ids = _find_id_range(
+                session, find_states_to_purge_id_range(purge_before_ts)
+            )
+            event_count, event_ids = _find_id_range(
+                session, find_events_to_purge_id_range(purge_before_ts)
+            )
+            total_rows = state_count + event_count
+        if state_ids is not None:
+            purge_state_ids, attributes_ids, state_ids = _select_expired_ids_in_range(
+                session,
+                find_states_in_id_range(*state_ids, max_rows),
+                state_ids,
+                purge_before_ts,
+                max_rows,
+            )
+            _purge_state_ids(instance, session, purge_state_ids)
+            _purge_unused_attributes_ids(instance, session, attributes_ids)
+            purged_rows = len(purge_state_ids)
+        elif event_ids is not None:
+            purge_event_ids, data_ids, event_ids = _select_expired_ids_in_range(
+                session,
+                find_events_in_id_range(*event_ids, max_rows),
+                event_ids,
+                purge_before_ts,
+                max_rows,
+            )
+            _purge_event_ids(session, purge_event_ids)
+            _purge_unused_data_ids(instance, session, data_ids)
+            purged_rows = len(purge_event_ids)
+    return PurgeRangeResult(purged_rows, state_ids, event_ids, total_rows)
+
+
+def _find_id_range(
+    session: Session, stmt: StatementLambdaElement
+) -> tuple[int, tuple[int, int] | None]:
+    """Return the number and the first and last ids of the rows to purge."""
+    count, first_id, last_id = session.execute(stmt).one()
+    if not count:
+        return 0, None
+    return count, (first_id, last_id)
+
+
+def _select_expired_ids_in_range(
+    session: Session,
+    stmt: StatementLambdaElement,
+    id_range: tuple[int, int],
+    purge_before_ts: float,
+    max_rows: int,
+) -> tuple[set[int], set[int], tuple[int, int] | None]:
+    """Return the expired row ids and their linked ids in the first rows of a range.
+
+    Also returns the range of ids left to purge, or None if there are none.
+    """
+    row_ids: set[int] = set()
+    linked_ids: set[int] = set()
+    rows = session.execute(stmt).all()
+    for row_id, linked_id, timestamp in rows:
+        if timestamp is not None and timestamp < purge_before_ts:
+            row_ids.add(row_id)
+            if linked_id:
+                linked_ids.add(linked_id)
+    _LOGGER.debug(
+        "Selected %s of %s ids and %s linked ids to remove",
+        len(row_ids),
+        len(rows),
+        len(linked_ids),
+    )
+    if len(rows) < max_rows or (next_id := rows[-1][0] + 1) > id_range[1]:
+        return row_ids, linked_ids, None
+    return row_ids, linked_ids, (next_id, id_range[1])
+
+
+def _drop_expired_partitions(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> None:
+    """Drop the partitions of the states and events which have expired."""
+    dialect_name = instance.dialect_name
+    assert dialect_name is not None
+    purge_before_ts = purge_before.timestamp()
+    for partitioned_table in partitions.PARTITIONED_TABLES:
+        for partition in partitions.list_partitions(
+            session, dialect_name, partitioned_table
+        ):
+            if not partitions.partition_expired(
+                session, dialect_name, partitioned_table, partition, purge_before_ts
+            ):
+                break
+            linked_ids, max_id = partitions.drop_partition(
+                session, dialect_name, partitioned_table, partition
+            )
+            if partitioned_table.name != TABLE_STATES:
+                _purge_unused_data_ids(instance, session, linked_ids)
+                continue
+            if max_id is not None:
+                instance.states_manager.evict_purged_state_ids_up_to(max_id)
+            _purge_unused_attributes_ids(instance, session, linked_ids)
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -208,6 +366,64 @@ def _purge_states_and_attributes_ids(
     return has_remaining_state_ids_to_purge
 
 
+def _purge_numeric_chunks(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Purge numeric chunks and linked attributes id in a batch.
+
+    Returns true if there are more chunks to purge.
+    """
+    chunk_ids, attributes_ids = _select_numeric_chunks_to_purge(
+        session,
+        find_numeric_chunks_to_purge(purge_before.timestamp(), instance.max_bind_vars),
+    )
+    if not chunk_ids:
+        return False
+    _purge_numeric_chunk_ids(session, chunk_ids)
+    _purge_unused_attributes_ids(instance, session, attributes_ids)
+    return True
+
+
+def _purge_history_tiers(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Purge the periods of the history tiers in a batch.
+
+    Returns true if there are more periods to purge.
+    """
+    tier_ids = [
+        tier_id
+        for (tier_id,) in session.execute(
+            find_history_tiers_to_purge(
+                purge_before.timestamp(), instance.max_bind_vars
+            )
+        )
+    ]
+    if not tier_ids:
+        return False
+    deleted_rows = session.execute(delete_history_tiers_rows(tier_ids))
+    _LOGGER.debug("Deleted %s history tiers", deleted_rows)
+    return True
+
+
+def _select_numeric_chunks_to_purge(
+    session: Session, stmt: StatementLambdaElement
+) -> tuple[set[int], set[int]]:
+    """Return sets of chunk and attribute ids to purge."""
+    chunk_ids = set()
+    attributes_ids = set()
+    for chunk_id, attributes_id in session.execute(stmt):
+        chunk_ids.add(chunk_id)
+        if attributes_id:
+            attributes_ids.add(attributes_id)
+    _LOGGER.debug(
+        "Selected %s numeric chunk ids and %s attributes_ids to remove",
+        len(chunk_ids),
+        len(attributes_ids),
+    )
+    return chunk_ids, attributes_ids
+
+
 def _purge_events_and_data_ids(
     instance: Recorder,
     session: Session,
@@ -351,6 +567,16 @@ def _select_unused_attributes_ids(
                 ).all()
                 if attrs_id[0] is not None
             }
+    if instance.numeric_chunks_recorded:
+        for attributes_ids_chunk in chunked_or_all(
+            attributes_ids - seen_ids, instance.max_bind_vars
+        ):
+            seen_ids.update(
+                chunk[0]
+                for chunk in session.execute(
+                    attributes_ids_exist_in_numeric_chunks(attributes_ids_chunk)
+                ).all()
+            )
     to_remove = attributes_ids - seen_ids
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
@@ -552,6 +778,12 @@ def _purge_batch_data_ids(
     instance.event_data_manager.evict_purged(data_ids)
 
 
+def _purge_numeric_chunk_ids(session: Session, chunk_ids: set[int]) -> None:
+    """Delete by numeric chunk id."""
+    deleted_rows = session.execute(delete_numeric_chunks_rows(chunk_ids))
+    _LOGGER.debug("Deleted %s numeric chunks", deleted_rows)
+
+
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
     """Delete by run_id."""
     deleted_rows = session.execute(delete_statistics_runs_rows(statistics_runs))
@@ -611,21 +843,30 @@ def _purge_old_event_types(instance: Recorder, session: Session) -> None:
 def _purge_old_entity_ids(instance: Recorder, session: Session) -> None:
     """Purge all old entity_ids."""
     # entity_ids are small, no need to batch run it
-    purge_entity_ids = set()
-    states_metadata_ids = set()
+    purge_entity_ids: dict[int, str] = {}
     for metadata_id, entity_id in session.execute(find_entity_ids_to_purge()):
-        purge_entity_ids.add(entity_id)
-        states_metadata_ids.add(metadata_id)
+        purge_entity_ids[metadata_id] = entity_id
+
+    if purge_entity_ids and instance.numeric_chunks_recorded:
+        # Keep the entity_ids which only have compacted states left
+        for (metadata_id,) in session.execute(find_numeric_chunks_metadata_ids()):
+            purge_entity_ids.pop(metadata_id, None)
 
-    if not states_metadata_ids:
+    if purge_entity_ids and instance.history_tiers_recorded:
+        # Keep the entity_ids which still have history tiers
+        for (metadata_id,) in session.execute(find_history_tiers_metadata_ids()):
+            purge_entity_ids.pop(metadata_id, None)
+
+    if not purge_entity_ids:
         return
 
-    deleted_rows = session.execute(delete_states_meta_rows(states_metadata_ids))
+    deleted_rows = session.execute(delete_states_meta_rows(list(purge_entity_ids)))
     _LOGGER.debug("Deleted %s states meta", deleted_rows)
 
     # Evict any entries in the event_type cache referring to a purged state
-    instance.states_meta_manager.evict_purged(purge_entity_ids)
-    instance.states_manager.evict_purged_entity_ids(purge_entity_ids)
+    entity_ids = set(purge_entity_ids.values())
+    instance.states_meta_manager.evict_purged(entity_ids)
+    instance.states_manager.evict_purged_entity_ids(entity_ids)
 
 
 def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
@@ -638,7 +879,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     # Check if excluded entity_ids are in database
     entity_filter = instance.entity_filter
     has_more_states_to_purge = False
-    excluded_metadata_ids: list[str] = [
+    excluded_metadata_ids: list[int] = [
         metadata_id
         for (metadata_id, entity_id) in session.query(
             StatesMeta.metadata_id, StatesMeta.entity_id
@@ -674,7 +915,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    metadata_ids_to_purge: list[str],
+    metadata_ids_to_purge: list[int],
     database_engine: DatabaseEngine,
     purge_before_timestamp: float,
 ) -> bool:
@@ -693,7 +934,19 @@ def _purge_filtered_states(
         .all()
     )
     if not to_purge:
-        return True
+        if not instance.numeric_chunks_recorded:
+            return True
+        chunk_ids, chunk_attributes_ids = _select_numeric_chunks_to_purge(
+            session,
+            find_numeric_chunks_of_metadata_ids_to_purge(
+                metadata_ids_to_purge, purge_before_timestamp, instance.max_bind_vars
+            ),
+        )
+        if not chunk_ids:
+            return True
+        _purge_numeric_chunk_ids(session, chunk_ids)
+        _purge_unused_attributes_ids(instance, session, chunk_attributes_ids)
+        return False
     state_ids, attributes_ids, event_ids = zip(*to_purge)
     filtered_event_ids = {id_ for id_ in event_ids if id_ is not None}
     _LOGGER.debug(
@@ -770,7 +1023,7 @@ def purge_entity_data(
     assert database_engine is not None
     purge_before_timestamp = purge_before.timestamp()
     with session_scope(session=instance.get_session()) as session:
-        selected_metadata_ids: list[str] = [
+        selected_metadata_ids: list[int] = [
             metadata_id
             for (metadata_id, entity_id) in session.query(
                 StatesMeta.metadata_id, StatesMeta.entity_id
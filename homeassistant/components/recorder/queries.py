@@ -18,6 +18,8 @@ from .db_schema import (
     StateAttributes,
     States,
     StatesMeta,
+    StatesNumericChunks,
+    StatesTiers,
     Statistics,
     StatisticsRuns,
     StatisticsShortTerm,
@@ -44,6 +46,25 @@ def get_shared_attributes(hashes: list[int]) -> StatementLambdaElement:
     )
 
 
+def get_shared_attributes_by_ids(attributes_ids: list[int]) -> StatementLambdaElement:
+    """Load shared attributes from the database by attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).where(StateAttributes.attributes_id.in_(attributes_ids))
+    )
+
+
+def find_recent_states_attributes_ids(limit: int) -> StatementLambdaElement:
+    """Find the attributes_ids of the most recently recorded states."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id)
+        .where(States.attributes_id.isnot(None))
+        .order_by(States.state_id.desc())
+        .limit(limit)
+    )
+
+
 def get_shared_event_datas(hashes: list[int]) -> StatementLambdaElement:
     """Load shared event data from the database."""
     return lambda_stmt(
@@ -636,6 +657,127 @@ def find_states_to_purge(
     )
 
 
+def find_events_in_id_range(
+    start_event_id: int, end_event_id: int, max_rows: int
+) -> StatementLambdaElement:
+    """Find the first events in a range of event ids."""
+    return lambda_stmt(
+        lambda: select(Events.event_id, Events.data_id, Events.time_fired_ts)
+        .filter(Events.event_id >= start_event_id)
+        .filter(Events.event_id <= end_event_id)
+        .order_by(Events.event_id)
+        .limit(max_rows)
+    )
+
+
+def find_states_in_id_range(
+    start_state_id: int, end_state_id: int, max_rows: int
+) -> StatementLambdaElement:
+    """Find the first states in a range of state ids."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.attributes_id, States.last_updated_ts)
+        .filter(States.state_id >= start_state_id)
+        .filter(States.state_id <= end_state_id)
+        .order_by(States.state_id)
+        .limit(max_rows)
+    )
+
+
+def find_events_to_purge_id_range(purge_before: float) -> StatementLambdaElement:
+    """Find the number and the range of ids of the events to purge."""
+    return lambda_stmt(
+        lambda: select(
+            func.count(Events.event_id),
+            func.min(Events.event_id),
+            func.max(Events.event_id),
+        ).filter(Events.time_fired_ts < purge_before)
+    )
+
+
+def find_states_to_purge_id_range(purge_before: float) -> StatementLambdaElement:
+    """Find the number and the range of ids of the states to purge."""
+    return lambda_stmt(
+        lambda: select(
+            func.count(States.state_id),
+            func.min(States.state_id),
+            func.max(States.state_id),
+        ).filter(States.last_updated_ts < purge_before)
+    )
+
+
+def find_numeric_chunks_to_purge(
+    purge_before: float, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find numeric chunks to purge."""
+    return lambda_stmt(
+        lambda: select(StatesNumericChunks.chunk_id, StatesNumericChunks.attributes_id)
+        .filter(StatesNumericChunks.end_ts < purge_before)
+        .limit(max_bind_vars)
+    )
+
+
+def find_numeric_chunks_of_metadata_ids_to_purge(
+    metadata_ids: Iterable[int], purge_before: float, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find numeric chunks of specific entities to purge."""
+    return lambda_stmt(
+        lambda: select(StatesNumericChunks.chunk_id, StatesNumericChunks.attributes_id)
+        .filter(StatesNumericChunks.metadata_id.in_(metadata_ids))
+        .filter(StatesNumericChunks.end_ts < purge_before)
+        .limit(max_bind_vars)
+    )
+
+
+def find_numeric_chunks_metadata_ids() -> StatementLambdaElement:
+    """Find the metadata_ids which have numeric chunks."""
+    return lambda_stmt(lambda: select(distinct(StatesNumericChunks.metadata_id)))
+
+
+def attributes_ids_exist_in_numeric_chunks(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find attributes ids that exist in the states_numeric_chunks table."""
+    return lambda_stmt(
+        lambda: select(distinct(StatesNumericChunks.attributes_id)).filter(
+            StatesNumericChunks.attributes_id.in_(attributes_ids)
+        )
+    )
+
+
+def delete_numeric_chunks_rows(chunk_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_numeric_chunks rows."""
+    return lambda_stmt(
+        lambda: delete(StatesNumericChunks)
+        .where(StatesNumericChunks.chunk_id.in_(chunk_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_history_tiers_to_purge(
+    purge_before: float, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find history tiers to purge."""
+    return lambda_stmt(
+        lambda: select(StatesTiers.tier_id)
+        .filter(StatesTiers.start_ts < purge_before)
+        .limit(max_bind_vars)
+    )
+
+
+def find_history_tiers_metadata_ids() -> StatementLambdaElement:
+    """Find the metadata_ids which have history tiers."""
+    return lambda_stmt(lambda: select(distinct(StatesTiers.metadata_id)))
+
+
+def delete_history_tiers_rows(tier_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_tiers rows."""
+    return lambda_stmt(
+        lambda: delete(StatesTiers)
+        .where(StatesTiers.tier_id.in_(tier_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -798,6 +940,11 @@ def has_entity_ids_to_migrate() -> StatementLambdaElement:
     )
 
 
+def has_statistics_to_rollup() -> StatementLambdaElement:
+    """Check if there are long term statistics to rollup."""
+    return lambda_stmt(lambda: select(Statistics.id).limit(1))
+
+
 def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Collection, Iterable, Sequence
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import itemgetter
 import re
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    bindparam,
+    func,
+    lambda_stmt,
+    select,
+    text,
+)
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -58,6 +68,9 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -440,6 +453,173 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
     )
 
 
+def _statistics_rollup_periods() -> (
+    tuple[
+        tuple[type[StatisticsRollupBase], Callable[[float], tuple[float, float]]], ...
+    ]
+):
+    """Return the rollup tables with the functions to find their periods.
+
+    The daily rollups come first since the monthly rollups are compiled
+    from them.
+    """
+    return (
+        (StatisticsDaily, reduce_day_ts_factory()[1]),
+        (StatisticsMonthly, reduce_month_ts_factory()[1]),
+    )
+
+
+def _compile_statistics_rollup(
+    session: Session,
+    table: type[StatisticsRollupBase],
+    start_ts: float,
+    end_ts: float,
+    metadata_id: int | None,
+) -> None:
+    """Compile the rollups of a day or a month.
+
+    The mean, min and max of a day are computed over its hourly statistics,
+    like when the hourly statistics are reduced. A month is compiled from
+    its daily rollups, so only a month of daily rows is read each hour. Its
+    mean is the mean of the daily means weighted by their number of hourly
+    means. The sum is taken from the last hourly statistics of a day, or
+    the last daily rollup of a month.
+    """
+    source: type[StatisticsBase]
+    mean: ColumnElement[Any]
+    mean_count: ColumnElement[Any]
+    if table is StatisticsMonthly:
+        source = StatisticsDaily
+        mean_count = func.sum(StatisticsDaily.mean_count)
+        mean = func.sum(
+            StatisticsDaily.mean * StatisticsDaily.mean_count
+        ) / func.nullif(mean_count, 0)
+    else:
+        source = Statistics
+        mean_count = func.count(Statistics.mean)
+        mean = func.avg(Statistics.mean)
+    summary_stmt = (
+        select(
+            source.metadata_id,
+            mean,
+            func.min(source.min),
+            func.max(source.max),
+            mean_count,
+        )
+        .filter(source.start_ts >= start_ts)
+        .filter(source.start_ts < end_ts)
+    )
+    last_stmt = (
+        select(
+            source.metadata_id,
+            source.last_reset_ts,
+            source.state,
+            source.sum,
+            func.row_number()
+            .over(
+                partition_by=source.metadata_id,
+                order_by=source.start_ts.desc(),
+            )
+            .label("rownum"),
+        )
+        .filter(source.start_ts >= start_ts)
+        .filter(source.start_ts < end_ts)
+    )
+    delete_query = (
+        session.query(table)
+        .filter(table.start_ts >= start_ts)
+        .filter(table.start_ts < end_ts)
+    )
+    if metadata_id is not None:
+        summary_stmt = summary_stmt.filter(source.metadata_id == metadata_id)
+        last_stmt = last_stmt.filter(source.metadata_id == metadata_id)
+        delete_query = delete_query.filter(table.metadata_id == metadata_id)
+
+    summary: dict[int, StatisticDataTimestamp] = {}
+    mean_counts: dict[int, int] = {}
+    for stat_metadata_id, _mean, _min, _max, _mean_count in session.execute(
+        summary_stmt.group_by(source.metadata_id)
+    ):
+        summary[stat_metadata_id] = {
+            "start_ts": start_ts,
+            "mean": _mean,
+            "min": _min,
+            "max": _max,
+        }
+        mean_counts[stat_metadata_id] = _mean_count
+    subquery = last_stmt.subquery()
+    for stat_metadata_id, last_reset_ts, state, _sum, _ in session.execute(
+        select(subquery).filter(subquery.c.rownum == 1)
+    ):
+        if stat_metadata_id in summary:
+            summary[stat_metadata_id].update(
+                {"last_reset_ts": last_reset_ts, "state": state, "sum": _sum}
+            )
+
+    delete_query.delete(synchronize_session=False)
+    for stat_metadata_id, summary_item in summary.items():
+        rollup = table.from_stats_ts(stat_metadata_id, summary_item)
+        rollup.end_ts = end_ts
+        rollup.mean_count = mean_counts[stat_metadata_id]
+        session.add(rollup)
+
+
+def _compile_statistics_rollups(
+    session: Session, start_tss: Collection[float], metadata_id: int | None = None
+) -> None:
+    """Compile the daily and monthly rollups of the periods of the timestamps.
+
+    If metadata_id is given, only the rollups of that statistic are compiled.
+    """
+    for table, period_start_end in _statistics_rollup_periods():
+        # The rollups are compiled from the statistics added to the session
+        session.flush()
+        for start_ts, end_ts in sorted(
+            {period_start_end(start_ts) for start_ts in start_tss}
+        ):
+            _compile_statistics_rollup(session, table, start_ts, end_ts, metadata_id)
+
+
+def compile_statistics_rollups_before(
+    session: Session, before_ts: float | None
+) -> float | None:
+    """Compile the rollups of the month of the newest statistics before a time.
+
+    Returns the start of the compiled month, or None if there are no
+    statistics left to compile.
+    """
+    stmt = select(func.max(Statistics.start_ts))
+    if before_ts is not None:
+        stmt = stmt.filter(Statistics.start_ts < before_ts)
+    if (newest_start_ts := session.execute(stmt).scalar()) is None:
+        return None
+    _, day_start_end_ts = reduce_day_ts_factory()
+    _, month_start_end_ts = reduce_month_ts_factory()
+    month_start_ts, month_end_ts = month_start_end_ts(newest_start_ts)
+    day_start_tss: list[float] = []
+    day_start_ts = month_start_ts
+    while day_start_ts < month_end_ts:
+        day_start_tss.append(day_start_ts)
+        day_start_ts = day_start_end_ts(day_start_ts)[1]
+    _compile_statistics_rollups(session, day_start_tss)
+    return month_start_ts
+
+
+def statistics_rollups_match_time_zone(session: Session) -> bool:
+    """Return if the periods of the rollups are the days and months of the time zone.
+
+    Only the oldest and the newest rollups are checked.
+    """
+    for table, period_start_end in _statistics_rollup_periods():
+        for order_by in (table.start_ts, table.start_ts.desc()):
+            row = session.execute(
+                select(table.start_ts, table.end_ts).order_by(order_by).limit(1)
+            ).first()
+            if row is not None and period_start_end(row.start_ts) != tuple(row):
+                return False
+    return True
+
+
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
     """Compile missing statistics."""
@@ -577,6 +757,7 @@ def _compile_statistics(
     if start.minute == 55:
         # A full hour is ready, summarize it
         _compile_hourly_statistics(session, start)
+        _compile_statistics_rollups(session, {start.replace(minute=0).timestamp()})
 
     session.add(StatisticsRuns(start=start))
 
@@ -876,61 +1057,78 @@ def list_statistic_ids(
     return _flatten_list_statistic_ids_metadata_result(result)
 
 
+def _reduce_column(
+    values: list[Any], reduce: Callable[[list[float]], float | None]
+) -> float | None:
+    """Reduce the values of a period of a statistics column, ignoring None."""
+    try:
+        return reduce(values) if values else None
+    except TypeError:
+        # Comparing or adding None raises, which is cheaper than looking for it
+        values = [value for value in values if value is not None]
+        return reduce(values) if values else None
+
+
 def _reduce_statistics(
     stats: dict[str, list[StatisticsRow]],
-    same_period: Callable[[float, float], bool],
     period_start_end: Callable[[float], tuple[float, float]],
-    period: timedelta,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
+    """Reduce hourly statistics to daily or monthly statistics.
+
+    The hourly statistics are sorted by start, so the last statistic of each
+    period is found by bisecting for the end of the period. The mean, min
+    and max of a period are computed over slices of columns extracted from
+    the hourly statistics, other types only read the last statistic.
+    """
     result: dict[str, list[StatisticsRow]] = defaultdict(list)
-    period_seconds = period.total_seconds()
     _want_mean = "mean" in types
     _want_min = "min" in types
     _want_max = "max" in types
     _want_last_reset = "last_reset" in types
     _want_state = "state" in types
     _want_sum = "sum" in types
+    _start = itemgetter("start")
+    # The statistics mostly share the same hours, cache their periods
+    period_start_ends: dict[float, tuple[float, float]] = {}
     for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: StatisticsRow = stat_list[0]
-        fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                row: StatisticsRow = {
-                    "start": start,
-                    "end": end,
-                }
-                if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
-                    mean_values.clear()
-                if _want_min:
-                    row["min"] = min(min_values) if min_values else None
-                    min_values.clear()
-                if _want_max:
-                    row["max"] = max(max_values) if max_values else None
-                    max_values.clear()
-                if _want_last_reset:
-                    row["last_reset"] = prev_stat.get("last_reset")
-                if _want_state:
-                    row["state"] = prev_stat.get("state")
-                if _want_sum:
-                    row["sum"] = prev_stat["sum"]
-                result[statistic_id].append(row)
-            if _want_max and (_max := statistic.get("max")) is not None:
-                max_values.append(_max)
-            if _want_mean and (_mean := statistic.get("mean")) is not None:
-                mean_values.append(_mean)
-            if _want_min and (_min := statistic.get("min")) is not None:
-                min_values.append(_min)
-            prev_stat = statistic
+        if _want_mean:
+            means = list(map(itemgetter("mean"), stat_list))
+        if _want_min:
+            mins = list(map(itemgetter("min"), stat_list))
+        if _want_max:
+            maxes = list(map(itemgetter("max"), stat_list))
+        rows = result[statistic_id]
+        index = 0
+        count = len(stat_list)
+        while index < count:
+            first_start = stat_list[index]["start"]
+            if (start_end := period_start_ends.get(first_start)) is None:
+                start_end = period_start_ends[first_start] = period_start_end(
+                    first_start
+                )
+            start, end = start_end
+            next_index = bisect_left(stat_list, end, index + 1, count, key=_start)
+            # The last statistic of the period
+            last_stat = stat_list[next_index - 1]
+            row: StatisticsRow = {
+                "start": start,
+                "end": end,
+            }
+            if _want_mean:
+                row["mean"] = _reduce_column(means[index:next_index], mean)
+            if _want_min:
+                row["min"] = _reduce_column(mins[index:next_index], min)
+            if _want_max:
+                row["max"] = _reduce_column(maxes[index:next_index], max)
+            if _want_last_reset:
+                row["last_reset"] = last_stat.get("last_reset")
+            if _want_state:
+                row["state"] = last_stat.get("state")
+            if _want_sum:
+                row["sum"] = last_stat["sum"]
+            rows.append(row)
+            index = next_index
 
     return result
 
@@ -977,10 +1175,8 @@ def _reduce_statistics_per_day(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
+    _, _day_start_end_ts = reduce_day_ts_factory()
+    return _reduce_statistics(stats, _day_start_end_ts, types)
 
 
 def reduce_week_ts_factory() -> (
@@ -1027,10 +1223,8 @@ def _reduce_statistics_per_week(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
+    _, _week_start_end_ts = reduce_week_ts_factory()
+    return _reduce_statistics(stats, _week_start_end_ts, types)
 
 
 def _find_month_end_time(timestamp: datetime) -> datetime:
@@ -1084,10 +1278,8 @@ def _reduce_statistics_per_month(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
-    )
+    _, _month_start_end_ts = reduce_month_ts_factory()
+    return _reduce_statistics(stats, _month_start_end_ts, types)
 
 
 def _generate_statistics_during_period_stmt(
@@ -1642,6 +1834,74 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _statistics_rollups_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata_ids: list[int] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]] | None:
+    """Return the daily or monthly statistics from the rollups.
+
+    Returns None if the statistics must be reduced from the hourly statistics,
+    which is the case until the rollups are compiled and when the periods
+    of the rollups don't match the time zone.
+    """
+    table: type[StatisticsRollupBase]
+    if period == "day":
+        table = StatisticsDaily
+        _, period_start_end = reduce_day_ts_factory()
+    elif period == "month":
+        table = StatisticsMonthly
+        _, period_start_end = reduce_month_ts_factory()
+    else:
+        return None
+    if not get_instance(hass).statistics_rollups_active:
+        return None
+
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stmt += lambda q: q.add_columns(table.end_ts)
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    if not stats:
+        return {}
+
+    # The duration of a day or a month depends on the time zone
+    period_ends: dict[float, float] = {}
+    for stat in stats:
+        if (start_ts := stat.start_ts) in period_ends:
+            continue
+        if period_start_end(start_ts) != (start_ts, stat.end_ts):
+            _LOGGER.debug("The statistics rollups don't match the time zone")
+            return None
+        period_ends[start_ts] = stat.end_ts
+
+    result = _sorted_statistics_to_dict(
+        hass,
+        session,
+        stats,
+        statistic_ids,
+        metadata,
+        True,
+        table,
+        start_time,
+        units,
+        types,
+    )
+    for rows in result.values():
+        for row in rows:
+            row["end"] = period_ends[row["start"]]
+    return result
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1712,37 +1972,53 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    if (
+        result := _statistics_rollups_during_period(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            metadata_ids,
+            metadata,
+            period,
+            units,
+            types,
+        )
+    ) is None:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
-    if not stats:
-        return {}
+        if not stats:
+            return {}
 
-    result = _sorted_statistics_to_dict(
-        hass,
-        session,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        start_time,
-        units,
-        types,
-    )
+        result = _sorted_statistics_to_dict(
+            hass,
+            session,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            start_time,
+            units,
+            types,
+        )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
+    elif not result:
+        return {}
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2353,16 +2629,31 @@ def import_statistics(
 ) -> bool:
     """Process an import_statistics job."""
 
+    imported = False
     with session_scope(
         session=instance.get_session(),
         exception_filter=filter_unique_constraint_integrity_error(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
 
+    if imported and table == Statistics:
+        # Compile the rollups once the imported statistics are committed
+        with session_scope(session=instance.get_session()) as session:
+            if stats_metadata := instance.statistics_meta_manager.get(
+                session, metadata["statistic_id"]
+            ):
+                _compile_statistics_rollups(
+                    session,
+                    {stat["start"].timestamp() for stat in statistics},
+                    stats_metadata[0],
+                )
+
+    return imported
+
 
 @retryable_database_job("adjust_statistics")
 def adjust_statistics(
@@ -2403,9 +2694,36 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        _adjust_sum_statistics_rollups(
+            session,
+            metadata[statistic_id][0],
+            start_time.replace(minute=0),
+            sum_adjustment,
+        )
+
     return True
 
 
+def _adjust_sum_statistics_rollups(
+    session: Session,
+    metadata_id: int,
+    start_time: datetime,
+    adj: float,
+) -> None:
+    """Adjust the rollups after the sum of the hourly statistics was adjusted.
+
+    The rollups of the later periods are adjusted, the rollups of the
+    periods containing start_time are compiled again.
+    """
+    start_time_ts = start_time.timestamp()
+    for table, period_start_end in _statistics_rollup_periods():
+        _, end_ts = period_start_end(start_time_ts)
+        _adjust_sum_statistics(
+            session, table, metadata_id, dt_util.utc_from_timestamp(end_ts), adj
+        )
+    _compile_statistics_rollups(session, {start_time_ts}, metadata_id)
+
+
 def _change_statistics_unit_for_table(
     session: Session,
     table: type[StatisticsBase],
@@ -2463,6 +2781,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
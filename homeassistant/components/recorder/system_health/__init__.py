@@ -72,4 +72,18 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    purge_info: dict[str, Any] = {}
+    if (throttled_purge := instance.throttled_purge) and throttled_purge.running:
+        progress = throttled_purge.async_get_progress()
+        purge_info["purge_progress"] = (
+            f"{progress['purged_rows']} rows purged, {progress['remaining_rows']}"
+            f" remaining, {progress['eta']} s left"
+            if progress["eta"] is not None
+            else f"{progress['purged_rows']} rows purged"
+        )
+    commit_info: dict[str, Any] = {}
+    group_commit = instance.group_commit
+    if group_commit.size_histogram.total:
+        commit_info["commit_size"] = group_commit.size_histogram.summary()
+        commit_info["commit_latency"] = group_commit.latency_histogram.summary()
+    return db_runs | db_stats | db_engine_info | purge_info | commit_info
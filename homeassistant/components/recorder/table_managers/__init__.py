@@ -42,6 +42,14 @@ class BaseTableManager(Generic[_DataT]):
         """
         return self._pending.get(shared_data)
 
+    def add_committed(self, data: str, data_id: int) -> None:
+        """Add the id of data which was committed without a pending object.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._id_map[data] = data_id
+
     def reset(self) -> None:
         """Reset after the database has been reset or changed.
 
@@ -12,7 +12,11 @@ from homeassistant.core import Event
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import StateAttributes
-from ..queries import get_shared_attributes
+from ..queries import (
+    find_recent_states_attributes_ids,
+    get_shared_attributes,
+    get_shared_attributes_by_ids,
+)
 from ..util import chunked, execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
@@ -65,6 +69,50 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         }:
             self._load_from_hashes(hashes, session)
 
+    def warm_up(self, attributes_ids: list[int] | None, session: Session) -> None:
+        """Load recently used attributes_ids into memory.
+
+        The attributes_ids are the ones returned by recently_used_ids when
+        the recorder was stopped, most recently used first, or None to use
+        the attributes_ids of the most recently recorded states instead.
+        The shared_attrs are read back by attributes_id so an attributes_id
+        which was purged since, or which belongs to another database, can't
+        be linked to the wrong shared_attrs.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        size = self._id_map.get_size()
+        if attributes_ids is None:
+            attributes_ids = [
+                attributes_id
+                for (attributes_id,) in execute_stmt_lambda_element(
+                    session, find_recent_states_attributes_ids(size), orm_rows=False
+                )
+            ]
+        # Keep the first occurrence of each attributes_id to keep the order
+        attributes_ids = list(dict.fromkeys(attributes_ids))[:size]
+        shared_attrs_by_id: dict[int, str] = {}
+        with session.no_autoflush:
+            for ids_chunk in chunked(attributes_ids, self.recorder.max_bind_vars):
+                for attributes_id, shared_attrs in execute_stmt_lambda_element(
+                    session, get_shared_attributes_by_ids(ids_chunk), orm_rows=False
+                ):
+                    shared_attrs_by_id[attributes_id] = shared_attrs
+        # Add the least recently used first so they are evicted first
+        id_map = self._id_map
+        for attributes_id in reversed(attributes_ids):
+            if (shared_attrs := shared_attrs_by_id.get(attributes_id)) is not None:
+                id_map[shared_attrs] = attributes_id
+
+    def recently_used_ids(self) -> list[int]:
+        """Return the attributes_ids in memory, most recently used first.
+
+        This call is not thread-safe and must be called from the
+        recorder thread or after the recorder thread has stopped.
+        """
+        return self._id_map.values()
+
     def get(self, shared_attr: str, data_hash: int, session: Session) -> int | None:
         """Resolve shared_attrs to the attributes_id.
 
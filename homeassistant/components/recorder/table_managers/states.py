@@ -45,6 +45,14 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def add_committed(self, entity_id: str, state_id: int) -> None:
+        """Add a state which was committed without a pending States object.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._last_committed_id[entity_id] = state_id
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -93,6 +101,18 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_ids_up_to(self, max_state_id: int) -> None:
+        """Evict committed states up to max_state_id.
+
+        When we drop a partition of the states table we need to make sure the
+        next call to record a state does not link the old_state_id to a state
+        in the dropped partition.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id, state_id in list(last_committed_ids.items()):
+            if state_id <= max_state_id:
+                del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
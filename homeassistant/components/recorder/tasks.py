@@ -5,16 +5,19 @@ from __future__ import annotations
 import abc
 import asyncio
 from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 import threading
 from typing import TYPE_CHECKING, Any
 
+from sqlalchemy.exc import SQLAlchemyError
+
 from homeassistant.helpers.typing import UndefinedType
+from homeassistant.util import dt as dt_util
 
-from . import entity_registry, purge, statistics
-from .const import DOMAIN
+from . import entity_registry, numeric_chunks, partitions, purge, statistics
+from .const import DOMAIN, INTEGRATION_PLATFORM_RECORD_STATE_CHANGED
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
@@ -126,6 +129,35 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class ThrottledPurgeTask(RecorderTask):
+    """Object to store information about a batch of the throttled purge."""
+
+    purge_before: datetime
+    state_ids: tuple[int, int] | None
+    event_ids: tuple[int, int] | None
+    max_rows: int
+    find_ranges: bool
+
+    def run(self, instance: Recorder) -> None:
+        """Purge a range of states or events and report the progress."""
+        try:
+            result = purge.purge_old_data_range(
+                instance,
+                self.purge_before,
+                self.state_ids,
+                self.event_ids,
+                self.max_rows,
+                self.find_ranges,
+            )
+        except SQLAlchemyError:
+            _LOGGER.exception("Error purging a range of states or events")
+            # Leave the remaining rows to the regular purge
+            result = purge.PurgeRangeResult(0, None, None, None)
+        assert instance.throttled_purge is not None
+        instance.throttled_purge.batch_done(result)
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -141,6 +173,37 @@ class PurgeEntitiesTask(RecorderTask):
         instance.queue_task(PurgeEntitiesTask(self.entity_filter, self.purge_before))
 
 
+@dataclass(slots=True)
+class CompactNumericStatesTask(RecorderTask):
+    """Object to store information about a numeric states compaction task."""
+
+    entity_ids: list[str]
+    compact_before: datetime
+    resume_after: dict[str, tuple[float, int]] = field(default_factory=dict)
+
+    def run(self, instance: Recorder) -> None:
+        """Compact the numeric states of the entities."""
+        if numeric_chunks.compact_numeric_states(
+            instance, self.entity_ids, self.resume_after, self.compact_before
+        ):
+            return
+        # Schedule a new compaction task if this one didn't finish
+        instance.queue_task(
+            CompactNumericStatesTask(
+                self.entity_ids, self.compact_before, self.resume_after
+            )
+        )
+
+
+@dataclass(slots=True)
+class AddPartitionsTask(RecorderTask):
+    """An object to insert into the recorder queue to add partitions."""
+
+    def run(self, instance: Recorder) -> None:
+        """Add the partitions of the current and upcoming periods."""
+        partitions.add_partitions(instance, dt_util.utcnow())
+
+
 @dataclass(slots=True)
 class PerodicCleanupTask(RecorderTask):
     """An object to insert into the recorder to trigger cleanup tasks.
@@ -307,6 +370,10 @@ class AddRecorderPlatformTask(RecorderTask):
         platform = self.platform
         platforms: dict[str, Any] = hass.data[DOMAIN].recorder_platforms
         platforms[domain] = platform
+        if record_state_changed := getattr(
+            platform, INTEGRATION_PLATFORM_RECORD_STATE_CHANGED, None
+        ):
+            instance.state_changed_platforms.append(record_state_changed)
 
 
 @dataclass(slots=True)
@@ -428,6 +495,23 @@ class EntityIDMigrationTask(RecorderTask):
             instance.queue_task(EntityIDPostMigrationTask())
 
 
+@dataclass(slots=True)
+class StatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to compile the statistics rollups."""
+
+    # The month of the statistics to rollup next ends before this timestamp
+    before_ts: float | None = None
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics rollups migration task."""
+        if not instance._migrate_statistics_rollups(self):  # pylint: disable=[protected-access]
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(self)
+        else:
+            # The statistics queries can read the rollups from now on
+            instance.statistics_rollups_active = True
+
+
 @dataclass(slots=True)
 class EntityIDPostMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to cleanup after entity_ids migration."""
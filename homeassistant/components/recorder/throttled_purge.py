@@ -0,0 +1,170 @@
+"""Purge old data continuously within a budget of rows per second.
+
+The nightly purge deletes all expired rows at once, which keeps the
+tables of large databases locked long enough to stall the recorder queue.
+When a purge rate is configured, the expired states and events are instead
+deleted by ranges of their primary keys in small transactions, spaced out
+to stay within the configured number of rows per second. Purging pauses
+while the recorder has a backlog of events to write.
+
+After the nightly run, the regular purge task cleans up the remaining
+data, such as the statistics runs, and repacks the database if requested.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .purge import PurgeRangeResult
+from .tasks import PurgeTask, ThrottledPurgeTask
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# Purging pauses while the recorder backlog is above this size
+PAUSE_BACKLOG = 100
+# Seconds to wait before checking the backlog again while paused
+PAUSE_SECONDS = 10
+
+
+class ThrottledPurge:
+    """Purge expired states and events in batches within a rows per second budget."""
+
+    def __init__(self, hass: HomeAssistant, recorder: Recorder, rate: int) -> None:
+        """Initialize the throttled purge."""
+        self.hass = hass
+        self.recorder = recorder
+        self.rate = rate
+        self.running = False
+        self.paused = False
+        self.purge_before: datetime | None = None
+        self.purged_rows = 0
+        self.total_rows: int | None = None
+        self._cleanup = False
+        self._repack = False
+        self._started = 0.0
+        self._batch_started = 0.0
+        self._state_ids: tuple[int, int] | None = None
+        self._event_ids: tuple[int, int] | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(
+        self, purge_before: datetime, cleanup: bool = False, repack: bool = False
+    ) -> None:
+        """Start purging the states and events older than purge_before.
+
+        If cleanup is set, the regular purge task is queued once done. If a
+        purge is already running, it continues up to the later purge_before.
+        """
+        self._cleanup |= cleanup
+        self._repack |= repack
+        if self.running:
+            assert self.purge_before is not None
+            self.purge_before = max(self.purge_before, purge_before)
+            return
+        self.purge_before = purge_before
+        self.running = True
+        self.purged_rows = 0
+        self.total_rows = None
+        self._started = time.monotonic()
+        self._state_ids = None
+        self._event_ids = None
+        self._async_queue_batch()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop purging."""
+        self.running = False
+        self.paused = False
+        self._cleanup = False
+        self._repack = False
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_queue_batch(self, _now: datetime | None = None) -> None:
+        """Queue the next batch unless the recorder is busy."""
+        self._unsub = None
+        if not self.running:
+            return
+        if (backlog := self.recorder.backlog) > PAUSE_BACKLOG:
+            if not self.paused:
+                _LOGGER.debug("Pausing purge while the recorder backlog is %s", backlog)
+            self.paused = True
+            self._unsub = async_call_later(
+                self.hass, PAUSE_SECONDS, self._async_queue_batch
+            )
+            return
+        self.paused = False
+        assert self.purge_before is not None
+        self._batch_started = time.monotonic()
+        self.recorder.queue_task(
+            ThrottledPurgeTask(
+                self.purge_before,
+                self._state_ids,
+                self._event_ids,
+                min(self.rate, self.recorder.max_bind_vars),
+                self.total_rows is None,
+            )
+        )
+
+    def batch_done(self, result: PurgeRangeResult) -> None:
+        """Report the result of a batch.
+
+        This call is thread-safe and is called from the recorder thread.
+        """
+        self.hass.loop.call_soon_threadsafe(self._async_batch_done, result)
+
+    @callback
+    def _async_batch_done(self, result: PurgeRangeResult) -> None:
+        """Schedule the next batch to stay within the budget."""
+        if not self.running:
+            return
+        self.purged_rows += result.purged_rows
+        if result.total_rows is not None:
+            self.total_rows = result.total_rows
+        self._state_ids = result.state_ids
+        self._event_ids = result.event_ids
+        if result.state_ids is None and result.event_ids is None:
+            _LOGGER.debug("Purged %s states and events", self.purged_rows)
+            if self._cleanup:
+                assert self.purge_before is not None
+                self.recorder.queue_task(
+                    PurgeTask(self.purge_before, self._repack, apply_filter=False)
+                )
+            self.async_stop()
+            return
+        elapsed = time.monotonic() - self._batch_started
+        delay = max(0.0, result.purged_rows / self.rate - elapsed)
+        self._unsub = async_call_later(self.hass, delay, self._async_queue_batch)
+
+    @callback
+    def async_get_progress(self) -> dict[str, Any]:
+        """Return the progress and the estimated seconds left of the purge."""
+        remaining_rows: int | None = None
+        eta: int | None = None
+        if self.running and self.total_rows is not None:
+            remaining_rows = max(0, self.total_rows - self.purged_rows)
+            rate = float(self.rate)
+            if self.purged_rows and (elapsed := time.monotonic() - self._started):
+                rate = min(rate, self.purged_rows / elapsed)
+            eta = round(remaining_rows / rate)
+        return {
+            "running": self.running,
+            "paused": self.paused,
+            "purge_before": self.purge_before if self.running else None,
+            "purged_rows": self.purged_rows,
+            "remaining_rows": remaining_rows,
+            "rows_per_second": self.rate,
+            "eta": eta,
+        }
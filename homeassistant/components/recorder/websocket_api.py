@@ -79,6 +79,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_list_statistic_ids)
     websocket_api.async_register_command(hass, ws_import_statistics)
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_purge_progress)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_validate_statistics)
 
@@ -127,7 +128,7 @@ async def ws_get_statistic_during_period(
     start_time, end_time = resolve_period(cast(StatisticPeriod, msg))
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_statistic_during_period,
             hass,
             msg["id"],
@@ -196,7 +197,7 @@ async def ws_handle_get_statistics_during_period(
     if (types := msg.get("types")) is None:
         types = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_statistics_during_period,
             hass,
             msg["id"],
@@ -251,7 +252,7 @@ async def ws_handle_list_statistic_ids(
 ) -> None:
     """Fetch a list of available statistic_id."""
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_list_statistic_ids,
             hass,
             msg["id"],
@@ -513,3 +514,22 @@ def ws_info(
         "thread_running": is_running,
     }
     connection.send_result(msg["id"], recorder_info)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/purge_progress",
+    }
+)
+@callback
+def ws_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the progress of the throttled purge."""
+    instance = get_instance(hass)
+    if not (throttled_purge := instance.throttled_purge):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_SUPPORTED, "No purge rate is configured"
+        )
+        return
+    connection.send_result(msg["id"], throttled_purge.async_get_progress())
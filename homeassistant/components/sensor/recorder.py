@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
 from collections.abc import Callable, Iterable, MutableMapping
 import datetime
@@ -30,7 +31,7 @@ from homeassistant.const import (
     UnitOfSoundPressure,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.core import Event, HomeAssistant, State, split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
 from homeassistant.loader import async_suggest_report_issue
@@ -72,6 +73,102 @@ WARN_UNSUPPORTED_UNIT = "sensor_warn_unsupported_unit"
 WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# The recent states of the sensors, used to compile statistics without
+# querying the history
+STATES_WINDOW = "sensor_recorder_states_window"
+
+
+def _last_updated(state: State) -> datetime.datetime:
+    """Return the last_updated of a state."""
+    return state.last_updated
+
+
+class StatesWindow:
+    """The recent states of the sensors with a state class.
+
+    The window is fed the state changed events written by the recorder, in the
+    recorder thread, and keeps the states which are not compiled yet and the
+    last state before them. It starts with the current states of the sensors.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the window with the current states."""
+        self.start = dt_util.utcnow()
+        self.states: dict[str, list[State]] = {
+            state.entity_id: [state]
+            for state in hass.states.all(DOMAIN)
+            if ATTR_STATE_CLASS in state.attributes
+        }
+
+    def add(self, entity_id: str, state: State | None) -> None:
+        """Add a new state of a sensor."""
+        if state is None or ATTR_STATE_CLASS not in state.attributes:
+            self.states.pop(entity_id, None)
+        elif (states := self.states.get(entity_id)) is None:
+            self.states[entity_id] = [state]
+        elif state.last_updated > states[-1].last_updated:
+            # The current states the window started with may be
+            # newer than the events which were not written yet
+            states.append(state)
+
+    def history(
+        self,
+        sensor_states: list[State],
+        wanted_statistics: dict[str, set[str]],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict[str, list[State]] | None:
+        """Return the states of the sensors during start-end.
+
+        The states match the states the history returns: the state at the start
+        time followed by the states changed during the period, or also the
+        states with changed attributes for the sensors with a sum. Returns None
+        if the window doesn't have all states of the sensors during the period.
+        """
+        if start < self.start:
+            return None
+        history_list: dict[str, list[State]] = {}
+        for current_state in sensor_states:
+            entity_id = current_state.entity_id
+            states = self.states.get(entity_id)
+            if current_state.last_updated < end and (
+                not states or states[-1].last_updated != current_state.last_updated
+            ):
+                # States were not written, the recorder may have dropped events
+                return None
+            if not states:
+                continue
+            start_index = bisect_left(states, start, key=_last_updated)
+            end_index = bisect_left(states, end, start_index, key=_last_updated)
+            period_states = states[start_index:end_index]
+            if "sum" not in wanted_statistics[entity_id]:
+                period_states = [
+                    state
+                    for state in period_states
+                    if state.last_changed == state.last_updated
+                ]
+            if start_index:
+                period_states.insert(0, states[start_index - 1])
+            if period_states:
+                history_list[entity_id] = period_states
+        return history_list
+
+    def compiled(self, end: datetime.datetime) -> None:
+        """Forget the states before the last state before end."""
+        self.start = max(self.start, end)
+        for states in self.states.values():
+            if (index := bisect_left(states, end, key=_last_updated)) > 1:
+                del states[: index - 1]
+
+
+def record_state_changed(hass: HomeAssistant, event: Event) -> None:
+    """Add the new state of a sensor to the states window."""
+    entity_id: str = event.data["entity_id"]
+    if not entity_id.startswith("sensor."):
+        return
+    if (window := hass.data.get(STATES_WINDOW)) is None:
+        window = hass.data[STATES_WINDOW] = StatesWindow(hass)
+    window.add(entity_id, event.data["new_state"])
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
@@ -387,18 +484,15 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
-def compile_statistics(  # noqa: C901
+def _get_history(
     hass: HomeAssistant,
     session: Session,
+    sensor_states: list[State],
+    wanted_statistics: dict[str, set[str]],
     start: datetime.datetime,
     end: datetime.datetime,
-) -> statistics.PlatformCompiledStatistics:
-    """Compile statistics for all entities during start-end."""
-    result: list[StatisticResult] = []
-
-    sensor_states = _get_sensor_states(hass)
-    wanted_statistics = _wanted_statistics(sensor_states)
-    # Get history between start and end
+) -> MutableMapping[str, list[State]]:
+    """Get the history of the sensors between start and end."""
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
     ]
@@ -426,6 +520,35 @@ def compile_statistics(  # noqa: C901
             entity_ids=entities_significant_history,
         )
         history_list = {**history_list, **_history_list}
+    return history_list
+
+
+def compile_statistics(  # noqa: C901
+    hass: HomeAssistant,
+    session: Session,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> statistics.PlatformCompiledStatistics:
+    """Compile statistics for all entities during start-end."""
+    result: list[StatisticResult] = []
+
+    sensor_states = _get_sensor_states(hass)
+    wanted_statistics = _wanted_statistics(sensor_states)
+    # Use the recent states of the sensors if they cover the period
+    # and only query the history after a restart or if states are missing
+    window: StatesWindow | None = hass.data.get(STATES_WINDOW)
+    history_list: MutableMapping[str, list[State]] | None = None
+    if window is not None:
+        history_list = window.history(sensor_states, wanted_statistics, start, end)
+    if history_list is None:
+        history_list = _get_history(
+            hass, session, sensor_states, wanted_statistics, start, end
+        )
+        if window is not None and start >= window.start:
+            # The window is missing states, start over from the current states
+            window = hass.data[STATES_WINDOW] = StatesWindow(hass)
+    if window is not None:
+        window.compiled(end)
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
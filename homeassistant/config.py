@@ -63,6 +63,8 @@ from .exceptions import ConfigValidationError, HomeAssistantError
 from .generated.currencies import HISTORIC_CURRENCIES
 from .helpers import config_validation as cv, issue_registry as ir
 from .helpers.entity_values import EntityValues
+from .helpers.singleton import singleton
+from .helpers.storage import Store
 from .helpers.translation import async_get_exception_message
 from .helpers.typing import ConfigType
 from .loader import ComponentProtocol, Integration, IntegrationNotFound
@@ -70,7 +72,13 @@ from .requirements import RequirementsNotFound, async_get_integration_with_requi
 from .util.async_ import create_eager_task
 from .util.package import is_docker_env
 from .util.unit_system import get_unit_system, validate_unit_system
-from .util.yaml import SECRET_YAML, Secrets, YamlTypeError, load_yaml_dict
+from .util.yaml import (
+    SECRET_YAML,
+    ParsedYamlCache,
+    Secrets,
+    YamlTypeError,
+    load_yaml_dict,
+)
 from .util.yaml.objects import NodeStrClass
 
 _LOGGER = logging.getLogger(__name__)
@@ -81,6 +89,11 @@ YAML_CONFIG_FILE = "configuration.yaml"
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
+DATA_YAML_CACHE = "yaml_cache"
+
+YAML_CACHE_STORAGE_KEY = "core.yaml_cache"
+YAML_CACHE_STORAGE_VERSION = 1
+YAML_CACHE_SAVE_DELAY = 30
 
 AUTOMATION_CONFIG_PATH = "automations.yaml"
 SCRIPT_CONFIG_PATH = "scripts.yaml"
@@ -478,6 +491,7 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> dict:
     configuration by itself. Include package merge.
     """
     secrets = Secrets(Path(hass.config.config_dir))
+    yaml_cache = await _async_get_yaml_cache(hass)
 
     # Not using async_add_executor_job because this is an internal method.
     try:
@@ -486,6 +500,7 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> dict:
             load_yaml_config_file,
             hass.config.path(YAML_CONFIG_FILE),
             secrets,
+            yaml_cache.cache,
         )
     except HomeAssistantError as exc:
         if not (base_exc := exc.__cause__) or not isinstance(base_exc, MarkedYAMLError):
@@ -498,6 +513,8 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> dict:
             base_exc.problem_mark.name = _relpath(hass, base_exc.problem_mark.name)
         raise
 
+    yaml_cache.async_save_if_changed()
+
     invalid_domains = []
     for key in config:
         try:
@@ -526,8 +543,48 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> dict:
     return config
 
 
+class _YamlCache:
+    """Persist the cache of parsed YAML files across restarts."""
+
+    def __init__(self, hass: HomeAssistant, cache: ParsedYamlCache) -> None:
+        """Initialize the YAML cache."""
+        self.cache = cache
+        self._store: Store[dict[str, Any]] = Store(
+            hass, YAML_CACHE_STORAGE_VERSION, YAML_CACHE_STORAGE_KEY, private=True
+        )
+
+    async def async_load(self) -> None:
+        """Load the cached entries."""
+        if data := await self._store.async_load():
+            self.cache.entries = data["entries"]
+
+    @callback
+    def async_save_if_changed(self) -> None:
+        """Drop the entries of files which are gone and save if changed.
+
+        Must be called after the whole configuration was loaded.
+        """
+        if self.cache.prune():
+            self._store.async_delay_save(self._data_to_save, YAML_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"entries": self.cache.entries}
+
+
+@singleton(DATA_YAML_CACHE)
+async def _async_get_yaml_cache(hass: HomeAssistant) -> _YamlCache:
+    """Return the cache of parsed YAML files."""
+    yaml_cache = _YamlCache(hass, ParsedYamlCache())
+    await yaml_cache.async_load()
+    return yaml_cache
+
+
 def load_yaml_config_file(
-    config_path: str, secrets: Secrets | None = None
+    config_path: str,
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> dict[Any, Any]:
     """Parse a YAML configuration file.
 
@@ -536,7 +593,7 @@ def load_yaml_config_file(
     This method needs to run in an executor.
     """
     try:
-        conf_dict = load_yaml_dict(config_path, secrets)
+        conf_dict = load_yaml_dict(config_path, secrets, cache)
     except YamlTypeError as exc:
         msg = (
             f"The configuration file {os.path.basename(config_path)} "
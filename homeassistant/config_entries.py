@@ -1649,6 +1649,9 @@ class ConfigEntries:
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_STOP, self._async_shutdown, run_immediately=True
         )
+        storage.get_internal_store_manager(self.hass).async_register_snapshot(
+            self._store, self._data_to_save
+        )
 
         if config is None:
             self._entries = ConfigEntryItems(self.hass)
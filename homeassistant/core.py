@@ -2635,6 +2635,12 @@ class Config:
         # List of packages to skip when installing requirements on startup
         self.skip_pip_packages: list[str] = []
 
+        # If True, the registries are stored in the compact encoding
+        self.compact_storage: bool = False
+
+        # If True, integrations are imported on a separate pool of threads
+        self.preimport_integrations: bool = False
+
         # List of loaded components
         self.components: set[str] = set()
 
@@ -330,6 +330,7 @@ class AreaRegistry(BaseRegistry[AreasRegistryStoreData]):
 
         self.areas = areas
         self._area_data = areas.data
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> AreasRegistryStoreData:
@@ -179,6 +179,7 @@ class CategoryRegistry(BaseRegistry[CategoryRegistryStoreData]):
                 }
 
         self.categories = category_entries
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> CategoryRegistryStoreData:
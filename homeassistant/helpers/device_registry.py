@@ -567,6 +567,8 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
             STORAGE_KEY,
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
+            journal=True,
+            compact=hass.config.compact_storage,
         )
 
     @callback
@@ -992,6 +994,7 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
         self.devices = devices
         self.deleted_devices = deleted_devices
         self._device_data = devices.data
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
@@ -81,6 +81,7 @@ _T = TypeVar("_T")
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_ENTITY_SOURCE_DOMAINS = "entity_info_domains"
 
 # Used when converting float states to string: limit precision according to machine
 # epsilon to make the string representation readable
@@ -96,6 +97,8 @@ CONTEXT_RECENT_TIME_SECONDS = 5  # Time that a context is considered recent
 def async_setup(hass: HomeAssistant) -> None:
     """Set up entity sources."""
     hass.data[DATA_ENTITY_SOURCE] = {}
+    # domain -> dict[entity_id, True]
+    hass.data[DATA_ENTITY_SOURCE_DOMAINS] = {}
 
 
 @callback
@@ -106,6 +109,13 @@ def entity_sources(hass: HomeAssistant) -> dict[str, EntityInfo]:
     return _entity_sources
 
 
+@callback
+def entity_ids_for_source_domain(hass: HomeAssistant, domain: str) -> list[str]:
+    """Get the entity ids of the entity sources of an integration."""
+    domains: dict[str, dict[str, Literal[True]]] = hass.data[DATA_ENTITY_SOURCE_DOMAINS]
+    return list(domains.get(domain, ()))
+
+
 def generate_entity_id(
     entity_id_format: str,
     name: str | None,
@@ -1430,6 +1440,9 @@ class Entity(
             entity_info["config_entry"] = self.platform.config_entry.entry_id
 
         entity_sources(self.hass)[self.entity_id] = entity_info
+        self.hass.data[DATA_ENTITY_SOURCE_DOMAINS].setdefault(
+            self.platform.platform_name, {}
+        )[self.entity_id] = True
 
         self._state_info = {
             "unrecorded_attributes": self.__combined_unrecorded_attributes
@@ -1459,7 +1472,12 @@ class Entity(
         # The check for self.platform guards against integrations not using an
         # EntityComponent and can be removed in HA Core 2024.1
         if self.platform:
-            self.hass.data[DATA_ENTITY_SOURCE].pop(self.entity_id)
+            entity_info = self.hass.data[DATA_ENTITY_SOURCE].pop(self.entity_id)
+            domains = self.hass.data[DATA_ENTITY_SOURCE_DOMAINS]
+            entity_ids = domains[entity_info["domain"]]
+            del entity_ids[self.entity_id]
+            if not entity_ids:
+                del domains[entity_info["domain"]]
 
     @callback
     def _async_registry_updated(
@@ -150,6 +150,9 @@ class EntityPlatform:
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
 
+        self.parallel_service_calls: asyncio.Semaphore | None = None
+        self.parallel_service_calls_created = platform is None
+
         # Storage for entities indexed by domain
         # with the child dict indexed by entity_id
         #
@@ -214,6 +217,26 @@ class EntityPlatform:
 
         return self.parallel_updates
 
+    @callback
+    def get_parallel_service_calls_semaphore(self) -> asyncio.Semaphore | None:
+        """Get or create a semaphore for parallel entity service calls.
+
+        Platforms can set PARALLEL_SERVICE_CALLS to limit how many of their
+        entities handle the same service call at once. This is applied in
+        addition to PARALLEL_UPDATES.
+        """
+        if self.parallel_service_calls_created:
+            return self.parallel_service_calls
+
+        self.parallel_service_calls_created = True
+
+        parallel_service_calls = getattr(self.platform, "PARALLEL_SERVICE_CALLS", None)
+
+        if parallel_service_calls:
+            self.parallel_service_calls = asyncio.Semaphore(parallel_service_calls)
+
+        return self.parallel_service_calls
+
     async def async_setup(
         self,
         platform_config: ConfigType,
@@ -513,13 +513,16 @@ class EntityRegistryStore(storage.Store[dict[str, list[dict[str, Any]]]]):
 class EntityRegistryItems(BaseRegistryItems[RegistryEntry]):
     """Container for entity registry items, maps entity_id -> entry.
 
-    Maintains six additional indexes:
+    Maintains nine additional indexes:
     - id -> entry
     - (domain, platform, unique_id) -> entity_id
     - config_entry_id -> dict[key, True]
     - device_id -> dict[key, True]
     - area_id -> dict[key, True]
     - label -> dict[key, True]
+    - scope -> category_id -> dict[key, True]
+    - platform -> dict[key, True]
+    - domain -> dict[key, True]
     """
 
     def __init__(self) -> None:
@@ -531,6 +534,9 @@ class EntityRegistryItems(BaseRegistryItems[RegistryEntry]):
         self._device_id_index: dict[str, dict[str, Literal[True]]] = {}
         self._area_id_index: dict[str, dict[str, Literal[True]]] = {}
         self._labels_index: dict[str, dict[str, Literal[True]]] = {}
+        self._categories_index: dict[str, dict[str, dict[str, Literal[True]]]] = {}
+        self._platform_index: dict[str, dict[str, Literal[True]]] = {}
+        self._domain_index: dict[str, dict[str, Literal[True]]] = {}
 
     def _index_entry(self, key: str, entry: RegistryEntry) -> None:
         """Index an entry."""
@@ -546,6 +552,12 @@ class EntityRegistryItems(BaseRegistryItems[RegistryEntry]):
             self._area_id_index.setdefault(area_id, {})[key] = True
         for label in entry.labels:
             self._labels_index.setdefault(label, {})[key] = True
+        for scope, category_id in entry.categories.items():
+            self._categories_index.setdefault(scope, {}).setdefault(category_id, {})[
+                key
+            ] = True
+        self._platform_index.setdefault(entry.platform, {})[key] = True
+        self._domain_index.setdefault(entry.domain, {})[key] = True
 
     def _unindex_entry(
         self, key: str, replacement_entry: RegistryEntry | None = None
@@ -563,6 +575,12 @@ class EntityRegistryItems(BaseRegistryItems[RegistryEntry]):
         if labels := entry.labels:
             for label in labels:
                 self._unindex_entry_value(key, label, self._labels_index)
+        for scope, category_id in entry.categories.items():
+            self._unindex_entry_value(key, category_id, self._categories_index[scope])
+            if not self._categories_index[scope]:
+                del self._categories_index[scope]
+        self._unindex_entry_value(key, entry.platform, self._platform_index)
+        self._unindex_entry_value(key, entry.domain, self._domain_index)
 
     def get_device_ids(self) -> KeysView[str]:
         """Return device ids."""
@@ -606,6 +624,26 @@ class EntityRegistryItems(BaseRegistryItems[RegistryEntry]):
         data = self.data
         return [data[key] for key in self._labels_index.get(label, ())]
 
+    def get_entries_for_category(
+        self, scope: str, category_id: str
+    ) -> list[RegistryEntry]:
+        """Get entries for category in a scope."""
+        data = self.data
+        return [
+            data[key]
+            for key in self._categories_index.get(scope, {}).get(category_id, ())
+        ]
+
+    def get_entries_for_platform(self, platform: str) -> list[RegistryEntry]:
+        """Get entries for platform."""
+        data = self.data
+        return [data[key] for key in self._platform_index.get(platform, ())]
+
+    def get_entries_for_domain(self, domain: str) -> list[RegistryEntry]:
+        """Get entries for domain."""
+        data = self.data
+        return [data[key] for key in self._domain_index.get(domain, ())]
+
 
 def _validate_item(
     hass: HomeAssistant,
@@ -673,6 +711,8 @@ class EntityRegistry(BaseRegistry):
             STORAGE_KEY,
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
+            journal=True,
+            compact=hass.config.compact_storage,
         )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED,
@@ -1291,6 +1331,7 @@ class EntityRegistry(BaseRegistry):
         self.deleted_entities = deleted_entities
         self.entities = entities
         self._entities_data = entities.data
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
@@ -1305,22 +1346,18 @@ class EntityRegistry(BaseRegistry):
     @callback
     def async_clear_category_id(self, scope: str, category_id: str) -> None:
         """Clear category id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if (
-                existing_category_id := entry.categories.get(scope)
-            ) and category_id == existing_category_id:
-                categories = entry.categories.copy()
-                del categories[scope]
-                self.async_update_entity(entity_id, categories=categories)
+        for entry in self.entities.get_entries_for_category(scope, category_id):
+            categories = entry.categories.copy()
+            del categories[scope]
+            self.async_update_entity(entry.entity_id, categories=categories)
 
     @callback
     def async_clear_label_id(self, label_id: str) -> None:
         """Clear label from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if label_id in entry.labels:
-                labels = entry.labels.copy()
-                labels.remove(label_id)
-                self.async_update_entity(entity_id, labels=labels)
+        for entry in self.entities.get_entries_for_label(label_id):
+            labels = entry.labels.copy()
+            labels.remove(label_id)
+            self.async_update_entity(entry.entity_id, labels=labels)
 
     @callback
     def async_clear_config_entry(self, config_entry_id: str) -> None:
@@ -1407,14 +1444,23 @@ def async_entries_for_category(
     registry: EntityRegistry, scope: str, category_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match a category in a scope."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if (
-            (existing_category_id := entry.categories.get(scope))
-            and category_id == existing_category_id
-        )
-    ]
+    return registry.entities.get_entries_for_category(scope, category_id)
+
+
+@callback
+def async_entries_for_platform(
+    registry: EntityRegistry, platform: str
+) -> list[RegistryEntry]:
+    """Return entries that match a platform."""
+    return registry.entities.get_entries_for_platform(platform)
+
+
+@callback
+def async_entries_for_domain(
+    registry: EntityRegistry, domain: str
+) -> list[RegistryEntry]:
+    """Return entries that match a domain."""
+    return registry.entities.get_entries_for_domain(domain)
 
 
 @callback
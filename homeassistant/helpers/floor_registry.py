@@ -216,6 +216,7 @@ class FloorRegistry(BaseRegistry[FloorRegistryStoreData]):
 
         self.floors = floors
         self._floor_data = floors.data
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> FloorRegistryStoreData:
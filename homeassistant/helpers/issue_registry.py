@@ -259,6 +259,7 @@ class IssueRegistry(BaseRegistry):
                     )
 
         self.issues = issues
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> dict[str, list[dict[str, str | None]]]:
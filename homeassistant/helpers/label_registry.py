@@ -217,6 +217,7 @@ class LabelRegistry(BaseRegistry[LabelRegistryStoreData]):
 
         self.labels = labels
         self._label_data = labels.data
+        self.async_register_snapshot()
 
     @callback
     def _data_to_save(self) -> LabelRegistryStoreData:
@@ -9,6 +9,8 @@ from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
 from homeassistant.core import CoreState, HomeAssistant, callback
 
+from .storage import get_internal_store_manager
+
 if TYPE_CHECKING:
     from .storage import Store
 
@@ -79,6 +81,13 @@ class BaseRegistry(ABC, Generic[_StoreDataT]):
         delay = SAVE_DELAY if self.hass.state is CoreState.running else SAVE_DELAY_LONG
         self._store.async_delay_save(self._data_to_save, delay)
 
+    @callback
+    def async_register_snapshot(self) -> None:
+        """Add the data of the registry to the warm start snapshot."""
+        get_internal_store_manager(self.hass).async_register_snapshot(
+            self._store, self._data_to_save
+        )
+
     @callback
     @abstractmethod
     def _data_to_save(self) -> _StoreDataT:
@@ -18,7 +18,7 @@ from .entity import Entity
 from .event import async_track_time_interval
 from .frame import report
 from .json import JSONEncoder
-from .storage import Store
+from .storage import Store, get_internal_store_manager
 
 DATA_RESTORE_STATE = "restore_state"
 
@@ -33,6 +33,10 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How often the last seen time of a state which has not changed since the
+# previous dump is refreshed, must be well below STATE_EXPIRATION
+STATE_LAST_SEEN_REFRESH_INTERVAL = timedelta(days=1)
+
 
 class ExtraStoredData(ABC):
     """Object to hold extra stored data."""
@@ -134,10 +138,13 @@ class RestoreStateData:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
         self.store = Store[list[dict[str, Any]]](
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder, journal=True
         )
         self.last_states: dict[str, StoredState] = {}
         self.entities: dict[str, RestoreEntity] = {}
+        # The state, extra data and last seen time of each entity
+        # as written by the previous dump
+        self._last_dumped: dict[str, tuple[State, dict[str, Any] | None, datetime]] = {}
 
     async def async_setup(self) -> None:
         """Set up up the instance of this data helper."""
@@ -157,6 +164,9 @@ class RestoreStateData:
         except HomeAssistantError as exc:
             _LOGGER.error("Error loading last states", exc_info=exc)
             stored_states = None
+        get_internal_store_manager(self.hass).async_register_snapshot(
+            self.store, self._data_to_snapshot
+        )
 
         if stored_states is None:
             _LOGGER.debug("Not creating cache - no saved states found")
@@ -213,18 +223,55 @@ class RestoreStateData:
 
         return stored_states
 
+    @callback
+    def _data_to_snapshot(self) -> list[dict[str, Any]] | None:
+        """Return the states written by the last dump for the warm start snapshot.
+
+        If no states were dumped yet, the stored states are loaded from storage.
+        """
+        if not self._last_dumped:
+            return None
+        return [
+            {
+                "id": entity_id,
+                "state": state.json_fragment,
+                "extra_data": extra_data,
+                "last_seen": last_seen,
+            }
+            for entity_id, (state, extra_data, last_seen) in self._last_dumped.items()
+        ]
+
     async def async_dump_states(self) -> None:
         """Save the current state machine to storage."""
         _LOGGER.debug("Dumping states")
-        try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+        # Keep the last seen time of states which have not changed since the
+        # previous dump so only the changed states are written to the journal
+        refresh_time = dt_util.utcnow() - STATE_LAST_SEEN_REFRESH_INTERVAL
+        last_dumped = self._last_dumped
+        dumped: dict[str, tuple[State, dict[str, Any] | None, datetime]] = {}
+        stored_states: list[dict[str, Any]] = []
+        for stored_state in self.async_get_stored_states():
+            entity_id = stored_state.state.entity_id
+            item = stored_state.as_dict()
+            if (
+                (previous := last_dumped.get(entity_id))
+                and previous[0] is stored_state.state
+                and previous[1] == item["extra_data"]
+                and previous[2] > refresh_time
+            ):
+                item["last_seen"] = previous[2]
+            dumped[entity_id] = (
+                stored_state.state,
+                item["extra_data"],
+                item["last_seen"],
             )
+            stored_states.append({"id": entity_id, **item})
+        try:
+            await self.store.async_save(stored_states)
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+        else:
+            self._last_dumped = dumped
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
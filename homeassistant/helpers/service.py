@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable, Iterable
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
 import dataclasses
 from enum import Enum
 from functools import cache, partial
 import logging
+import time
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, TypedDict, TypeGuard, TypeVar, cast
 
@@ -32,6 +33,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     Context,
     EntityServiceResponse,
+    Event,
     HassJob,
     HomeAssistant,
     ServiceCall,
@@ -47,6 +49,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.loader import Integration, async_get_integrations, bind_hass
 from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.limited_size_dict import LimitedSizeDict
 from homeassistant.util.yaml import load_yaml_dict
 from homeassistant.util.yaml.loader import JSON_TYPE
 
@@ -66,6 +69,7 @@ from .typing import ConfigType, TemplateVarsType
 
 if TYPE_CHECKING:
     from .entity import Entity
+    from .entity_platform import EntityPlatform
 
     _EntityT = TypeVar("_EntityT", bound=Entity)
 
@@ -74,7 +78,18 @@ CONF_SERVICE_ENTITY_ID = "entity_id"
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 SERVICE_DESCRIPTION_CACHE = "service_description_cache"
+TARGET_RESOLUTION_CACHE = "service_target_resolution_cache"
+# Maximum number of distinct registry targets to keep resolved
+TARGET_RESOLUTION_CACHE_SIZE = 256
+
+# Entity and device registry attributes which can change resolved targets
+_ENTITY_TARGET_ATTRIBUTES = frozenset(
+    {"area_id", "device_id", "entity_category", "entity_id", "hidden_by", "labels"}
+)
+_DEVICE_TARGET_ATTRIBUTES = frozenset({"area_id", "labels"})
 ALL_SERVICE_DESCRIPTIONS_CACHE = "all_service_descriptions_cache"
 
 
@@ -479,7 +494,7 @@ def _has_match(ids: str | list[str] | None) -> TypeGuard[str | list[str]]:
 
 
 @bind_hass
-def async_extract_referenced_entity_ids(  # noqa: C901
+def async_extract_referenced_entity_ids(
     hass: HomeAssistant, service_call: ServiceCall, expand_group: bool = True
 ) -> SelectedEntities:
     """Extract referenced entity IDs from a service call."""
@@ -503,6 +518,22 @@ def async_extract_referenced_entity_ids(  # noqa: C901
     ):
         return selected
 
+    resolved = _async_get_target_resolution_cache(hass).async_resolve(selector)
+    selected.indirectly_referenced.update(resolved.indirectly_referenced)
+    selected.missing_devices.update(resolved.missing_devices)
+    selected.missing_areas.update(resolved.missing_areas)
+    selected.missing_floors.update(resolved.missing_floors)
+    selected.missing_labels.update(resolved.missing_labels)
+    selected.referenced_devices.update(resolved.referenced_devices)
+    selected.referenced_areas.update(resolved.referenced_areas)
+    return selected
+
+
+def _async_resolve_registry_targets(  # noqa: C901
+    hass: HomeAssistant, selector: ServiceTargetSelector
+) -> SelectedEntities:
+    """Resolve the devices, areas, floors and labels of a selector to entities."""
+    selected = SelectedEntities()
     entities = entity_registry.async_get(hass).entities
     dev_reg = device_registry.async_get(hass)
     area_reg = area_registry.async_get(hass)
@@ -595,6 +626,138 @@ def async_extract_referenced_entity_ids(  # noqa: C901
     return selected
 
 
+@callback
+def _entity_registry_change_affects_targets(
+    event_data: entity_registry.EventEntityRegistryUpdatedData,
+) -> bool:
+    """Return if an entity registry change can change resolved targets."""
+    return event_data["action"] != "update" or not _ENTITY_TARGET_ATTRIBUTES.isdisjoint(
+        event_data["changes"]
+    )
+
+
+@callback
+def _device_registry_change_affects_targets(
+    event_data: device_registry.EventDeviceRegistryUpdatedData,
+) -> bool:
+    """Return if a device registry change can change resolved targets."""
+    return event_data["action"] != "update" or not _DEVICE_TARGET_ATTRIBUTES.isdisjoint(
+        event_data["changes"]
+    )
+
+
+@callback
+def _registry_entry_added_or_removed(
+    event_data: floor_registry.EventFloorRegistryUpdatedData
+    | label_registry.EventLabelRegistryUpdatedData,
+) -> bool:
+    """Return if a floor or label was added or removed."""
+    return event_data["action"] != "update"
+
+
+class TargetResolutionCache:
+    """Cache of the entities the registry targets of service calls resolve to.
+
+    The cache is cleared when the registries change in a way which can
+    change the resolved entities.
+    """
+
+    __slots__ = ("_hass", "_resolved", "hits", "misses", "invalidations")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._resolved: LimitedSizeDict[
+            tuple[frozenset[str], ...], SelectedEntities
+        ] = LimitedSizeDict(size_limit=TARGET_RESOLUTION_CACHE_SIZE)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen for registry changes."""
+        bus = self._hass.bus
+        bus.async_listen(
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            self._async_invalidate,
+            event_filter=_entity_registry_change_affects_targets,
+        )
+        bus.async_listen(
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            self._async_invalidate,
+            event_filter=_device_registry_change_affects_targets,
+        )
+        # Area update events don't include the changes, the floor or labels
+        # of the area may have changed
+        bus.async_listen(
+            area_registry.EVENT_AREA_REGISTRY_UPDATED, self._async_invalidate
+        )
+        bus.async_listen(
+            floor_registry.EVENT_FLOOR_REGISTRY_UPDATED,
+            self._async_invalidate,
+            event_filter=_registry_entry_added_or_removed,
+        )
+        bus.async_listen(
+            label_registry.EVENT_LABEL_REGISTRY_UPDATED,
+            self._async_invalidate,
+            event_filter=_registry_entry_added_or_removed,
+        )
+
+    @callback
+    def _async_invalidate(self, event: Event[Any]) -> None:
+        """Clear the cache after a registry change."""
+        if self._resolved:
+            self._resolved.clear()
+            self.invalidations += 1
+
+    @callback
+    def async_resolve(self, selector: ServiceTargetSelector) -> SelectedEntities:
+        """Return the resolved registry targets of a selector.
+
+        The returned object is shared and must not be modified.
+        """
+        key = (
+            frozenset(selector.device_ids),
+            frozenset(selector.area_ids),
+            frozenset(selector.floor_ids),
+            frozenset(selector.label_ids),
+        )
+        if (resolved := self._resolved.get(key)) is not None:
+            self.hits += 1
+            return resolved
+        self.misses += 1
+        resolved = self._resolved[key] = _async_resolve_registry_targets(
+            self._hass, selector
+        )
+        return resolved
+
+    @callback
+    def async_get_stats(self) -> dict[str, int]:
+        """Return the cache metrics."""
+        return {
+            "size": len(self._resolved),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+@callback
+def _async_get_target_resolution_cache(hass: HomeAssistant) -> TargetResolutionCache:
+    """Return the target resolution cache."""
+    if (cache := hass.data.get(TARGET_RESOLUTION_CACHE)) is None:
+        cache = hass.data[TARGET_RESOLUTION_CACHE] = TargetResolutionCache(hass)
+        cache.async_setup()
+    return cast(TargetResolutionCache, cache)
+
+
+@callback
+def async_get_target_resolution_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return the hit and miss metrics of the target resolution cache."""
+    return _async_get_target_resolution_cache(hass).async_get_stats()
+
+
 @bind_hass
 async def async_extract_config_entry_ids(
     hass: HomeAssistant, service_call: ServiceCall, expand_group: bool = True
@@ -879,6 +1042,62 @@ def _get_permissible_entity_candidates(
     return [entities[entity_id] for entity_id in all_referenced.intersection(entities)]
 
 
+@dataclasses.dataclass(slots=True)
+class EntityServiceCallResults:
+    """Class to hold the results of an entity service call by entity_id."""
+
+    # Responses of the entities which handled the call
+    responses: dict[str, ServiceResponse] = dataclasses.field(default_factory=dict)
+
+    # Exceptions of the entities which failed to handle the call
+    errors: dict[str, BaseException] = dataclasses.field(default_factory=dict)
+
+    # Seconds the platform of each entity took to handle the call, the
+    # entities of a platform share the duration since they are called together
+    durations: dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+async def async_call_entities_by_platform(
+    hass: HomeAssistant,
+    entities: list[Entity],
+    func: str | HassJob,
+    data: dict | ServiceCall,
+    context: Context,
+) -> EntityServiceCallResults:
+    """Call the service method of the entities grouped by platform.
+
+    The platforms, which are unique per integration and config entry, are
+    called concurrently and the results of all entities are returned, even
+    if some of them failed.
+    """
+    platform_entities: dict[EntityPlatform | None, list[Entity]] = {}
+    for entity in entities:
+        platform_entities.setdefault(entity.platform, []).append(entity)
+
+    # Use asyncio.gather here to ensure the returned results
+    # are in the same order as the platform_entities dict
+    group_results: list[
+        tuple[list[ServiceResponse | BaseException], float]
+    ] = await asyncio.gather(
+        *[
+            _handle_platform_entities_call(hass, platform, group, func, data, context)
+            for platform, group in platform_entities.items()
+        ]
+    )
+
+    results = EntityServiceCallResults()
+    for group, (group_result, duration) in zip(
+        platform_entities.values(), group_results
+    ):
+        for entity, result in zip(group, group_result):
+            if isinstance(result, BaseException):
+                results.errors[entity.entity_id] = result
+            else:
+                results.responses[entity.entity_id] = result
+            results.durations[entity.entity_id] = duration
+    return results
+
+
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistant,
@@ -978,23 +1197,16 @@ async def entity_service_call(
             await entity.async_update_ha_state(True)
         return {entity.entity_id: single_response} if return_response else None
 
-    # Use asyncio.gather here to ensure the returned results
-    # are in the same order as the entities list
-    results: list[ServiceResponse | BaseException] = await asyncio.gather(
-        *[
-            entity.async_request_call(
-                _handle_entity_call(hass, entity, func, data, call.context)
-            )
-            for entity in entities
-        ],
-        return_exceptions=True,
+    results = await async_call_entities_by_platform(
+        hass, entities, func, data, call.context
     )
 
     response_data: EntityServiceResponse = {}
-    for entity, result in zip(entities, results):
-        if isinstance(result, BaseException):
-            raise result from None
-        response_data[entity.entity_id] = result
+    for entity in entities:
+        entity_id = entity.entity_id
+        if (error := results.errors.get(entity_id)) is not None:
+            raise error from None
+        response_data[entity_id] = results.responses[entity_id]
 
     tasks: list[asyncio.Task[None]] = []
 
@@ -1016,6 +1228,97 @@ async def entity_service_call(
     return response_data if return_response and response_data else None
 
 
+async def _handle_platform_entities_call(
+    hass: HomeAssistant,
+    platform: EntityPlatform | None,
+    entities: list[Entity],
+    func: str | HassJob,
+    data: dict | ServiceCall,
+    context: Context,
+) -> tuple[list[ServiceResponse | BaseException], float]:
+    """Handle calling service method for the entities of a single platform.
+
+    If the platform module implements async_handle_batch, it is called once
+    with all entities. The batch counts as a single request against the
+    PARALLEL_UPDATES of the platform. Otherwise the entities are called
+    individually, limited by the PARALLEL_SERVICE_CALLS of the platform.
+
+    Results or exceptions are returned in the same order as the entities,
+    with the seconds the platform took.
+    """
+    start = time.monotonic()
+    batch_handler: (
+        Callable[
+            [HomeAssistant, list[Entity], str, dict[str, Any]],
+            Coroutine[Any, Any, EntityServiceResponse | None],
+        ]
+        | None
+    ) = None
+    if platform is not None and isinstance(func, str):
+        batch_handler = getattr(platform.platform, "async_handle_batch", None)
+
+    results: list[ServiceResponse | BaseException]
+    if batch_handler is not None:
+        if TYPE_CHECKING:
+            assert isinstance(func, str)
+            assert isinstance(data, dict)
+        for entity in entities:
+            entity.async_set_context(context)
+        try:
+            # The entities of a platform share its PARALLEL_UPDATES semaphore
+            batch_response = await entities[0].async_request_call(
+                batch_handler(hass, entities, func, data)
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            results = [err] * len(entities)
+        else:
+            results = [
+                batch_response.get(entity.entity_id) if batch_response else None
+                for entity in entities
+            ]
+    else:
+        semaphore = (
+            platform.get_parallel_service_calls_semaphore()
+            if platform is not None
+            else None
+        )
+        results = await asyncio.gather(
+            *[
+                _async_limit_concurrency(
+                    semaphore,
+                    entity.async_request_call(
+                        _handle_entity_call(hass, entity, func, data, context)
+                    ),
+                )
+                for entity in entities
+            ],
+            return_exceptions=True,
+        )
+
+    duration = time.monotonic() - start
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Service call %s for %d entities of %s took %.3f seconds (%d failed)",
+            func if isinstance(func, str) else func.name,
+            len(entities),
+            platform.platform_name if platform is not None else "no platform",
+            duration,
+            sum(1 for result in results if isinstance(result, BaseException)),
+        )
+
+    return results, duration
+
+
+async def _async_limit_concurrency(
+    semaphore: asyncio.Semaphore | None, coro: Coroutine[Any, Any, _T]
+) -> _T:
+    """Await a coroutine, holding the semaphore if one is given."""
+    if semaphore is None:
+        return await coro
+    async with semaphore:
+        return await coro
+
+
 async def _handle_entity_call(
     hass: HomeAssistant,
     entity: Entity,
@@ -1128,10 +1431,7 @@ def verify_domain_control(
 
             authorized = False
 
-            for entity in reg.entities.values():
-                if entity.platform != domain:
-                    continue
-
+            for entity in reg.entities.get_entries_for_platform(domain):
                 if user.permissions.check_entity(entity.entity_id, POLICY_CONTROL):
                     authorized = True
                     break
@@ -10,9 +10,11 @@ from functools import cached_property
 import inspect
 from json import JSONDecodeError, JSONEncoder
 import logging
+import mmap
 import os
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+import time
+from typing import Any, Generic, TypeVar, cast
 
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -29,9 +31,10 @@ from homeassistant.core import (
 )
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import bind_hass
-from homeassistant.util import json as json_util
+from homeassistant.util import compact_json, json as json_util
 import homeassistant.util.dt as dt_util
-from homeassistant.util.file import WriteError
+from homeassistant.util.file import WriteError, write_utf8_file
+from homeassistant.util.ulid import ulid_now
 
 from . import json as json_helper
 
@@ -47,6 +50,12 @@ STORAGE_MANAGER = "storage_manager"
 
 MANAGER_CLEANUP_DELAY = 60
 
+JOURNAL_SUFFIX = ".journal"
+# The journal is compacted into the storage file once it grows
+# past this fraction of the size of the storage file
+JOURNAL_COMPACT_RATIO = 0.5
+JOURNAL_COMPACT_MIN_SIZE = 64 * 1024
+
 _T = TypeVar("_T", bound=Mapping[str, Any] | Sequence[Any])
 
 
@@ -117,6 +126,11 @@ class _StoreManager:
         self._data_preload: dict[str, json_util.JsonValueType] = {}
         self._storage_path: Path = Path(hass.config.config_dir).joinpath(STORAGE_DIR)
         self._cancel_cleanup: asyncio.TimerHandle | None = None
+        self._preload_timings: dict[str, tuple[float, float, int]] = {}
+        self._snapshot_funcs: dict[str, tuple[Store, Callable[[], Any]]] = {}
+        self._restoring: frozenset[str] = frozenset()
+        self._restored = asyncio.Event()
+        self._restored.set()
 
     async def async_initialize(self) -> None:
         """Initialize the storage manager."""
@@ -204,24 +218,111 @@ class _StoreManager:
         stop Home Assistant, we'll clear the cache.
         """
         self._data_preload.clear()
+        self._preload_timings.clear()
+
+    @callback
+    def async_get_preload_timings(self) -> dict[str, tuple[float, float, int]]:
+        """Return when preloading each key started and finished and its size."""
+        return self._preload_timings
 
     async def async_preload(self, keys: Iterable[str]) -> None:
-        """Cache the keys."""
+        """Cache the keys.
+
+        The keys are spread over up to MAX_LOAD_CONCURRENTLY executor
+        jobs so slow storage does not load them one by one.
+        """
         # If async_initialize has not been called yet, we can't preload
-        if self._files is not None and (existing := self._files.intersection(keys)):
-            await self._hass.async_add_executor_job(self._preload, existing)
+        if self._files is None or not (existing := self._files.intersection(keys)):
+            return
+        sorted_keys = sorted(existing)
+        jobs = min(MAX_LOAD_CONCURRENTLY, len(sorted_keys))
+        await asyncio.gather(
+            *(
+                self._hass.async_add_executor_job(self._preload, sorted_keys[job::jobs])
+                for job in range(jobs)
+            )
+        )
 
     def _preload(self, keys: Iterable[str]) -> None:
         """Cache the keys."""
         storage_path = self._storage_path
         data_preload = self._data_preload
+        preload_timings = self._preload_timings
         for key in keys:
             storage_file: Path = storage_path.joinpath(key)
+            started = time.monotonic()
             try:
-                if storage_file.is_file():
-                    data_preload[key] = json_util.load_json(storage_file)
+                data, size = _load_json_mmap(storage_file)
             except Exception as ex:  # pylint: disable=broad-except
                 _LOGGER.debug("Error loading %s: %s", key, ex)
+                continue
+            if data is not None:
+                data_preload[key] = data
+                preload_timings[key] = (started, time.monotonic(), size)
+
+    @callback
+    def async_register_snapshot(
+        self, store: Store, data_func: Callable[[], Any | None]
+    ) -> None:
+        """Register the in-memory data of a store for the warm start snapshot.
+
+        The data function returns the data of the store as it was last
+        written, or None if the store should be loaded from its file.
+        """
+        self._snapshot_funcs[store.key] = (store, data_func)
+
+    def snapshot(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the in-memory data of the registered stores of the keys.
+
+        The data is in the format of the storage files so the stores can
+        load it as it is. Like a delayed write, this runs in the executor.
+        """
+        snapshot: dict[str, dict[str, Any]] = {}
+        for key in keys:
+            if key not in self._snapshot_funcs:
+                continue
+            store, data_func = self._snapshot_funcs[key]
+            if (data := data_func()) is not None:
+                snapshot[key] = {
+                    "version": store.version,
+                    "minor_version": store.minor_version,
+                    "key": key,
+                    "data": data,
+                }
+        return snapshot
+
+    @callback
+    def async_begin_restore(self, keys: Iterable[str]) -> None:
+        """Make the stores of the keys wait for a snapshot to be restored."""
+        self._restoring = frozenset(keys)
+        self._restored.clear()
+
+    @callback
+    def async_finish_restore(self, snapshot: Mapping[str, Any]) -> int:
+        """Cache the data of the restored snapshot and return how many keys it has.
+
+        The stores waiting for the snapshot load the data from the cache.
+        Keys which were written in the meantime or whose file does not exist
+        are not cached.
+        """
+        restored = 0
+        if self._files is not None:
+            for key, data in snapshot.items():
+                if (
+                    key in self._restoring
+                    and key in self._files
+                    and key not in self._invalidated
+                ):
+                    self._data_preload[key] = data
+                    restored += 1
+        self._restoring = frozenset()
+        self._restored.set()
+        return restored
+
+    async def async_wait_restored(self, key: str) -> None:
+        """Wait for the snapshot which may have the data of the key."""
+        if key in self._restoring:
+            await self._restored.wait()
 
     def _initialize_files(self) -> None:
         """Initialize the cache."""
@@ -229,6 +330,209 @@ class _StoreManager:
             self._files = set(os.listdir(self._storage_path))
 
 
+def _load_json_mmap(path: Path) -> tuple[json_util.JsonValueType | None, int]:
+    """Load JSON from a memory mapped file and return it with the file size.
+
+    Returns None if the path is not a file or is empty.
+    """
+    if not path.is_file():
+        return None, 0
+    with open(path, "rb") as file:
+        if not (size := os.fstat(file.fileno()).st_size):
+            return None, 0
+        with (
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            return json_util.json_loads(view), size
+
+
+def _journal_items_by_id(
+    value: list[Any], previous: dict[str, bytes] | bytes | None
+) -> dict[str, bytes] | None:
+    """Serialize a list of dicts which all have a unique "id" per item.
+
+    Items which are already serialized as JSON fragments, like the registry
+    entries, are only parsed to find their id if they changed since the
+    previous items.
+    """
+    json_bytes = json_helper.json_bytes
+    known_ids = (
+        {item: item_id for item_id, item in previous.items()}
+        if isinstance(previous, dict)
+        else {}
+    )
+    by_id: dict[str, bytes] = {}
+    for item in value:
+        if isinstance(item, json_helper.json_fragment):
+            item_bytes = json_bytes(item)
+            if (known_id := known_ids.get(item_bytes)) is not None:
+                item_id = known_id
+            elif (
+                isinstance(parsed := json_util.json_loads(item_bytes), dict)
+                and "id" in parsed
+            ):
+                item_id = cast(str, parsed["id"])
+            else:
+                return None
+        elif isinstance(item, dict) and "id" in item:
+            item_id = item["id"]
+            item_bytes = json_bytes(item)
+        else:
+            return None
+        by_id[item_id] = item_bytes
+    return by_id if len(by_id) == len(value) else None
+
+
+def _journal_items(
+    data: Any, previous: dict[str | None, dict[str, bytes] | bytes] | None = None
+) -> dict[str | None, dict[str, bytes] | bytes] | None:
+    """Serialize the top level values of the data for the journal.
+
+    Lists of dicts which all have a unique "id" are serialized per item so
+    changes to a single item can be journaled. If the data itself is such
+    a list, its items are stored under the None key. Returns None if the
+    data can't be journaled.
+    """
+    previous = previous or {}
+    if isinstance(data, list):
+        if (by_id := _journal_items_by_id(data, previous.get(None))) is None:
+            return None
+        return {None: by_id}
+    if not isinstance(data, dict):
+        return None
+    json_bytes = json_helper.json_bytes
+    items: dict[str | None, dict[str, bytes] | bytes] = {}
+    for key, value in data.items():
+        if (
+            isinstance(value, list)
+            and value
+            and (by_id := _journal_items_by_id(value, previous.get(key))) is not None
+        ):
+            items[key] = by_id
+        else:
+            items[key] = json_bytes(value)
+    return items
+
+
+def _journal_changes(
+    old_items: dict[str | None, dict[str, bytes] | bytes],
+    new_items: dict[str | None, dict[str, bytes] | bytes],
+) -> list[bytes]:
+    """Return the journal lines to get from the old items to the new items.
+
+    Changes to items of a top level list are written without a key.
+    """
+    json_bytes = json_helper.json_bytes
+    lines: list[bytes] = []
+    for key, new_value in new_items.items():
+        key_bytes = b"" if key is None else b'"key":%s,' % json_bytes(key)
+        old_value = old_items.get(key)
+        if isinstance(new_value, dict) and isinstance(old_value, dict):
+            for item_id, item in new_value.items():
+                if old_value.get(item_id) != item:
+                    lines.append(
+                        b'{"op":"set",%s"id":%s,"value":%s}'
+                        % (key_bytes, json_bytes(item_id), item)
+                    )
+            lines.extend(
+                b'{"op":"remove",%s"id":%s}' % (key_bytes, json_bytes(item_id))
+                for item_id in old_value.keys() - new_value.keys()
+            )
+        elif isinstance(new_value, dict):
+            lines.append(
+                b'{"op":"set",%s"value":[%s]}'
+                % (key_bytes, b",".join(new_value.values()))
+            )
+        elif old_value != new_value:
+            lines.append(b'{"op":"set",%s"value":%s}' % (key_bytes, new_value))
+    lines.extend(
+        b'{"op":"remove","key":%s}' % json_bytes(key)
+        for key in old_items.keys() - new_items.keys()
+        if key is not None
+    )
+    return lines
+
+
+def _replay_journal(
+    journal_path: str, data: dict[str, Any]
+) -> tuple[dict[str, Any], int | None]:
+    """Replay the journal on top of the data loaded from the storage file.
+
+    Returns the data with the size of the journal, or None as the size if
+    new changes can't be appended to the journal.
+    """
+    try:
+        with open(journal_path, "rb") as journal_file:
+            content = journal_file.read()
+    except FileNotFoundError:
+        return data, None
+    lines = content.splitlines()
+
+    try:
+        header = json_util.json_loads_object(lines[0]) if lines else None
+    except ValueError:
+        header = None
+    if header is None or header.get("journal_id") != data.get("journal_id"):
+        # The journal belongs to an older version of the storage file
+        # which means it was already compacted into the storage file
+        return data, None
+
+    # Changes appended after an incomplete line would not be replayed
+    journal_size: int | None = len(content) if content.endswith(b"\n") else None
+    stored: dict[str, Any] | list[Any] = data["data"]
+    lists: dict[str | None, dict[str, Any]] = {}
+    for line in lines[1:]:
+        try:
+            change = json_util.json_loads_object(line)
+        except ValueError:
+            # The last change was not completely written
+            _LOGGER.warning("Ignoring incomplete change in %s", journal_path)
+            journal_size = None
+            break
+        key = cast(str | None, change.get("key"))
+        if key is None and isinstance(stored, list):
+            if (items := lists.get(None)) is None:
+                items = lists[None] = {item["id"]: item for item in stored}
+            if "id" not in change:
+                lists[None] = {item["id"]: item for item in cast(list, change["value"])}
+            elif change["op"] == "set":
+                items[cast(str, change["id"])] = change["value"]
+            else:
+                items.pop(cast(str, change["id"]), None)
+            continue
+        if key is None or not isinstance(stored, dict):
+            _LOGGER.warning("Ignoring invalid change in %s", journal_path)
+            continue
+        if "id" in change:
+            if (items := lists.get(key)) is None:
+                items = lists[key] = {item["id"]: item for item in stored.get(key, ())}
+            if change["op"] == "set":
+                items[cast(str, change["id"])] = change["value"]
+            else:
+                items.pop(cast(str, change["id"]), None)
+            continue
+        lists.pop(key, None)
+        if change["op"] == "set":
+            stored[key] = change["value"]
+        else:
+            stored.pop(key, None)
+
+    for list_key, list_items in lists.items():
+        if list_key is None:
+            data["data"] = list(list_items.values())
+        else:
+            cast(dict[str, Any], stored)[list_key] = list(list_items.values())
+    return data, journal_size
+
+
+def _decode_compact_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Decode the data of a storage file written in the compact format."""
+    decoded = {**data, "data": compact_json.decode(data["data"])}
+    del decoded["encoding"]
+    return decoded
+
+
 @bind_hass
 class Store(Generic[_T]):
     """Class to help storing data."""
@@ -244,8 +548,20 @@ class Store(Generic[_T]):
         encoder: type[JSONEncoder] | None = None,
         minor_version: int = 1,
         read_only: bool = False,
+        journal: bool = False,
+        compact: bool = False,
     ) -> None:
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        If journal is set, the storage file is only rewritten periodically
+        and changes to the top level values of the data, or to the items of
+        the data if it's a list of dicts with a unique "id", are appended to
+        a journal file next to it in the meantime.
+
+        If compact is set, the data is written in the compact columnar
+        encoding of homeassistant.util.compact_json. Files in either format
+        can always be loaded.
+        """
         self.version = version
         self.minor_version = minor_version
         self.key = key
@@ -261,6 +577,11 @@ class Store(Generic[_T]):
         self._read_only = read_only
         self._next_write_time = 0.0
         self._manager = get_internal_store_manager(hass)
+        self._journal = journal
+        self._compact = compact
+        self._journal_items: dict[str | None, dict[str, bytes] | bytes] | None = None
+        self._journal_size = 0
+        self._snapshot_size = 0
 
     @cached_property
     def path(self):
@@ -301,6 +622,8 @@ class Store(Generic[_T]):
 
     async def _async_load_data(self):
         """Load the data."""
+        await self._manager.async_wait_restored(self.key)
+
         # Check if we have a pending write
         if self._data is not None:
             data = self._data
@@ -378,6 +701,15 @@ class Store(Generic[_T]):
             if data == {}:
                 return None
 
+        compact = data.get("encoding") == compact_json.ENCODING_COMPACT
+        if compact:
+            data = await self.hass.async_add_executor_job(_decode_compact_data, data)
+
+        if self._journal and "journal_id" in data:
+            data = await self.hass.async_add_executor_job(
+                self._load_journal, data, compact
+            )
+
         # Add minor_version if not set
         if "minor_version" not in data:
             data["minor_version"] = 1
@@ -543,14 +875,112 @@ class Store(Generic[_T]):
         if "data_func" in data:
             data["data"] = data.pop("data_func")()
 
+        if self._journal:
+            self._write_journaled_data(path, data)
+            return
+
+        _LOGGER.debug("Writing data for %s to %s", self.key, path)
+        json_helper.save_json(
+            path,
+            self._encode_data(data),
+            self._private,
+            encoder=self._encoder,
+            atomic_writes=self._atomic_writes,
+        )
+
+    def _encode_data(self, data: dict) -> dict:
+        """Encode the data in the compact format if enabled."""
+        if not self._compact or not isinstance(data["data"], Mapping):
+            return data
+        # The compact encoding is not meant to be read by humans
+        # so it's embedded without indentation
+        return {
+            **data,
+            "encoding": compact_json.ENCODING_COMPACT,
+            "data": json_helper.json_fragment(
+                json_helper.json_bytes(compact_json.encode(data["data"]))
+            ),
+        }
+
+    @cached_property
+    def _journal_path(self) -> str:
+        """Return the path of the journal."""
+        return f"{self.path}{JOURNAL_SUFFIX}"
+
+    def _load_journal(self, data: dict[str, Any], compact: bool) -> dict[str, Any]:
+        """Replay the journal and continue it from the loaded data.
+
+        Without the journal items of the loaded data, the first save
+        after loading would have to compact the journal. A file in the
+        other encoding or of another version is not continued, so the next
+        save converts it or writes the migrated data with the new version.
+        """
+        data, journal_size = _replay_journal(self._journal_path, data)
+        if (
+            journal_size is None
+            or data["version"] != self.version
+            or data.get("minor_version", 1) != self.minor_version
+            or compact != (self._compact and isinstance(data["data"], Mapping))
+        ):
+            return data
+        try:
+            items = _journal_items(data["data"])
+        except TypeError:
+            return data
+        self._journal_items = items
+        self._journal_size = journal_size
+        self._snapshot_size = os.path.getsize(self.path)
+        return data
+
+    def _write_journaled_data(self, path: str, data: dict) -> None:
+        """Append the changes to the journal or compact it into the file."""
+        try:
+            items = _journal_items(data["data"], self._journal_items)
+        except TypeError:
+            # Let the full write report the unserializable data
+            items = None
+        if (
+            items is not None
+            and self._journal_items is not None
+            and self._journal_size
+            < max(JOURNAL_COMPACT_MIN_SIZE, self._snapshot_size * JOURNAL_COMPACT_RATIO)
+        ):
+            if lines := _journal_changes(self._journal_items, items):
+                _LOGGER.debug(
+                    "Appending %s changes for %s to %s",
+                    len(lines),
+                    self.key,
+                    self._journal_path,
+                )
+                journal_data = b"\n".join(lines) + b"\n"
+                try:
+                    with open(self._journal_path, "ab") as journal_file:
+                        journal_file.write(journal_data)
+                        if self._atomic_writes:
+                            journal_file.flush()
+                            os.fsync(journal_file.fileno())
+                except OSError as err:
+                    raise WriteError(err) from err
+                self._journal_size += len(journal_data)
+            self._journal_items = items
+            return
+
+        # Compact the journal by writing the full data with a new journal id,
+        # which invalidates the existing journal, before starting a new journal.
+        journal_id = ulid_now()
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
         json_helper.save_json(
             path,
-            data,
+            {**self._encode_data(data), "journal_id": journal_id},
             self._private,
             encoder=self._encoder,
             atomic_writes=self._atomic_writes,
         )
+        header = json_helper.json_bytes({"journal_id": journal_id}) + b"\n"
+        write_utf8_file(self._journal_path, header, self._private, mode="wb")
+        self._journal_items = items
+        self._journal_size = 0
+        self._snapshot_size = os.path.getsize(path)
 
     async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
         """Migrate to the new version."""
@@ -562,5 +992,11 @@ class Store(Generic[_T]):
         self._async_cleanup_delay_listener()
         self._async_cleanup_final_write_listener()
 
+        self._journal_items = None
+
         with suppress(FileNotFoundError):
             await self.hass.async_add_executor_job(os.unlink, self.path)
+
+        if self._journal:
+            with suppress(FileNotFoundError):
+                await self.hass.async_add_executor_job(os.unlink, self._journal_path)
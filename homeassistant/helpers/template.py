@@ -1321,13 +1321,9 @@ def integration_entities(hass: HomeAssistant, entry_name: str) -> Iterable[str]:
 
     # fallback to just returning all entities for a domain
     # pylint: disable-next=import-outside-toplevel
-    from .entity import entity_sources
+    from .entity import entity_ids_for_source_domain
 
-    return [
-        entity_id
-        for entity_id, info in entity_sources(hass).items()
-        if info["domain"] == entry_name
-    ]
+    return entity_ids_for_source_domain(hass, entry_name)
 
 
 def config_entry_id(hass: HomeAssistant, entity_id: str) -> str | None:
@@ -248,6 +248,32 @@ class _TranslationCache:
                 if components_to_load := components - loaded:
                     await self._async_load(language, components_to_load)
 
+    @callback
+    def async_snapshot(self) -> dict[str, Any]:
+        """Return the loaded components and the cache for a warm start snapshot."""
+        return {
+            "loaded": {
+                language: sorted(components)
+                for language, components in self.loaded.items()
+            },
+            "cache": self.cache,
+        }
+
+    @callback
+    def async_restore(self, snapshot: Mapping[str, Any]) -> None:
+        """Restore the cache from a warm start snapshot.
+
+        The snapshot is only restored if nothing was loaded yet,
+        as it replaces the whole cache.
+        """
+        if self.loaded or self.lock.locked():
+            return
+        self.loaded = {
+            language: set(components)
+            for language, components in snapshot["loaded"].items()
+        }
+        self.cache = snapshot["cache"]
+
     async def async_fetch(
         self,
         language: str,
@@ -521,6 +547,20 @@ async def async_load_integrations(hass: HomeAssistant, integrations: set[str]) -
     )
 
 
+@callback
+def async_get_cache_snapshot(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the compiled translations for a warm start snapshot."""
+    return _async_get_translations_cache(hass).async_snapshot()
+
+
+@callback
+def async_restore_cache_snapshot(
+    hass: HomeAssistant, snapshot: Mapping[str, Any]
+) -> None:
+    """Restore the compiled translations from a warm start snapshot."""
+    _async_get_translations_cache(hass).async_restore(snapshot)
+
+
 @callback
 def async_translations_loaded(hass: HomeAssistant, components: set[str]) -> bool:
     """Return if the given components are loaded for the language."""
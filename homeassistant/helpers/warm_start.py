@@ -0,0 +1,288 @@
+"""Warm start snapshot of the data loaded on every startup.
+
+When Home Assistant is closed, the in-memory data of the registries, the
+config entries, the restore states and the integration index and the
+compiled translations are written to a single compressed snapshot. On the
+next startup the snapshot is restored while the registries are loading,
+and their stores take the data from it instead of reading and decoding
+their files and replaying their journals.
+
+The snapshot is only used by the same version of Home Assistant. The
+storage data is only restored if the hash of the storage files it was
+written with did not change, and the translations only if the hash of the
+files of the custom integrations did not change, so edits made while Home
+Assistant was stopped are picked up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from contextlib import suppress
+from functools import partial
+import hashlib
+import logging
+import os
+from typing import Any, cast
+import zlib
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, __version__
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.loader import async_get_custom_components
+from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.file import write_utf8_file
+from homeassistant.util.json import SerializationError, json_loads_object
+
+from . import translation
+from .json import json_bytes
+from .storage import JOURNAL_SUFFIX, STORAGE_DIR, Store, get_internal_store_manager
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "core.warm_start"
+STORAGE_VERSION = 1
+
+# The storage files which are loaded on every startup
+SNAPSHOT_STORAGE_KEYS = (
+    "core.area_registry",
+    "core.category_registry",
+    "core.config_entries",
+    "core.device_registry",
+    "core.entity_registry",
+    "core.floor_registry",
+    "core.integration_index",
+    "core.label_registry",
+    "core.restore_state",
+    "repairs.issue_registry",
+)
+
+# The parts of the snapshot which are compressed, the others
+# are written as a JSON header line in front of them
+_COMPRESSED_KEYS = ("storage", "translations")
+# Restarts should not wait for the best compression
+_COMPRESSION_LEVEL = 1
+
+
+class _WarmStartStore(Store[dict[str, Any]]):
+    """Store which writes the snapshot as a JSON header and a compressed body."""
+
+    def _write_data(self, path: str, data: dict) -> None:
+        """Write the header and the compressed parts of the snapshot."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        snapshot: dict[str, Any] = data["data"]
+        header = {
+            "version": data["version"],
+            "minor_version": data["minor_version"],
+            "key": data["key"],
+        }
+        header.update(
+            (key, value)
+            for key, value in snapshot.items()
+            if key not in _COMPRESSED_KEYS
+        )
+        try:
+            content = b"%s\n%s" % (
+                json_bytes(header),
+                zlib.compress(
+                    json_bytes({key: snapshot[key] for key in _COMPRESSED_KEYS}),
+                    _COMPRESSION_LEVEL,
+                ),
+            )
+        except TypeError as err:
+            raise SerializationError(
+                f"Failed to serialize the snapshot: {err}"
+            ) from err
+        _LOGGER.debug("Writing data for %s to %s", self.key, path)
+        write_utf8_file(path, content, self._private, mode="wb")
+
+    async def _async_load_data(self) -> dict[str, Any] | None:
+        """Load the snapshot."""
+        if self._data is not None:
+            # A pending write is returned as it is
+            data = await super()._async_load_data()  # type: ignore[no-untyped-call]
+            return cast(dict[str, Any] | None, data)
+        return await self.hass.async_add_executor_job(self._load_snapshot)
+
+    def _load_snapshot(self) -> dict[str, Any] | None:
+        """Read and decompress the snapshot."""
+        try:
+            with open(self.path, "rb") as file:
+                header_line = file.readline()
+                header = json_loads_object(header_line)
+                if header.get("version") != self.version:
+                    return None
+                body = json_loads_object(zlib.decompress(file.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as err:
+            _LOGGER.warning(
+                "Ignoring invalid warm start snapshot %s: %s", self.path, err
+            )
+            return None
+        snapshot = {
+            key: value
+            for key, value in header.items()
+            if key not in ("version", "minor_version", "key")
+        }
+        snapshot.update(body)
+        return snapshot
+
+
+def _files_hash(paths: Iterable[str]) -> str:
+    """Return a hash of the inode, modification time and size of the files.
+
+    The files are replaced or appended to when they are written, so the
+    hash changes when any of them is written, created or removed.
+    """
+    hasher = hashlib.sha256()
+    for path in paths:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            hasher.update(f"{path}\n".encode())
+            continue
+        hasher.update(
+            f"{path}:{stat_result.st_ino}:{stat_result.st_mtime_ns}:"
+            f"{stat_result.st_size}\n".encode()
+        )
+    return hasher.hexdigest()
+
+
+def _storage_paths(storage_dir: str, keys: Iterable[str]) -> list[str]:
+    """Return the paths of the storage files of the keys and their journals."""
+    paths: list[str] = []
+    for key in keys:
+        path = os.path.join(storage_dir, key)
+        paths.append(path)
+        paths.append(f"{path}{JOURNAL_SUFFIX}")
+    return paths
+
+
+def _translation_paths(config_dir: str, integration_paths: Iterable[str]) -> list[str]:
+    """Return the paths of the files the translations were compiled from.
+
+    The translations of the built-in integrations only change with the version.
+    A new custom integration changes the custom_components directory, and new
+    translations of a custom integration change its translations directory.
+    """
+    paths = [os.path.join(config_dir, "custom_components")]
+    for integration_path in integration_paths:
+        translations_path = os.path.join(integration_path, "translations")
+        paths.append(os.path.join(integration_path, "manifest.json"))
+        paths.append(translations_path)
+        with suppress(OSError):
+            paths.extend(
+                os.path.join(translations_path, name)
+                for name in sorted(os.listdir(translations_path))
+            )
+    return paths
+
+
+async def async_load(hass: HomeAssistant) -> None:
+    """Initialize the storage manager and restore the warm start snapshot.
+
+    The stores of the snapshot wait for it to be restored before they load,
+    so this runs together with loading the registries. A new snapshot is
+    saved when Home Assistant is closed.
+    """
+    manager = get_internal_store_manager(hass)
+    manager.async_begin_restore(SNAPSHOT_STORAGE_KEYS)
+    store = _WarmStartStore(hass, STORAGE_VERSION, STORAGE_KEY, private=True)
+    hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, partial(_async_save_snapshot, hass, store)
+    )
+    storage: dict[str, Any] = {}
+    try:
+        _, storage = await asyncio.gather(
+            create_eager_task(manager.async_initialize()),
+            create_eager_task(_async_load_snapshot(hass, store)),
+        )
+    finally:
+        # Let the stores load even if the snapshot could not be restored
+        restored = manager.async_finish_restore(storage)
+    _LOGGER.debug("Restored %s storage files from the warm start snapshot", restored)
+
+
+async def _async_load_snapshot(
+    hass: HomeAssistant, store: _WarmStartStore
+) -> dict[str, Any]:
+    """Load the snapshot, restore its translations and return its storage data.
+
+    The parts of the snapshot which are no longer valid are left out.
+    """
+    try:
+        return await _async_restore_snapshot(hass, store)
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.exception("Error restoring the warm start snapshot")
+        return {}
+
+
+async def _async_restore_snapshot(
+    hass: HomeAssistant, store: _WarmStartStore
+) -> dict[str, Any]:
+    """Validate the snapshot and restore its translations."""
+    if (snapshot := await store.async_load()) is None:
+        return {}
+    if snapshot["ha_version"] != __version__:
+        _LOGGER.debug(
+            "Not using the warm start snapshot of version %s", snapshot["ha_version"]
+        )
+        return {}
+
+    storage: dict[str, Any] = snapshot["storage"]
+    storage_dir = hass.config.path(STORAGE_DIR)
+
+    def _validate() -> tuple[bool, bool]:
+        """Return if the storage files and the translation files are unchanged."""
+        return (
+            _files_hash(_storage_paths(storage_dir, storage))
+            == snapshot["storage_hash"],
+            _files_hash(snapshot["translation_paths"]) == snapshot["translations_hash"],
+        )
+
+    storage_valid, translations_valid = await hass.async_add_executor_job(_validate)
+    if translations_valid:
+        translation.async_restore_cache_snapshot(hass, snapshot["translations"])
+    _LOGGER.debug(
+        "The storage files of the warm start snapshot are %s, its translations"
+        " are %s",
+        "unchanged" if storage_valid else "changed",
+        "unchanged" if translations_valid else "changed",
+    )
+    return storage if storage_valid else {}
+
+
+async def _async_save_snapshot(
+    hass: HomeAssistant, store: _WarmStartStore, _event: Event
+) -> None:
+    """Save the warm start snapshot from the data in memory."""
+    manager = get_internal_store_manager(hass)
+    translations = translation.async_get_cache_snapshot(hass)
+    custom_components = await async_get_custom_components(hass)
+    custom_domains = {
+        component.partition(".")[0]
+        for components in translations["loaded"].values()
+        for component in components
+    }.intersection(custom_components)
+    config_dir = hass.config.config_dir
+    storage_dir = hass.config.path(STORAGE_DIR)
+
+    def _build_snapshot() -> dict[str, Any]:
+        """Build the snapshot and hash the files it was built from."""
+        # The stores were written by the final write, so the storage
+        # files hold the data which is in memory now
+        storage = manager.snapshot(SNAPSHOT_STORAGE_KEYS)
+        translation_paths = _translation_paths(
+            config_dir,
+            (str(custom_components[domain].file_path) for domain in custom_domains),
+        )
+        return {
+            "ha_version": __version__,
+            "storage_hash": _files_hash(_storage_paths(storage_dir, storage)),
+            "translations_hash": _files_hash(translation_paths),
+            "translation_paths": translation_paths,
+            "storage": storage,
+            "translations": translations,
+        }
+
+    await store.async_save(await hass.async_add_executor_job(_build_snapshot))
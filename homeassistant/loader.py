@@ -7,7 +7,8 @@ documentation as possible to keep it understandable.
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
 import functools as ft
@@ -16,7 +17,9 @@ import importlib
 import logging
 import os
 import pathlib
+import stat
 import sys
+import threading
 import time
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict, TypeVar, cast
@@ -29,7 +32,7 @@ from awesomeversion import (
 import voluptuous as vol
 
 from . import generated
-from .const import Platform
+from .const import Platform, __version__
 from .core import HomeAssistant, callback
 from .generated.application_credentials import APPLICATION_CREDENTIALS
 from .generated.bluetooth import BLUETOOTH
@@ -98,6 +101,7 @@ DATA_INTEGRATIONS = "integrations"
 DATA_MISSING_PLATFORMS = "missing_platforms"
 DATA_CUSTOM_COMPONENTS = "custom_components"
 DATA_PRELOAD_PLATFORMS = "preload_platforms"
+DATA_INTEGRATION_INDEX = "integration_index"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -113,6 +117,13 @@ IMPORT_EVENT_LOOP_WARNING = (
     "experience issues with Home Assistant"
 )
 
+INTEGRATION_INDEX_STORAGE_KEY = "core.integration_index"
+INTEGRATION_INDEX_STORAGE_VERSION = 1
+INTEGRATION_INDEX_SAVE_DELAY = 60
+
+# Number of threads used to pre-import independent integrations
+PREIMPORT_MAX_WORKERS = 4
+
 _UNDEF = object()  # Internal; not helpers.typing.UNDEFINED due to circular dependency
 
 
@@ -282,6 +293,8 @@ async def _async_get_custom_components(
         custom_components,
         [comp.name for comp in dirs],
     )
+    if index := hass.data.get(DATA_INTEGRATION_INDEX):
+        index.async_save_if_changed()
     return {
         integration.domain: integration
         for integration in integrations.values()
@@ -312,6 +325,121 @@ async def async_get_custom_components(
     return comps_or_future
 
 
+def _list_top_level_files(
+    file_path: pathlib.Path, manifest: Manifest
+) -> list[str] | None:
+    """List the top level files of an integration."""
+    # Avoid the listdir for virtual integrations
+    # as they cannot have any platforms
+    if manifest.get("integration_type") == "virtual":
+        return None
+    return os.listdir(file_path)
+
+
+class IntegrationIndex:
+    """Persistent index of the manifests and files of integrations.
+
+    The entries are keyed by the directory of the integration and are
+    validated with the modification times of the manifest and of the
+    directory. The manifest is only read again when it was modified and
+    the directory is only listed again when files were added or removed.
+    """
+
+    def __init__(self, hass: HomeAssistant, *, read_only: bool = False) -> None:
+        """Initialize the integration index."""
+        # pylint: disable-next=import-outside-toplevel
+        from .helpers.storage import Store, get_internal_store_manager
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            INTEGRATION_INDEX_STORAGE_VERSION,
+            INTEGRATION_INDEX_STORAGE_KEY,
+            read_only=read_only,
+        )
+        self._store_manager = get_internal_store_manager(hass)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._changed = False
+
+    async def async_load(self) -> None:
+        """Load the index.
+
+        The index is discarded when Home Assistant was updated.
+        """
+        data = await self._store.async_load()
+        if data and data["version"] == __version__:
+            self._entries = data["integrations"]
+        self._store_manager.async_register_snapshot(self._store, self._data_to_save)
+
+    def load_integration(
+        self, file_path: pathlib.Path
+    ) -> tuple[Manifest, list[str] | None] | None:
+        """Return the manifest and the top level files of an integration.
+
+        Return None if there is no manifest in the directory. Raises
+        JSON_DECODE_EXCEPTIONS if the manifest can't be parsed.
+
+        This method must be run in the executor.
+        """
+        key = str(file_path)
+        try:
+            manifest_stat = os.stat(file_path / "manifest.json")
+            dir_mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            manifest_stat = None
+        if manifest_stat is None or not stat.S_ISREG(manifest_stat.st_mode):
+            if self._entries.pop(key, None) is not None:
+                self._changed = True
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None and entry["manifest_mtime"] == manifest_stat.st_mtime_ns:
+            manifest = cast(Manifest, entry["manifest"])
+            if entry["dir_mtime"] == dir_mtime:
+                return manifest, entry["files"]
+        else:
+            manifest = cast(
+                Manifest, json_loads((file_path / "manifest.json").read_text())
+            )
+
+        files = _list_top_level_files(file_path, manifest)
+        self._entries[key] = {
+            "manifest_mtime": manifest_stat.st_mtime_ns,
+            "dir_mtime": dir_mtime,
+            "manifest": manifest,
+            "files": files,
+        }
+        self._changed = True
+        return manifest, files
+
+    @callback
+    def async_save_if_changed(self) -> None:
+        """Save the index if it changed."""
+        if self._changed:
+            self._changed = False
+            self._store.async_delay_save(
+                self._data_to_save, INTEGRATION_INDEX_SAVE_DELAY
+            )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"version": __version__, "integrations": dict(self._entries)}
+
+
+async def async_load_integration_index(
+    hass: HomeAssistant, *, read_only: bool = False
+) -> None:
+    """Load the integration index.
+
+    Integrations resolved before the index is loaded are read from disk.
+    """
+    if DATA_INTEGRATION_INDEX in hass.data:
+        return
+    index = IntegrationIndex(hass, read_only=read_only)
+    await index.async_load()
+    hass.data[DATA_INTEGRATION_INDEX] = index
+
+
 async def async_get_config_flows(
     hass: HomeAssistant,
     type_filter: Literal["device", "helper", "hub", "service"] | None = None,
@@ -630,30 +758,35 @@ class Integration:
         cls, hass: HomeAssistant, root_module: ModuleType, domain: str
     ) -> Integration | None:
         """Resolve an integration from a root module."""
+        index: IntegrationIndex | None = hass.data.get(DATA_INTEGRATION_INDEX)
         for base in root_module.__path__:
-            manifest_path = pathlib.Path(base) / domain / "manifest.json"
-
-            if not manifest_path.is_file():
-                continue
+            file_path = pathlib.Path(base) / domain
+            manifest_path = file_path / "manifest.json"
 
             try:
-                manifest = cast(Manifest, json_loads(manifest_path.read_text()))
+                if index is not None:
+                    if (loaded := index.load_integration(file_path)) is None:
+                        continue
+                    manifest, files = loaded
+                    # The manifest is updated by the integration
+                    manifest = cast(Manifest, dict(manifest))
+                else:
+                    if not manifest_path.is_file():
+                        continue
+                    manifest = cast(Manifest, json_loads(manifest_path.read_text()))
+                    files = _list_top_level_files(file_path, manifest)
             except JSON_DECODE_EXCEPTIONS as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
                 )
                 continue
 
-            file_path = manifest_path.parent
-            # Avoid the listdir for virtual integrations
-            # as they cannot have any platforms
-            is_virtual = manifest.get("integration_type") == "virtual"
             integration = cls(
                 hass,
                 f"{root_module.__name__}.{domain}",
                 file_path,
                 manifest,
-                None if is_virtual else set(os.listdir(file_path)),
+                None if files is None else set(files),
             )
 
             if not integration.import_executor:
@@ -1376,6 +1509,8 @@ async def async_get_integrations(
         integrations = await hass.async_add_executor_job(
             _resolve_integrations_from_root, hass, components, needed
         )
+        if index := hass.data.get(DATA_INTEGRATION_INDEX):
+            index.async_save_if_changed()
         for domain, future in needed.items():
             int_or_exc = integrations.get(domain)
             if not int_or_exc:
@@ -1393,6 +1528,168 @@ async def async_get_integrations(
     return results
 
 
+@dataclass(slots=True)
+class PreImportStats:
+    """Statistics of pre-importing integrations."""
+
+    modules: int = 0
+    """Number of modules imported."""
+    failed: int = 0
+    """Number of modules which failed to import."""
+    contended: int = 0
+    """Number of modules which were being imported by another thread.
+
+    The import had to wait for the import lock of the module.
+    """
+    contended_wait: float = 0.0
+    """Time spent waiting for the import lock of modules."""
+    duration: float = 0.0
+
+    def add(self, other: PreImportStats) -> None:
+        """Add the statistics of another pre-import."""
+        self.modules += other.modules
+        self.failed += other.failed
+        self.contended += other.contended
+        self.contended_wait += other.contended_wait
+
+
+def plan_preimport(integrations: Iterable[Integration]) -> list[list[Integration]]:
+    """Group integrations in waves which can be imported concurrently.
+
+    An integration is placed in a later wave than the integrations it
+    depends on, as its modules usually import their modules. The
+    integrations of a wave don't depend on each other and can be imported
+    at the same time without waiting for each other's import locks.
+
+    Integrations which must be imported in the event loop are left out.
+    """
+    by_domain = {
+        integration.domain: integration
+        for integration in integrations
+        if integration.import_executor
+    }
+    depths: dict[str, int] = {}
+
+    def _depth(domain: str, resolving: set[str]) -> int:
+        """Return the length of the longest dependency chain of an integration."""
+        if (depth := depths.get(domain)) is not None:
+            return depth
+        resolving.add(domain)
+        depth = 0
+        for dependency in by_domain[domain].dependencies:
+            # Circular dependencies are ignored, they fail at setup
+            if dependency in by_domain and dependency not in resolving:
+                depth = max(depth, _depth(dependency, resolving) + 1)
+        resolving.discard(domain)
+        depths[domain] = depth
+        return depth
+
+    waves: list[list[Integration]] = []
+    for domain in sorted(by_domain):
+        depth = _depth(domain, set())
+        while len(waves) <= depth:
+            waves.append([])
+        waves[depth].append(by_domain[domain])
+    return waves
+
+
+def _preimport_module(
+    stats: PreImportStats, name: str, load: Callable[[], Any]
+) -> bool:
+    """Import a module and record the statistics.
+
+    Return if the module could be imported.
+    """
+    module = sys.modules.get(name)
+    # The module is in sys.modules while another thread is importing it
+    contended = getattr(getattr(module, "__spec__", None), "_initializing", False)
+    start = time.perf_counter()
+    try:
+        load()
+    except ImportError:
+        stats.failed += 1
+        return False
+    if contended:
+        stats.contended += 1
+        stats.contended_wait += time.perf_counter() - start
+    elif module is None:
+        stats.modules += 1
+    return True
+
+
+def _preimport_integration(
+    integration: Integration, platform_names: Iterable[str], cancel: threading.Event
+) -> PreImportStats:
+    """Import an integration and its platforms."""
+    stats = PreImportStats()
+    if cancel.is_set() or not _preimport_module(
+        stats, integration.pkg_path, integration.get_component
+    ):
+        return stats
+    preload_platforms: list[str] = integration.hass.data[DATA_PRELOAD_PLATFORMS]
+    for platform_name in integration.platforms_exists(
+        {*preload_platforms, *platform_names}
+    ):
+        if cancel.is_set():
+            break
+        if integration.get_platform_cached(platform_name) is None:
+            _preimport_module(
+                stats,
+                f"{integration.pkg_path}.{platform_name}",
+                ft.partial(integration.get_platform, platform_name),
+            )
+    return stats
+
+
+def _preimport(
+    waves: list[list[Integration]],
+    platforms: Mapping[str, Iterable[str]],
+    cancel: threading.Event,
+) -> PreImportStats:
+    """Import the waves of integrations one after another."""
+    stats = PreImportStats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=PREIMPORT_MAX_WORKERS, thread_name_prefix="PreImport"
+    ) as executor:
+        for wave in waves:
+            if cancel.is_set():
+                break
+            for wave_stats in executor.map(
+                lambda integration: _preimport_integration(
+                    integration, platforms.get(integration.domain, ()), cancel
+                ),
+                wave,
+            ):
+                stats.add(wave_stats)
+    stats.duration = time.perf_counter() - start
+    return stats
+
+
+async def async_preimport_integrations(
+    hass: HomeAssistant,
+    integrations: Iterable[Integration],
+    platforms: Mapping[str, Iterable[str]],
+) -> PreImportStats:
+    """Import integrations and their platforms ahead of setting them up.
+
+    The integrations are imported in the order planned by plan_preimport
+    on a dedicated pool of threads, so setting them up later finds their
+    modules imported instead of waiting in line for the import executor.
+    The platforms are imported together with the preload platforms.
+
+    Import errors are ignored here, they are reported when the integration
+    is imported for its setup.
+    """
+    waves = plan_preimport(integrations)
+    cancel = threading.Event()
+    try:
+        return await hass.async_add_executor_job(_preimport, waves, platforms, cancel)
+    finally:
+        # Stop importing when cancelled
+        cancel.set()
+
+
 class LoaderError(Exception):
     """Loader base error."""
 
@@ -44,6 +44,8 @@ class RuntimeConfig:
     config_dir: str
     skip_pip: bool = False
     skip_pip_packages: list[str] = dataclasses.field(default_factory=list)
+    compact_storage: bool = False
+    preimport_integrations: bool = False
     recovery_mode: bool = False
 
     verbose: bool = False
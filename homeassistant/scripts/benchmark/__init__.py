@@ -6,20 +6,31 @@ import argparse
 import asyncio
 import collections
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
+from datetime import timedelta
 import json
 import logging
+import multiprocessing
+import os
+import pathlib
+import shutil
+import tempfile
 from timeit import default_timer as timer
-from typing import TypeVar
+from typing import Any, TypeVar
 
-from homeassistant import core
+from homeassistant import components, core, loader
 from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import entity_registry as er, storage
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
 )
 from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -28,6 +39,14 @@ _CallableT = TypeVar("_CallableT", bound=Callable)
 
 BENCHMARKS: dict[str, Callable] = {}
 
+# Options of the recorder benchmarks, set from the command line
+RECORDER_OPTIONS: dict[str, Any] = {
+    "entities": 1000,
+    "attribute_size": 200,
+    "changes": 10**5,
+    "rate": 0,
+}
+
 
 def run(args):
     """Handle benchmark commandline script."""
@@ -37,8 +56,38 @@ def run(args):
     parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--entities",
+        type=int,
+        default=RECORDER_OPTIONS["entities"],
+        help="Number of entities changing state in the recorder benchmarks",
+    )
+    parser.add_argument(
+        "--attribute-size",
+        type=int,
+        default=RECORDER_OPTIONS["attribute_size"],
+        help="Size in bytes of the attributes of each state",
+    )
+    parser.add_argument(
+        "--changes",
+        type=int,
+        default=RECORDER_OPTIONS["changes"],
+        help="Number of state changes to record",
+    )
+    parser.add_argument(
+        "--rate",
+        type=int,
+        default=RECORDER_OPTIONS["rate"],
+        help="State changes per second, 0 to change states as fast as possible",
+    )
 
     args = parser.parse_args()
+    RECORDER_OPTIONS.update(
+        entities=args.entities,
+        attribute_size=args.attribute_size,
+        changes=args.changes,
+        rate=args.rate,
+    )
 
     bench = BENCHMARKS[args.name]
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
@@ -315,6 +364,427 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+async def _registry_store_load_save(hass, count):
+    """Save and load an entity registry with count entries in both encodings."""
+    config_dir = await hass.async_add_executor_job(tempfile.mkdtemp)
+    hass.config.config_dir = config_dir
+    entities = [
+        er.RegistryEntry(
+            entity_id=f"sensor.benchmark_{index}",
+            unique_id=f"unique_{index}",
+            platform=f"platform_{index % 20}",
+            config_entry_id=f"config_entry_{index % 200}",
+            device_id=f"device_{index // 4}",
+            original_name=f"Benchmark {index}",
+            unit_of_measurement="°C",
+        ).as_storage_fragment
+        for index in range(count)
+    ]
+    data = {"entities": entities, "deleted_entities": []}
+
+    total = 0.0
+    try:
+        for compact in (False, True):
+            store = storage.Store(hass, 1, f"benchmark_{compact}", compact=compact)
+            start = timer()
+            await store.async_save(data)
+            saved = timer()
+            store = storage.Store(hass, 1, f"benchmark_{compact}", compact=compact)
+            await store.async_load()
+            loaded = timer()
+            size = await hass.async_add_executor_job(os.path.getsize, store.path)
+            print(
+                f"{'compact' if compact else 'json'}: save {saved - start:.3f}s, "
+                f"load {loaded - saved:.3f}s, {size} bytes"
+            )
+            total += loaded - start
+    finally:
+        await hass.async_add_executor_job(shutil.rmtree, config_dir)
+    return total
+
+
+@benchmark
+async def registry_store_10k(hass):
+    """Save and load an entity registry with 10k entries."""
+    return await _registry_store_load_save(hass, 10**4)
+
+
+@benchmark
+async def registry_store_50k(hass):
+    """Save and load an entity registry with 50k entries."""
+    return await _registry_store_load_save(hass, 5 * 10**4)
+
+
+def _importable_integrations(count):
+    """Return built-in integrations which don't need to install requirements."""
+    domains = []
+    components_dir = pathlib.Path(components.__file__).parent
+    for manifest_path in sorted(components_dir.glob("*/manifest.json")):
+        manifest = json_loads(manifest_path.read_text())
+        if (
+            manifest.get("requirements")
+            or manifest.get("integration_type") == "virtual"
+            or not manifest.get("import_executor", True)
+        ):
+            continue
+        domains.append(manifest["domain"])
+        if len(domains) == count:
+            break
+    return domains
+
+
+def _cold_start_imports(domains, preimport):
+    """Import integrations in a fresh interpreter and return the time it took."""
+
+    async def _import():
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = core.HomeAssistant(config_dir)
+            loader.async_setup(hass)
+            integrations = [
+                integration
+                for integration in (
+                    await loader.async_get_integrations(hass, domains)
+                ).values()
+                if isinstance(integration, loader.Integration)
+            ]
+            stats = None
+            start = timer()
+            if preimport:
+                stats = await loader.async_preimport_integrations(
+                    hass, integrations, {}
+                )
+            else:
+                # Bootstrap imports the integrations through the import executor
+                await asyncio.gather(
+                    *(
+                        integration.async_get_component()
+                        for integration in integrations
+                    ),
+                    return_exceptions=True,
+                )
+            elapsed = timer() - start
+            await hass.async_stop(force=True)
+        return elapsed, stats
+
+    return asyncio.run(_import())
+
+
+@benchmark
+async def cold_start_imports(hass):
+    """Import 200 integrations in a fresh interpreter with and without pre-import."""
+    domains = await hass.async_add_executor_job(_importable_integrations, 200)
+    total = 0.0
+    # Every run gets a new process so nothing is imported yet
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        for preimport in (False, True):
+            elapsed, stats = await hass.loop.run_in_executor(
+                executor, _cold_start_imports, domains, preimport
+            )
+            if stats is None:
+                print(f"import executor: {elapsed:.3f}s")
+            else:
+                print(
+                    f"pre-import: {elapsed:.3f}s, {stats.modules} modules, "
+                    f"{stats.failed} failed, {stats.contended} waited "
+                    f"{stats.contended_wait:.3f}s for imports in other threads"
+                )
+            total += elapsed
+    return total
+
+
+async def _recorder_ingest(hass, file_backed):
+    """Record state changes with a real recorder and report the write path numbers.
+
+    Measures the rate of state changes until they are committed, the
+    recorder backlog, the memory growth and the database size, followed
+    by the runtime of compiling statistics and purging all states.
+    """
+    # pylint: disable=import-outside-toplevel
+    import psutil_home_assistant as ha_psutil
+    from sqlalchemy import func, select, text
+
+    from homeassistant import bootstrap, config_entries
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.db_schema import States
+    from homeassistant.components.recorder.tasks import (
+        PurgeTask,
+        StatisticsTask,
+        SynchronizeTask,
+    )
+    from homeassistant.components.recorder.util import session_scope
+    from homeassistant.helpers import recorder as recorder_helper
+
+    # pylint: enable=import-outside-toplevel
+
+    entities = RECORDER_OPTIONS["entities"]
+    changes = RECORDER_OPTIONS["changes"]
+    rate = RECORDER_OPTIONS["rate"]
+    payload = "x" * RECORDER_OPTIONS["attribute_size"]
+
+    config_dir = await hass.async_add_executor_job(tempfile.mkdtemp)
+    hass.config.config_dir = config_dir
+    if file_backed:
+        db_url = f"sqlite:///{config_dir}/home-assistant_v2.db"
+    else:
+        recorder.ALLOW_IN_MEMORY_DB = True
+        db_url = "sqlite://"
+    process = ha_psutil.PsutilWrapper().psutil.Process()
+
+    try:
+        loader.async_setup(hass)
+        hass.config.skip_pip = True
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        recorder_helper.async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass, recorder.DOMAIN, {recorder.DOMAIN: {"db_url": db_url}}
+        )
+        # The sensor recorder platform compiles the statistics
+        assert await async_setup_component(hass, "sensor", {})
+        await hass.async_start()
+        instance = get_instance(hass)
+        await instance.async_recorder_ready.wait()
+
+        async def _async_commit():
+            event = asyncio.Event()
+            instance.queue_task(SynchronizeTask(event))
+            await event.wait()
+
+        def _db_stats():
+            with session_scope(
+                session=instance.get_session(), read_only=True
+            ) as session:
+                states = session.execute(
+                    select(func.count()).select_from(States)
+                ).scalar_one()
+                db_size = session.execute(
+                    text(
+                        "SELECT page_count * page_size"
+                        " FROM pragma_page_count(), pragma_page_size()"
+                    )
+                ).scalar_one()
+            return states, db_size
+
+        attributes = [
+            {
+                "friendly_name": f"Benchmark {index}",
+                "state_class": "measurement",
+                "unit_of_measurement": "°C",
+                "payload": payload,
+            }
+            for index in range(entities)
+        ]
+        rss = process.memory_info().rss
+        max_backlog = 0
+        period_start = dt_util.utcnow()
+        start = timer()
+        for change in range(changes):
+            index = change % entities
+            hass.states.async_set(
+                f"sensor.benchmark_{index}", str(change // entities), attributes[index]
+            )
+            if change % 100 == 99:
+                max_backlog = max(max_backlog, instance.backlog)
+                # Give the event loop and the recorder thread a chance to run
+                await asyncio.sleep(
+                    max(0, start + (change + 1) / rate - timer()) if rate else 0
+                )
+        await _async_commit()
+        ingest = timer() - start
+        rss_growth = process.memory_info().rss - rss
+        states, db_size = await instance.async_add_executor_job(_db_stats)
+        print(
+            f"{'file' if file_backed else 'memory'}: {changes / ingest:.0f} states/s "
+            f"committed, max backlog {max_backlog}, "
+            f"memory growth {rss_growth / 1024 / 1024:.1f} MiB, "
+            f"{db_size / states * 10**6 / 1024 / 1024:.0f} MiB per million states"
+        )
+
+        period_start = period_start.replace(
+            minute=period_start.minute - period_start.minute % 5,
+            second=0,
+            microsecond=0,
+        )
+        start = timer()
+        # Compiling statistics writes the metadata in the recorder thread
+        instance.queue_task(StatisticsTask(period_start, False))
+        await _async_commit()
+        print(f"compile_statistics: {timer() - start:.3f}s")
+
+        purge_before = dt_util.utcnow()
+        start = timer()
+        # The purge runs in the recorder thread and queues itself again until
+        # all states are purged
+        instance.queue_task(PurgeTask(purge_before, False, False))
+        await _async_commit()
+        while (await instance.async_add_executor_job(_db_stats))[0]:
+            await _async_commit()
+        print(f"purge_old_data: {timer() - start:.3f}s for {states} states")
+    finally:
+        await hass.async_stop()
+        await hass.async_add_executor_job(shutil.rmtree, config_dir)
+    return ingest
+
+
+@benchmark
+async def recorder_ingest_memory(hass):
+    """Record state changes into an in-memory SQLite database."""
+    return await _recorder_ingest(hass, False)
+
+
+@benchmark
+async def recorder_ingest_file(hass):
+    """Record state changes into a file-backed SQLite database."""
+    return await _recorder_ingest(hass, True)
+
+
+@benchmark
+async def reduce_statistics(hass):
+    """Reduce three years of hourly statistics of 40 sensors to days, weeks and months.
+
+    This is what the yearly views of the energy dashboard request.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import statistics
+
+    hours = 3 * 365 * 24
+    period_start = dt_util.as_utc(
+        dt_util.start_of_local_day(dt_util.now() - timedelta(hours=hours))
+    ).timestamp()
+    stats = {}
+    for index in range(40):
+        rows = []
+        total = 0.0
+        for hour in range(hours):
+            start = period_start + hour * 3600
+            value = (index + hour) % 24 / 2
+            total += value
+            rows.append(
+                {
+                    "start": start,
+                    "end": start + 3600,
+                    "mean": value,
+                    "min": value - 1,
+                    "max": value + 1,
+                    "last_reset": None,
+                    "state": total,
+                    "sum": total,
+                }
+            )
+        stats[f"sensor.benchmark_{index}"] = rows
+    types = {"last_reset", "max", "mean", "min", "state", "sum"}
+
+    runtime = 0.0
+    for period, reduce in (
+        ("day", statistics._reduce_statistics_per_day),  # noqa: SLF001
+        ("week", statistics._reduce_statistics_per_week),  # noqa: SLF001
+        ("month", statistics._reduce_statistics_per_month),  # noqa: SLF001
+    ):
+        start = timer()
+        reduce(stats, types)
+        elapsed = timer() - start
+        print(f"{period}: {elapsed:.3f}s")
+        runtime += elapsed
+    return runtime
+
+
+@benchmark
+async def numeric_chunks_read(hass):
+    """Read a day of states of 20 sensors from the states rows and from chunks.
+
+    The states are recorded every 10 seconds with some jitter, and compacted
+    in chunks the way the recorder compacts them.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder import gorilla, numeric_chunks
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        States,
+        StatesNumericChunks,
+    )
+
+    # pylint: enable=import-outside-toplevel
+
+    entities = 20
+    samples = 24 * 360
+    start_ts = dt_util.utcnow().timestamp() // 86400 * 86400 - 86400
+    metadata_ids = list(range(1, entities + 1))
+    states = []
+    chunks = []
+    for metadata_id in metadata_ids:
+        rows = [
+            (
+                len(states) + index,
+                str(round(20 + (index * metadata_id) % 97 / 10, 1)),
+                start_ts + index * 10 + (index * 7919) % 1000 / 10**6,
+                None,
+                None,
+                None,
+            )
+            for index in range(samples)
+        ]
+        states.extend(
+            {"metadata_id": metadata_id, "state": state, "last_updated_ts": ts}
+            for _, state, ts, _, _, _ in rows
+        )
+        chunks.extend(
+            {
+                "metadata_id": metadata_id,
+                "start_ts": run.timestamps[0] / 10**6,
+                "end_ts": run.timestamps[-1] / 10**6,
+                "count": len(run.state_ids),
+                "flags": numeric_chunks.FLAG_INTEGERS if run.key[2] else 0,
+                "data": gorilla.encode(run.timestamps, run.values),
+            }
+            for run in numeric_chunks._runs_from_rows(rows)  # noqa: SLF001
+        )
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(States), states)
+        session.execute(insert(StatesNumericChunks), chunks)
+        session.commit()
+
+        start = timer()
+        rows = session.execute(
+            select(States.metadata_id, States.state, States.last_updated_ts)
+            .where(
+                States.metadata_id.in_(metadata_ids),
+                States.last_updated_ts > start_ts,
+            )
+            .order_by(States.metadata_id, States.last_updated_ts)
+        ).all()
+        states_read = timer() - start
+
+        start = timer()
+        chunk_rows = numeric_chunks.numeric_chunk_rows(
+            session, metadata_ids, start_ts, None, True
+        )
+        chunks_read = timer() - start
+    engine.dispose()
+
+    size = sum(len(chunk["data"]) for chunk in chunks)
+    print(
+        f"states: {states_read:.3f}s for {len(rows)} states, "
+        f"{states_read / len(rows) * 10**6:.2f}µs per state"
+    )
+    print(
+        f"chunks: {chunks_read:.3f}s for {len(chunk_rows)} states in "
+        f"{len(chunks)} chunks, {chunks_read / len(chunk_rows) * 10**6:.2f}µs "
+        f"per state, {size / len(chunk_rows):.1f} bytes per state"
+    )
+    return chunks_read
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
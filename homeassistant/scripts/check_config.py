@@ -181,10 +181,10 @@ def check(config_dir, secrets=False):
     }
 
     # pylint: disable-next=possibly-unused-variable
-    def mock_load(filename, secrets=None):
+    def mock_load(filename, secrets=None, cache=None):
         """Mock hass.util.load_yaml to save config file names."""
         res["yaml_files"][filename] = True
-        return MOCKS["load"][1](filename, secrets)
+        return MOCKS["load"][1](filename, secrets, cache)
 
     # pylint: disable-next=possibly-unused-variable
     def mock_secrets(ldr, node):
@@ -259,6 +259,7 @@ async def async_check_config(config_dir):
     await dr.async_load(hass)
     await er.async_load(hass)
     await ir.async_load(hass, read_only=True)
+    await loader.async_load_integration_index(hass, read_only=True)
     components = await async_check_ha_config_file(hass)
     await hass.async_stop(force=True)
     return components
@@ -11,7 +11,7 @@ from enum import StrEnum
 import logging.handlers
 import time
 from types import ModuleType
-from typing import Any, Final, TypedDict
+from typing import Any, Final, NamedTuple, TypedDict
 
 from . import config as conf_util, core, loader, requirements
 from .const import (
@@ -68,6 +68,14 @@ DATA_SETUP_STARTED = "setup_started"
 # indicating how time was spent setting up a component and each group (config entry).
 DATA_SETUP_TIME = "setup_time"
 
+# DATA_SETUP_TIMELINE is a list[SetupTimelineSpan] recording when each phase of
+# setting up a component and each group started and finished during startup.
+DATA_SETUP_TIMELINE = "setup_timeline"
+
+# DATA_SETUP_WAITED_ON is a dict[str, set[str]] of the dependencies and after
+# dependencies each component had to wait for during startup.
+DATA_SETUP_WAITED_ON = "setup_waited_on"
+
 DATA_DEPS_REQS = "deps_reqs_processed"
 
 DATA_PERSISTENT_ERRORS = "bootstrap_persistent_errors"
@@ -234,10 +242,19 @@ async def _async_process_dependencies(
             after_dependencies_tasks.keys(),
         )
 
-    async with hass.timeout.async_freeze(integration.domain):
-        results = await asyncio.gather(
-            *dependencies_tasks.values(), *after_dependencies_tasks.values()
-        )
+    if _should_track_setup(hass):
+        _setup_waited_on(hass)[integration.domain] = {
+            *dependencies_tasks,
+            *after_dependencies_tasks,
+        }
+
+    with async_record_setup_span(
+        hass, integration.domain, SetupPhases.WAIT_DEPENDENCIES
+    ):
+        async with hass.timeout.async_freeze(integration.domain):
+            results = await asyncio.gather(
+                *dependencies_tasks.values(), *after_dependencies_tasks.values()
+            )
 
     failed = [
         domain for idx, domain in enumerate(dependencies_tasks) if not results[idx]
@@ -313,7 +330,8 @@ async def _async_setup_component(  # noqa: C901
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = await integration.async_get_component()
+        with async_record_setup_span(hass, domain, SetupPhases.IMPORT):
+            component = await integration.async_get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", err)
         return False
@@ -664,6 +682,87 @@ class SetupPhases(StrEnum):
     """Wait time for the platforms to import."""
     WAIT_IMPORT_PACKAGES = "wait_import_packages"
     """Wait time for the packages to import."""
+    IMPORT = "import"
+    """Import of the component.
+
+    This is only recorded in the setup timeline.
+    """
+    WAIT_DEPENDENCIES = "wait_dependencies"
+    """Wait time for the dependencies and after dependencies to be set up.
+
+    This is only recorded in the setup timeline.
+    """
+    PRELOAD_STORAGE = "preload_storage"
+    """Preloading a storage file.
+
+    This is only recorded in the setup timeline.
+    """
+
+
+class SetupTimelineSpan(NamedTuple):
+    """A phase of setting up an integration recorded during startup."""
+
+    integration: str
+    group: str | None
+    phase: SetupPhases
+    start: float
+    end: float
+    details: Mapping[str, Any] | None = None
+
+
+def _should_track_setup(hass: core.HomeAssistant) -> bool:
+    """Return if setup times should be tracked."""
+    # Don't track setup times when we are shutting down or already running
+    # as we present the timings as "Integration startup time", and we
+    # don't want to add all the setup retry times to that.
+    return not hass.is_stopping and hass.state is not core.CoreState.running
+
+
+def _setup_timeline(hass: core.HomeAssistant) -> list[SetupTimelineSpan]:
+    """Return the setup timeline list."""
+    if DATA_SETUP_TIMELINE not in hass.data:
+        hass.data[DATA_SETUP_TIMELINE] = []
+    return hass.data[DATA_SETUP_TIMELINE]  # type: ignore[no-any-return]
+
+
+def _setup_waited_on(hass: core.HomeAssistant) -> dict[str, set[str]]:
+    """Return the dependencies each component waited on."""
+    if DATA_SETUP_WAITED_ON not in hass.data:
+        hass.data[DATA_SETUP_WAITED_ON] = {}
+    return hass.data[DATA_SETUP_WAITED_ON]  # type: ignore[no-any-return]
+
+
+@callback
+def async_add_setup_timeline_span(
+    hass: core.HomeAssistant, span: SetupTimelineSpan
+) -> None:
+    """Add a span which was measured elsewhere to the setup timeline."""
+    if _should_track_setup(hass):
+        _setup_timeline(hass).append(span)
+
+
+@contextlib.contextmanager
+def async_record_setup_span(
+    hass: core.HomeAssistant,
+    integration: str,
+    phase: SetupPhases,
+    group: str | None = None,
+) -> Generator[None, None, None]:
+    """Record a phase of setting up an integration in the setup timeline.
+
+    Unlike async_start_setup, this does not affect the setup timings.
+    """
+    if not _should_track_setup(hass):
+        yield
+        return
+
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        _setup_timeline(hass).append(
+            SetupTimelineSpan(integration, group, phase, started, time.monotonic())
+        )
 
 
 def _setup_started(
@@ -699,8 +798,12 @@ def async_pause_setup(
     try:
         yield
     finally:
-        time_taken = time.monotonic() - started
+        finished = time.monotonic()
+        time_taken = finished - started
         integration, group = running
+        _setup_timeline(hass).append(
+            SetupTimelineSpan(integration, group, phase, started, finished)
+        )
         # Add negative time for the time we waited
         _setup_times(hass)[integration][group][phase] = -time_taken
         _LOGGER.debug(
@@ -740,10 +843,7 @@ def async_start_setup(
       A group is a group of setups that run in parallel.
 
     """
-    if hass.is_stopping or hass.state is core.CoreState.running:
-        # Don't track setup times when we are shutting down or already running
-        # as we present the timings as "Integration startup time", and we
-        # don't want to add all the setup retry times to that.
+    if not _should_track_setup(hass):
         yield
         return
 
@@ -763,8 +863,12 @@ def async_start_setup(
     try:
         yield
     finally:
-        time_taken = time.monotonic() - started
+        finished = time.monotonic()
+        time_taken = finished - started
         del setup_started[current]
+        _setup_timeline(hass).append(
+            SetupTimelineSpan(integration, group, phase, started, finished)
+        )
         group_setup_times = _setup_times(hass)[integration][group]
         # We may see the phase multiple times if there are multiple
         # platforms, but we only care about the longest time.
@@ -807,3 +911,108 @@ def async_get_setup_timings(hass: core.HomeAssistant) -> dict[str, float]:
         domain_timings[domain] = total_top_level + group_max
 
     return domain_timings
+
+
+@callback
+def async_get_setup_timeline(hass: core.HomeAssistant) -> list[SetupTimelineSpan]:
+    """Return the recorded setup timeline ordered by start time."""
+    return sorted(_setup_timeline(hass), key=lambda span: span.start)
+
+
+@callback
+def async_get_setup_critical_path(
+    hass: core.HomeAssistant,
+) -> list[dict[str, Any]]:
+    """Return the chain of integrations that determined the startup time.
+
+    Starting from the integration that finished setting up last, the
+    dependency it waited on that finished last is followed until an
+    integration is reached that did not wait on any dependency.
+    """
+    timeline = _setup_timeline(hass)
+    if not timeline:
+        return []
+
+    origin = min(span.start for span in timeline)
+    domain_start: dict[str, float] = {}
+    domain_end: dict[str, float] = {}
+    domain_phases: defaultdict[str, defaultdict[str, float]] = defaultdict(
+        lambda: defaultdict(float)
+    )
+    for span in timeline:
+        if span.phase is SetupPhases.PRELOAD_STORAGE:
+            continue
+        domain = span.integration
+        domain_start[domain] = min(domain_start.get(domain, span.start), span.start)
+        domain_end[domain] = max(domain_end.get(domain, span.end), span.end)
+        domain_phases[domain][span.phase] += span.end - span.start
+
+    if not domain_end:
+        return []
+
+    waited_on = _setup_waited_on(hass)
+    path: list[str] = []
+    current: str | None = max(domain_end, key=domain_end.__getitem__)
+    while current is not None and current not in path:
+        path.append(current)
+        if waited_for := [
+            dep for dep in waited_on.get(current, ()) if dep in domain_end
+        ]:
+            current = max(waited_for, key=domain_end.__getitem__)
+        else:
+            current = None
+
+    return [
+        {
+            "domain": domain,
+            "start": domain_start[domain] - origin,
+            "end": domain_end[domain] - origin,
+            "phases": dict(domain_phases[domain]),
+        }
+        for domain in reversed(path)
+    ]
+
+
+@callback
+def async_get_setup_trace_events(hass: core.HomeAssistant) -> dict[str, Any]:
+    """Return the setup timeline in the Trace Event Format.
+
+    The result can be loaded in chrome://tracing or Perfetto.
+    """
+    timeline = async_get_setup_timeline(hass)
+    if not timeline:
+        return {"traceEvents": [], "displayTimeUnit": "ms"}
+
+    origin = timeline[0].start
+    thread_ids: dict[str, int] = {}
+    trace_events: list[dict[str, Any]] = []
+    for span in timeline:
+        if (tid := thread_ids.get(span.integration)) is None:
+            tid = thread_ids[span.integration] = len(thread_ids) + 1
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": span.integration},
+                }
+            )
+        trace_events.append(
+            {
+                "name": span.phase.value,
+                "cat": "setup",
+                "ph": "X",
+                "ts": round((span.start - origin) * 1_000_000),
+                "dur": round((span.end - span.start) * 1_000_000),
+                "pid": 1,
+                "tid": tid,
+                "args": {
+                    "integration": span.integration,
+                    "group": span.group,
+                    **(span.details or {}),
+                },
+            }
+        )
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
@@ -0,0 +1,111 @@
+"""Compact columnar encoding of JSON data.
+
+Lists of dicts which all have the same keys, like the entries of the
+registries, are stored as one list per key instead of repeating the keys
+for every item. String columns with many repeated values, like the platform
+or the config entry id, are stored as indexes into a table of interned
+strings. The encoding round trips losslessly to the JSON of the original data.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+
+ENCODING_COMPACT = "compact"
+
+# Intern the strings of a column if it has at most this
+# fraction of distinct values
+INTERN_MAX_DISTINCT_RATIO = 0.5
+
+
+def _table_rows(value: Any) -> tuple[tuple[str, ...], list[Mapping[str, Any]]] | None:
+    """Return the keys and the items if the value can be stored as a table.
+
+    Items which are already serialized as JSON fragments are parsed.
+    """
+    if not isinstance(value, list) or not value:
+        return None
+    rows = (
+        orjson.loads(orjson.dumps(value))
+        if any(isinstance(item, orjson.Fragment) for item in value)
+        else value
+    )
+    first = rows[0]
+    if not isinstance(first, Mapping):
+        return None
+    columns = tuple(first)
+    for row in rows:
+        if not isinstance(row, Mapping) or tuple(row) != columns:
+            return None
+    return columns, rows
+
+
+def _should_intern(column: list[Any]) -> bool:
+    """Return if the strings of the column should be interned."""
+    try:
+        distinct = set(column)
+    except TypeError:
+        # The column contains lists or dicts
+        return False
+    distinct.discard(None)
+    if not distinct or not all(isinstance(value, str) for value in distinct):
+        return False
+    count = len(column) - column.count(None)
+    return len(distinct) <= count * INTERN_MAX_DISTINCT_RATIO
+
+
+def encode(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Encode the top level values of the data in the compact format."""
+    strings: list[str] = []
+    string_index: dict[str, int] = {}
+    items: dict[str, Any] = {}
+
+    def _intern(value: str | None) -> int | None:
+        if value is None:
+            return None
+        if (index := string_index.get(value)) is None:
+            index = string_index[value] = len(strings)
+            strings.append(str(value))
+        return index
+
+    for key, value in data.items():
+        if (table := _table_rows(value)) is None:
+            items[key] = {"value": value}
+            continue
+        columns, rows = table
+        values: list[list[Any]] = []
+        interned: list[str] = []
+        for column in columns:
+            column_values = [row[column] for row in rows]
+            if _should_intern(column_values):
+                interned.append(column)
+                column_values = [_intern(item) for item in column_values]
+            values.append(column_values)
+        items[key] = {"columns": columns, "interned": interned, "values": values}
+
+    return {"strings": strings, "items": items}
+
+
+def decode(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Decode data encoded in the compact format."""
+    strings: list[str] = data["strings"]
+    decoded: dict[str, Any] = {}
+
+    for key, item in data["items"].items():
+        if "value" in item:
+            decoded[key] = item["value"]
+            continue
+        columns: list[str] = item["columns"]
+        interned = set(item["interned"])
+        values = [
+            [None if index is None else strings[index] for index in column_values]
+            if column in interned
+            else column_values
+            for column, column_values in zip(columns, item["values"], strict=True)
+        ]
+        decoded[key] = [dict(zip(columns, row, strict=True)) for row in zip(*values)]
+
+    return decoded
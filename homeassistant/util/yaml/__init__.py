@@ -4,6 +4,7 @@ from .const import SECRET_YAML
 from .dumper import dump, save_yaml
 from .input import UndefinedSubstitution, extract_inputs, substitute
 from .loader import (
+    ParsedYamlCache,
     Secrets,
     YamlTypeError,
     load_yaml,
@@ -18,6 +19,7 @@ __all__ = [
     "Input",
     "dump",
     "save_yaml",
+    "ParsedYamlCache",
     "Secrets",
     "YamlTypeError",
     "load_yaml",
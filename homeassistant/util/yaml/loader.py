@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 import fnmatch
+import hashlib
 from io import StringIO, TextIOWrapper
 import logging
+import math
 import os
 from pathlib import Path
-from typing import Any, TextIO, TypeVar, overload
+import threading
+from typing import Any, Literal, TextIO, TypeVar, overload
 
 import yaml
 
@@ -22,7 +27,7 @@ except ImportError:
         SafeLoader as FastestAvailableSafeLoader,
     )
 
-from functools import cached_property
+from functools import cached_property, partial
 
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.frame import report
@@ -34,9 +39,17 @@ from .objects import Input, NodeDictClass, NodeListClass, NodeStrClass
 
 JSON_TYPE = list | dict | str
 _DictT = TypeVar("_DictT", bound=dict)
+_T = TypeVar("_T")
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of files of included directories which are loaded concurrently
+INCLUDE_DIR_MAX_WORKERS = 8
+
+# Files with these tags are not cached because their parsed content
+# does not only depend on the content of the file itself
+_UNCACHEABLE_TAGS = ("!include", "!secret", "!env_var")
+
 
 class YamlTypeError(HomeAssistantError):
     """Raised by load_yaml_dict if top level data is not a dict."""
@@ -49,6 +62,7 @@ class Secrets:
         """Initialize secrets."""
         self.config_dir = config_dir
         self._cache: dict[Path, dict[str, str]] = {}
+        self._lock = threading.Lock()
 
     def get(self, requester_path: str, secret: str) -> str:
         """Return the value of a secret."""
@@ -77,9 +91,14 @@ class Secrets:
         raise HomeAssistantError(f"Secret {secret} not defined")
 
     def _load_secret_yaml(self, secret_dir: Path) -> dict[str, str]:
-        """Load the secrets yaml from path."""
-        if (secret_path := secret_dir / SECRET_YAML) in self._cache:
-            return self._cache[secret_path]
+        """Load the secrets yaml from path.
+
+        This method is thread safe.
+        """
+        secret_path = secret_dir / SECRET_YAML
+        with self._lock:
+            if secret_path in self._cache:
+                return self._cache[secret_path]
 
         _LOGGER.debug("Loading %s", secret_path)
         try:
@@ -104,9 +123,10 @@ class Secrets:
         except FileNotFoundError:
             secrets = {}
 
-        self._cache[secret_path] = secrets
-
-        return secrets
+        # The lock is not held while loading because the secrets file could
+        # include files which need secrets, another thread may have won
+        with self._lock:
+            return self._cache.setdefault(secret_path, secrets)
 
 
 class _LoaderMixin:
@@ -129,7 +149,12 @@ class _LoaderMixin:
 class FastSafeLoader(FastestAvailableSafeLoader, _LoaderMixin):
     """The fastest available safe loader, either C or Python."""
 
-    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        cache: ParsedYamlCache | None = None,
+    ) -> None:
         """Initialize a safe line loader."""
         self.stream = stream
 
@@ -143,6 +168,7 @@ class FastSafeLoader(FastestAvailableSafeLoader, _LoaderMixin):
 
         super().__init__(stream)
         self.secrets = secrets
+        self.cache = cache
 
 
 class SafeLoader(FastSafeLoader):
@@ -179,10 +205,16 @@ class SafeLoader(FastSafeLoader):
 class PythonSafeLoader(yaml.SafeLoader, _LoaderMixin):
     """Python safe loader."""
 
-    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        cache: ParsedYamlCache | None = None,
+    ) -> None:
         """Initialize a safe line loader."""
         super().__init__(stream)
         self.secrets = secrets
+        self.cache = cache
 
 
 class SafeLineLoader(PythonSafeLoader):
@@ -220,10 +252,32 @@ LoaderType = FastSafeLoader | PythonSafeLoader
 
 
 def load_yaml(
-    fname: str | os.PathLike[str], secrets: Secrets | None = None
+    fname: str | os.PathLike[str],
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> JSON_TYPE | None:
     """Load a YAML file."""
+    if _include_dir_pool.get() is not None:
+        return _load_yaml(fname, secrets, cache)
+    # The files of the included directories of this load share one pool
+    pool = _IncludeDirPool()
+    token = _include_dir_pool.set(pool)
+    try:
+        return _load_yaml(fname, secrets, cache)
+    finally:
+        _include_dir_pool.reset(token)
+        pool.shutdown()
+
+
+def _load_yaml(
+    fname: str | os.PathLike[str],
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
+) -> JSON_TYPE | None:
+    """Load a YAML file on the pool of the current load."""
     try:
+        if cache is not None:
+            return cache.load(fname, secrets)
         with open(fname, encoding="utf-8") as conf_file:
             return parse_yaml(conf_file, secrets)
     except UnicodeDecodeError as exc:
@@ -232,14 +286,16 @@ def load_yaml(
 
 
 def load_yaml_dict(
-    fname: str | os.PathLike[str], secrets: Secrets | None = None
+    fname: str | os.PathLike[str],
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> dict:
     """Load a YAML file and ensure the top level is a dict.
 
     Raise if the top level is not a dict.
     Return an empty dict if the file is empty.
     """
-    loaded_yaml = load_yaml(fname, secrets)
+    loaded_yaml = load_yaml(fname, secrets, cache)
     if loaded_yaml is None:
         loaded_yaml = {}
     if not isinstance(loaded_yaml, dict):
@@ -248,28 +304,32 @@ def load_yaml_dict(
 
 
 def parse_yaml(
-    content: str | TextIO | StringIO, secrets: Secrets | None = None
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> JSON_TYPE:
     """Parse YAML with the fastest available loader."""
     if not HAS_C_LOADER:
-        return _parse_yaml_python(content, secrets)
+        return _parse_yaml_python(content, secrets, cache)
     try:
-        return _parse_yaml(FastSafeLoader, content, secrets)
+        return _parse_yaml(FastSafeLoader, content, secrets, cache)
     except yaml.YAMLError:
         # Loading failed, so we now load with the Python loader which has more
         # readable exceptions
         if isinstance(content, (StringIO, TextIO, TextIOWrapper)):
             # Rewind the stream so we can try again
             content.seek(0, 0)
-        return _parse_yaml_python(content, secrets)
+        return _parse_yaml_python(content, secrets, cache)
 
 
 def _parse_yaml_python(
-    content: str | TextIO | StringIO, secrets: Secrets | None = None
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> JSON_TYPE:
     """Parse YAML with the python loader (this is very slow)."""
     try:
-        return _parse_yaml(PythonSafeLoader, content, secrets)
+        return _parse_yaml(PythonSafeLoader, content, secrets, cache)
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc) from exc
@@ -279,9 +339,155 @@ def _parse_yaml(
     loader: type[FastSafeLoader] | type[PythonSafeLoader],
     content: str | TextIO,
     secrets: Secrets | None = None,
+    cache: ParsedYamlCache | None = None,
 ) -> JSON_TYPE:
     """Load a YAML file."""
-    return yaml.load(content, Loader=lambda stream: loader(stream, secrets))  # type: ignore[arg-type]
+    return yaml.load(content, Loader=lambda stream: loader(stream, secrets, cache))  # type: ignore[arg-type]
+
+
+class _NamedStringIO(StringIO):
+    """StringIO with the name of the file it was read from."""
+
+    def __init__(self, content: str, name: str) -> None:
+        """Initialize the stream."""
+        super().__init__(content)
+        self.name = name
+
+
+class _UncacheableError(Exception):
+    """Raised when parsed YAML can't be stored in the cache."""
+
+
+def _encode_node(obj: Any) -> Any:
+    """Encode parsed YAML, including the line numbers, as JSON compatible data."""
+    if obj is None or isinstance(obj, (bool, int)):
+        return obj
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise _UncacheableError
+        return obj
+    if isinstance(obj, Input):
+        return ["i", obj.name]
+    if (line := getattr(obj, "__line__", None)) is None:
+        raise _UncacheableError
+    if isinstance(obj, NodeStrClass):
+        return ["s", line, str(obj)]
+    if isinstance(obj, NodeListClass):
+        return ["l", line, [_encode_node(item) for item in obj]]
+    if isinstance(obj, NodeDictClass):
+        items: list[Any] = []
+        for key, value in obj.items():
+            items.append(_encode_node(key))
+            items.append(_encode_node(value))
+        return ["d", line, items]
+    raise _UncacheableError
+
+
+def _decode_node(encoded: Any, config_file: str) -> Any:
+    """Decode parsed YAML encoded by _encode_node."""
+    if not isinstance(encoded, list):
+        return encoded
+    kind = encoded[0]
+    obj: NodeStrClass | NodeListClass | NodeDictClass
+    if kind == "i":
+        return Input(encoded[1])
+    if kind == "s":
+        obj = NodeStrClass(encoded[2])
+    elif kind == "l":
+        obj = NodeListClass(_decode_node(item, config_file) for item in encoded[2])
+    else:
+        items = encoded[2]
+        obj = NodeDictClass(
+            (
+                _decode_node(items[idx], config_file),
+                _decode_node(items[idx + 1], config_file),
+            )
+            for idx in range(0, len(items), 2)
+        )
+    setattr(obj, "__config_file__", config_file)
+    setattr(obj, "__line__", encoded[1])
+    return obj
+
+
+class ParsedYamlCache:
+    """Cache of parsed YAML files keyed by a hash of their content.
+
+    Files which include other files, secrets or environment variables are
+    always parsed. The cached nodes keep their line numbers, a hit returns
+    the same result as parsing the file again.
+    """
+
+    def __init__(self, entries: dict[str, Any] | None = None) -> None:
+        """Initialize the cache."""
+        self._entries: dict[str, Any] = entries or {}
+        self.hits = 0
+        self.misses = 0
+        self._used: set[str] = set()
+        self._changed = False
+        self._lock = threading.Lock()
+
+    def load(self, fname: str | os.PathLike[str], secrets: Secrets | None) -> Any:
+        """Load a YAML file from the cache or parse it.
+
+        This method is thread safe.
+        """
+        with open(fname, encoding="utf-8") as conf_file:
+            content = conf_file.read()
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            if hit := key in self._entries:
+                encoded = self._entries[key]
+                self._used.add(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            return _decode_node(encoded, os.fspath(fname))
+
+        parsed = parse_yaml(_NamedStringIO(content, os.fspath(fname)), secrets, self)
+        if any(tag in content for tag in _UNCACHEABLE_TAGS):
+            return parsed
+        try:
+            encoded = _encode_node(parsed)
+        except _UncacheableError:
+            return parsed
+        with self._lock:
+            self._entries[key] = encoded
+            self._used.add(key)
+            self._changed = True
+        return parsed
+
+    @property
+    def entries(self) -> dict[str, Any]:
+        """Return a copy of the entries.
+
+        This method is thread safe.
+        """
+        with self._lock:
+            return dict(self._entries)
+
+    @entries.setter
+    def entries(self, entries: dict[str, Any]) -> None:
+        """Replace the entries.
+
+        This method is thread safe.
+        """
+        with self._lock:
+            self._entries = dict(entries)
+
+    def prune(self) -> bool:
+        """Remove the entries not used since the last prune.
+
+        Return if the entries changed since the last prune.
+        """
+        with self._lock:
+            if len(self._used) != len(self._entries):
+                self._entries = {key: self._entries[key] for key in self._used}
+                self._changed = True
+            changed = self._changed
+            self._used = set()
+            self._changed = False
+        return changed
 
 
 @overload
@@ -331,7 +537,7 @@ def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """
     fname = os.path.join(os.path.dirname(loader.get_name), node.value)
     try:
-        loaded_yaml = load_yaml(fname, loader.secrets)
+        loaded_yaml = load_yaml(fname, loader.secrets, loader.cache)
         if loaded_yaml is None:
             loaded_yaml = NodeDictClass()
         return _add_reference(loaded_yaml, loader, node)
@@ -356,15 +562,80 @@ def _find_files(directory: str, pattern: str) -> Iterator[str]:
                 yield filename
 
 
+class _IncludeDirPool:
+    """Thread pool shared by the included directories of a top level load.
+
+    The threads are only started when a directory with several files is
+    included. Directories included by a file which is loaded on the pool
+    are loaded by the same worker, so a load never uses more than
+    INCLUDE_DIR_MAX_WORKERS threads and the workers never wait on each other.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self._executor: ThreadPoolExecutor | None = None
+
+    def map(self, func: Callable[[str], _T], fnames: list[str]) -> list[_T]:
+        """Call the function for each file on the pool and return the results."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=INCLUDE_DIR_MAX_WORKERS,
+                thread_name_prefix="yaml_include_dir",
+            )
+        return list(self._executor.map(partial(_call_on_pool, func), fnames))
+
+    def shutdown(self) -> None:
+        """Shut down the pool if it was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def _call_on_pool(func: Callable[[str], _T], fname: str) -> _T:
+    """Call the function on a worker of the pool."""
+    token = _include_dir_pool.set(False)
+    try:
+        return func(fname)
+    finally:
+        _include_dir_pool.reset(token)
+
+
+# The pool of the current top level load, False while loading on the pool
+_include_dir_pool: ContextVar[_IncludeDirPool | Literal[False] | None] = ContextVar(
+    "_include_dir_pool", default=None
+)
+
+
+def _load_yaml_files(loader: LoaderType, fnames: list[str]) -> list[JSON_TYPE | None]:
+    """Load the YAML files of an included directory in order.
+
+    The files are read and parsed concurrently if there are several and
+    the directory is not included by a file which is loaded concurrently.
+    """
+
+    def _load(fname: str) -> JSON_TYPE | None:
+        return _load_yaml(fname, loader.secrets, loader.cache)
+
+    if len(fnames) < 2 or not (pool := _include_dir_pool.get()):
+        return [_load(fname) for fname in fnames]
+    return pool.map(_load, fnames)
+
+
+def _find_included_files(loader: LoaderType, node: yaml.nodes.Node) -> list[str]:
+    """Return the YAML files of an included directory, except the secrets."""
+    loc = os.path.join(os.path.dirname(loader.get_name), node.value)
+    return [
+        fname
+        for fname in _find_files(loc, "*.yaml")
+        if os.path.basename(fname) != SECRET_YAML
+    ]
+
+
 def _include_dir_named_yaml(loader: LoaderType, node: yaml.nodes.Node) -> NodeDictClass:
     """Load multiple files from directory as a dictionary."""
     mapping = NodeDictClass()
-    loc = os.path.join(os.path.dirname(loader.get_name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    fnames = _find_included_files(loader, node)
+    for fname, loaded_yaml in zip(fnames, _load_yaml_files(loader, fnames)):
         filename = os.path.splitext(os.path.basename(fname))[0]
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
         if loaded_yaml is None:
             # Special case, an empty file included by !include_dir_named is treated
             # as an empty dictionary
@@ -378,11 +649,7 @@ def _include_dir_merge_named_yaml(
 ) -> NodeDictClass:
     """Load multiple files from directory as a merged dictionary."""
     mapping = NodeDictClass()
-    loc = os.path.join(os.path.dirname(loader.get_name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+    for loaded_yaml in _load_yaml_files(loader, _find_included_files(loader, node)):
         if isinstance(loaded_yaml, dict):
             mapping.update(loaded_yaml)
     return _add_reference(mapping, loader, node)
@@ -392,12 +659,10 @@ def _include_dir_list_yaml(
     loader: LoaderType, node: yaml.nodes.Node
 ) -> list[JSON_TYPE]:
     """Load multiple files from directory as a list."""
-    loc = os.path.join(os.path.dirname(loader.get_name), node.value)
     return [
         loaded_yaml
-        for f in _find_files(loc, "*.yaml")
-        if os.path.basename(f) != SECRET_YAML
-        and (loaded_yaml := load_yaml(f, loader.secrets)) is not None
+        for loaded_yaml in _load_yaml_files(loader, _find_included_files(loader, node))
+        if loaded_yaml is not None
     ]
 
 
@@ -405,12 +670,8 @@ def _include_dir_merge_list_yaml(
     loader: LoaderType, node: yaml.nodes.Node
 ) -> JSON_TYPE:
     """Load multiple files from directory as a merged list."""
-    loc: str = os.path.join(os.path.dirname(loader.get_name), node.value)
     merged_list: list[JSON_TYPE] = []
-    for fname in _find_files(loc, "*.yaml"):
-        if os.path.basename(fname) == SECRET_YAML:
-            continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+    for loaded_yaml in _load_yaml_files(loader, _find_included_files(loader, node)):
         if isinstance(loaded_yaml, list):
             merged_list.extend(loaded_yaml)
     return _add_reference(merged_list, loader, node)
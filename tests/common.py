@@ -903,6 +903,12 @@ class MockEntityPlatform(entity_platform.EntityPlatform):
         # Otherwise the constructor will blow up.
         if isinstance(platform, Mock) and isinstance(platform.PARALLEL_UPDATES, Mock):
             platform.PARALLEL_UPDATES = 0
+        if isinstance(platform, Mock) and isinstance(
+            platform.PARALLEL_SERVICE_CALLS, Mock
+        ):
+            platform.PARALLEL_SERVICE_CALLS = 0
+        if isinstance(platform, Mock) and isinstance(platform.async_handle_batch, Mock):
+            platform.async_handle_batch = None
 
         super().__init__(
             hass=hass,
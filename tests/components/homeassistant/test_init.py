@@ -46,6 +46,7 @@ from tests.common import (
     async_mock_service,
     get_test_home_assistant,
     mock_service,
+    mock_storage,
     patch_yaml_files,
 )
 
@@ -120,6 +121,8 @@ class TestComponentsCore(unittest.TestCase):
 
     def setUp(self):
         """Set up things to be run when tests are started."""
+        self._storage = mock_storage()
+        self._storage.__enter__()
         self._manager = get_test_home_assistant()
         self.hass = self._manager.__enter__()
         assert asyncio.run_coroutine_threadsafe(
@@ -133,6 +136,7 @@ class TestComponentsCore(unittest.TestCase):
         """Tear down hass object."""
         self.hass.stop()
         self._manager.__exit__(None, None, None)
+        self._storage.__exit__(None, None, None)
 
     def test_is_on(self):
         """Test is_on method."""
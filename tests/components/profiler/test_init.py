@@ -18,6 +18,7 @@ from homeassistant.components.profiler import (
     CONF_ENABLED,
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_DUMP_SETUP_TIMELINE,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
@@ -33,7 +34,9 @@ from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import SetupPhases, SetupTimelineSpan
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import load_json_object
 
 from tests.common import MockConfigEntry, async_fire_time_changed
 
@@ -100,6 +103,58 @@ async def test_memory_usage(hass: HomeAssistant, tmp_path: Path) -> None:
     await hass.async_block_till_done()
 
 
+async def test_dump_setup_timeline(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test we can write the setup timeline."""
+    test_dir = tmp_path / "profiles"
+    test_dir.mkdir()
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_DUMP_SETUP_TIMELINE)
+
+    last_filename = None
+
+    def _mock_path(filename: str) -> str:
+        nonlocal last_filename
+        last_filename = str(test_dir / filename)
+        return last_filename
+
+    with (
+        patch(
+            "homeassistant.setup._setup_timeline",
+            return_value=[
+                SetupTimelineSpan("http", None, SetupPhases.SETUP, 10.0, 11.0),
+            ],
+        ),
+        patch.object(hass.config, "path", _mock_path),
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_DUMP_SETUP_TIMELINE, {}, blocking=True
+        )
+
+    timeline = load_json_object(last_filename)
+    assert timeline["otherData"]["critical_path"] == [
+        {"domain": "http", "start": 0.0, "end": 1.0, "phases": {"setup": 1.0}}
+    ]
+    assert timeline["traceEvents"][1] == {
+        "name": "setup",
+        "cat": "setup",
+        "ph": "X",
+        "ts": 0,
+        "dur": 1000000,
+        "pid": 1,
+        "tid": 1,
+        "args": {"integration": "http", "group": None},
+    }
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
 async def test_object_growth_logging(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
@@ -6,6 +6,7 @@ from collections.abc import Callable
 from copy import copy
 from datetime import datetime, timedelta
 import json
+from typing import Any
 from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
@@ -22,7 +23,7 @@ from homeassistant.components.recorder.db_schema import (
     StatesMeta,
 )
 from homeassistant.components.recorder.filters import Filters
-from homeassistant.components.recorder.history import legacy
+from homeassistant.components.recorder.history import legacy, modern
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.models.legacy import (
     LegacyLazyState,
@@ -590,6 +591,38 @@ def test_get_significant_states_minimal_response(
     )
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+def test_stream_significant_states(
+    hass_recorder: Callable[..., HomeAssistant], minimal_response: bool
+) -> None:
+    """Test streamed states are the same as the compressed significant states."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    hist = history.get_significant_states(
+        hass,
+        zero,
+        four,
+        entity_ids=list(states),
+        minimal_response=minimal_response,
+        compressed_state_format=True,
+    )
+    streamed: dict[str, list[dict[str, Any]]] = {}
+    with patch.object(modern, "STREAM_BATCH_SIZE", 2):
+        for entity_id, batch in history.stream_significant_states(
+            hass,
+            zero,
+            four,
+            list(states),
+            minimal_response=minimal_response,
+        ):
+            assert 0 < len(batch) <= 2
+            # The batches of an entity are consecutive
+            assert entity_id not in streamed or list(streamed)[-1] == entity_id
+            streamed.setdefault(entity_id, []).extend(batch)
+    assert any(len(entity_states) > 2 for entity_states in streamed.values())
+    assert streamed == hist
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 def test_get_significant_states_with_initial(
     time_zone, hass_recorder: Callable[..., HomeAssistant]
@@ -0,0 +1,198 @@
+"""The tests for the downsampled history tiers."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import StatesMeta, StatesTiers
+from homeassistant.components.recorder.history_tiers import (
+    HistoryTiersManager,
+    tier_period_for_resolution,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import WebSocketGenerator
+
+
+async def _add_test_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, start: datetime
+) -> None:
+    """Add states in two minutes and a state sixteen minutes later."""
+    for seconds, power, mode in (
+        (10, "1", "off"),
+        (20, "5", "on"),
+        (30, "3", "off"),
+        (70, "unavailable", "on"),
+        (80, "2", "on"),
+        (990, "7", "off"),
+    ):
+        freezer.move_to(start + timedelta(seconds=seconds))
+        hass.states.async_set("sensor.power", power)
+        hass.states.async_set("sensor.mode", mode)
+        await async_wait_recording_done(hass)
+
+
+def _next_period(period: timedelta) -> datetime:
+    """Return the start of the next period, which is after the recorder run started."""
+    now = dt_util.utcnow()
+    return now - (now - dt_util.utc_from_timestamp(0)) % period + period
+
+
+def test_tier_period_for_resolution() -> None:
+    """Test the coarsest tier finer than the resolution is used."""
+    assert tier_period_for_resolution(30) is None
+    assert tier_period_for_resolution(60) == 60
+    assert tier_period_for_resolution(600) == 60
+    assert tier_period_for_resolution(3600) == 900
+
+
+def test_history_tiers_flushed_again_after_rollback() -> None:
+    """Test the ended periods of a session that was rolled back are flushed again."""
+    recorder = MagicMock()
+    recorder.states_meta_manager.get_many.return_value = {"sensor.power": 1}
+    manager = HistoryTiersManager(recorder)
+    start = dt_util.utc_from_timestamp(3600)
+    for seconds, power in ((10, "1"), (20, "5")):
+        new_state = State(
+            "sensor.power", power, last_updated=start + timedelta(seconds=seconds)
+        )
+        manager.add_event(Event(EVENT_STATE_CHANGED, {"new_state": new_state}))
+
+    def _flushed(session: MagicMock) -> list[tuple[int, float, float | None]]:
+        return [
+            (row.period, row.start_ts, row.max)
+            for (row,), _ in session.add.call_args_list
+        ]
+
+    now_ts = start.timestamp() + 900
+    session = MagicMock()
+    manager.flush(session, now_ts)
+    expected = [(60, 3600.0, 5.0), (900, 3600.0, 5.0)]
+    assert _flushed(session) == expected
+
+    manager.reset()
+    assert manager.flushed_until(60) is None
+
+    session = MagicMock()
+    manager.flush(session, now_ts)
+    assert _flushed(session) == expected
+    manager.post_commit()
+    assert manager.flushed_until(60) == now_ts
+
+    session = MagicMock()
+    manager.flush(session, now_ts + 60)
+    manager.reset()
+    manager.flush(session, now_ts + 60)
+    assert _flushed(session) == []
+
+
+@pytest.mark.parametrize("recorder_config", [{"history_tiers": True}])
+async def test_history_tiers_recorded(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the ended periods are written with the minimum, maximum and last state."""
+    start = _next_period(timedelta(minutes=15))
+    freezer.move_to(start)
+    await _add_test_states(hass, freezer, start)
+
+    with session_scope(hass=hass) as session:
+        rows = [
+            (entity_id, row.period, row.start_ts, row.min, row.max, row.state)
+            for row, entity_id in session.query(StatesTiers, StatesMeta.entity_id)
+            .join(StatesMeta, StatesTiers.metadata_id == StatesMeta.metadata_id)
+            .order_by(StatesMeta.entity_id, StatesTiers.period, StatesTiers.start_ts)
+        ]
+    start_ts = start.timestamp()
+    assert rows == [
+        ("sensor.mode", 60, start_ts, None, None, "off"),
+        ("sensor.mode", 60, start_ts + 60, None, None, "on"),
+        ("sensor.mode", 900, start_ts, None, None, "on"),
+        ("sensor.power", 60, start_ts, 1.0, 5.0, "3"),
+        ("sensor.power", 60, start_ts + 60, 2.0, 2.0, "2"),
+        ("sensor.power", 900, start_ts, 1.0, 5.0, "2"),
+    ]
+    assert recorder_mock.history_tiers_recorded
+
+    # The entity_ids are kept until their tiers are purged
+    def _purge(purge_before: datetime) -> None:
+        while not purge_old_data(recorder_mock, purge_before, False):
+            pass
+
+    await recorder_mock.async_add_executor_job(_purge, start + timedelta(seconds=990))
+    with session_scope(hass=hass) as session:
+        assert session.query(StatesTiers).count() == 0
+        assert session.query(StatesMeta).count() == 2
+
+
+@pytest.mark.parametrize("recorder_config", [{"history_tiers": True}])
+async def test_history_during_period_resolution(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history_during_period reads the tier matching the resolution."""
+    # The access token of the websocket client is valid for 30 minutes
+    start = _next_period(timedelta(minutes=1)) + timedelta(minutes=1)
+    freezer.move_to(start - timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "0", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+    await _add_test_states(hass, freezer, start)
+    await async_setup_component(hass, "history", {})
+    client = await hass_ws_client()
+    start_ts = start.timestamp()
+
+    await client.send_json_auto_id(
+        {
+            "type": "history/history_during_period",
+            "start_time": (start - timedelta(seconds=30)).isoformat(),
+            "entity_ids": ["sensor.power"],
+            "resolution": 60,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.power": [
+            {
+                "s": "0",
+                "a": {"unit_of_measurement": "W"},
+                "lu": start_ts - 30,
+            },
+            {"s": "3", "lu": start_ts + 30, "min": 1.0, "max": 5.0},
+            {"s": "2", "lu": start_ts + 80, "min": 2.0, "max": 2.0},
+            {"s": "7", "lu": start_ts + 990},
+        ]
+    }
+
+    # A resolution finer than the tiers returns the states
+    await client.send_json_auto_id(
+        {
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "minimal_response": True,
+            "no_attributes": True,
+            "resolution": 10,
+        }
+    )
+    response = await client.receive_json()
+    assert [state["s"] for state in response["result"]["sensor.power"]] == [
+        "0",
+        "1",
+        "5",
+        "3",
+        "unavailable",
+        "2",
+        "7",
+    ]
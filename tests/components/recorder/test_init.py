@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
 import threading
-from typing import cast
+from typing import Any, cast
 from unittest.mock import MagicMock, Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
@@ -50,6 +50,10 @@ from homeassistant.components.recorder.db_schema import (
     StatesMeta,
     StatisticsRuns,
 )
+from homeassistant.components.recorder.group_commit import (
+    COMMIT_IDLE_SECONDS,
+    GroupCommit,
+)
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
@@ -370,10 +374,12 @@ async def test_saving_state_with_intermixed_time_changes(
         assert db_states[0].event_id is None
 
 
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
 def test_saving_state_with_exception(
     hass_recorder: Callable[..., HomeAssistant],
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    bulk_insert_states: bool,
 ) -> None:
     """Test saving and restoring a state."""
     hass = hass_recorder()
@@ -382,20 +388,31 @@ def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
+    instance = get_instance(hass)
+    instance.bulk_insert_states = bulk_insert_states
+
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
+        for obj in instance.event_session:
             if isinstance(obj, States):
                 raise OperationalError(
                     "insert the state", "fake params", "forced to fail"
                 )
 
+    def _throw(*args, **kwargs):
+        raise OperationalError("insert the state", "fake params", "forced to fail")
+
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
+            instance.event_session,
             "flush",
             side_effect=_throw_if_state_in_session,
         ),
+        patch.object(
+            instance.states_bulk_writer,
+            "write",
+            side_effect=_throw,
+        ),
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -415,10 +432,12 @@ def test_saving_state_with_exception(
     assert "Error saving events" not in caplog.text
 
 
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
 def test_saving_state_with_sqlalchemy_exception(
     hass_recorder: Callable[..., HomeAssistant],
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    bulk_insert_states: bool,
 ) -> None:
     """Test saving state when there is an SQLAlchemyError."""
     hass = hass_recorder()
@@ -427,20 +446,31 @@ def test_saving_state_with_sqlalchemy_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
+    instance = get_instance(hass)
+    instance.bulk_insert_states = bulk_insert_states
+
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
+        for obj in instance.event_session:
             if isinstance(obj, States):
                 raise SQLAlchemyError(
                     "insert the state", "fake params", "forced to fail"
                 )
 
+    def _throw(*args, **kwargs):
+        raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
+
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
+            instance.event_session,
             "flush",
             side_effect=_throw_if_state_in_session,
         ),
+        patch.object(
+            instance.states_bulk_writer,
+            "write",
+            side_effect=_throw,
+        ),
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -1426,6 +1456,110 @@ def test_saving_sets_old_state(hass_recorder: Callable[..., HomeAssistant]) -> N
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
+def test_saving_sets_old_state_inside_commit_interval(
+    hass_recorder: Callable[..., HomeAssistant], bulk_insert_states: bool
+) -> None:
+    """Test saving sets the old state of states committed together."""
+    hass = hass_recorder()
+    instance = get_instance(hass)
+    instance.bulk_insert_states = bulk_insert_states
+
+    hass.states.set("test.one", "s1", {"attr": 1})
+    hass.states.set("test.two", "s2", {"attr": 2})
+    hass.states.set("test.one", "s3", {"attr": 1})
+    hass.states.set("test.one", "s4", {"attr": 3})
+    hass.states.remove("test.two")
+    wait_recording_done(hass)
+    hass.states.set("test.one", "s5", {"attr": 3})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.attributes_id,
+                States.state,
+            ).outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        )
+        assert len(states) == 6
+        states_by_state = {state.state: state for state in states}
+        removed = states_by_state[None]
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state["s5"].old_state_id == states_by_state["s4"].state_id
+        assert removed.entity_id == "test.two"
+        assert removed.old_state_id == states_by_state["s2"].state_id
+
+        assert (
+            states_by_state["s1"].attributes_id == states_by_state["s3"].attributes_id
+        )
+        assert (
+            states_by_state["s4"].attributes_id == states_by_state["s5"].attributes_id
+        )
+        assert len({state.attributes_id for state in states}) == 4
+
+
+async def test_state_attributes_index(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test the cached attributes_ids are saved at shutdown and warmed up."""
+    hass_storage["recorder.state_attributes_index"] = {
+        "version": 1,
+        "data": {"attributes_ids": [5, 3]},
+    }
+    with patch.object(
+        state_attributes_table_manager.StateAttributesManager, "warm_up"
+    ) as warm_up_mock:
+        instance = await async_setup_recorder_instance(hass)
+    assert warm_up_mock.mock_calls[0][1][0] == [5, 3]
+    manager = instance.state_attributes_manager
+
+    for idx in range(3):
+        hass.states.async_set("test.one", "on", {"idx": idx})
+    await async_wait_recording_done(hass)
+
+    def _get_attributes_ids() -> dict[str, int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return dict(
+                session.query(
+                    StateAttributes.shared_attrs, StateAttributes.attributes_id
+                )
+            )
+
+    def _warm_up(attributes_ids: list[int] | None) -> None:
+        manager.reset()
+        with session_scope(hass=hass, read_only=True) as session:
+            manager.warm_up(attributes_ids, session)
+
+    attributes_ids = await instance.async_add_executor_job(_get_attributes_ids)
+    most_recent_first = [attributes_ids[f'{{"idx":{idx}}}'] for idx in (2, 1, 0)]
+    assert manager.recently_used_ids() == most_recent_first
+
+    # Ids of rows which no longer exist are ignored
+    await instance.async_add_executor_job(
+        _warm_up, [most_recent_first[1], most_recent_first[1], 9999]
+    )
+    assert manager.recently_used_ids() == [most_recent_first[1]]
+    assert manager.get_from_cache('{"idx":1}') == most_recent_first[1]
+
+    # Without saved ids the ids of the most recent states are used
+    await instance.async_add_executor_job(_warm_up, None)
+    assert manager.recently_used_ids() == most_recent_first
+
+    await hass.async_stop()
+    assert hass_storage["recorder.state_attributes_index"]["data"] == {
+        "attributes_ids": most_recent_first
+    }
+
+
 def test_saving_state_with_serializable_data(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -2605,3 +2739,172 @@ def test_all_tables_use_default_table_args(hass: HomeAssistant) -> None:
     """Test that all tables use the default table args."""
     for table in db_schema.Base.metadata.tables.values():
         assert table.kwargs.items() >= db_schema._DEFAULT_TABLE_ARGS.items()
+
+
+async def test_read_engine(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    recorder_db_url: str,
+    tmp_path: Path,
+) -> None:
+    """Test read only queries use the read engine and executor."""
+    if recorder_db_url == "sqlite://":
+        # Use file DB, in memory DB cannot be shared with a read pool.
+        recorder_db_url = "sqlite:///" + str(tmp_path / "pytest.db")
+    config = {
+        recorder.CONF_DB_URL: recorder_db_url,
+        recorder.CONF_DB_READ_WORKERS: 2,
+    }
+    instance = await async_setup_recorder_instance(hass, config)
+    assert instance.read_engine is not None
+
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+
+    def _read_states() -> tuple[str, list[str]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.get_bind() is instance.read_engine
+            states = [state.state for state in session.query(States)]
+        with session_scope(hass=hass) as session:
+            assert session.get_bind() is instance.engine
+        return threading.current_thread().name, states
+
+    thread_name, states = await instance.async_add_read_executor_job(_read_states)
+    assert thread_name.startswith("DbReader")
+    assert states == ["1"]
+
+    if recorder_db_url.startswith("sqlite://"):
+
+        def _write_state() -> None:
+            with session_scope(hass=hass, read_only=True) as session:
+                session.query(States).delete()
+
+        with pytest.raises(OperationalError, match="readonly"):
+            await instance.async_add_read_executor_job(_write_state)
+
+
+async def test_read_engine_not_used_with_memory_sqlite(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    recorder_db_url: str,
+) -> None:
+    """Test an in-memory database is not shared with a read pool."""
+    if recorder_db_url != "sqlite://":
+        return pytest.skip("Only in-memory SQLite cannot use a read pool")
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_READ_WORKERS: 2}
+    )
+    assert not instance.use_read_engine
+    assert instance.read_engine is None
+
+    def _read_session_bind() -> Any:
+        with session_scope(hass=hass, read_only=True) as session:
+            return session.get_bind()
+
+    assert (
+        await instance.async_add_read_executor_job(_read_session_bind)
+        is instance.engine
+    )
+
+
+async def _async_pending_events(hass: HomeAssistant, instance: Recorder) -> int | None:
+    """Return the number of events which are not committed.
+
+    Returns None if the event session has no pending writes.
+    """
+    future: asyncio.Future[int | None] = hass.loop.create_future()
+
+    class PendingWritesTask(recorder.tasks.RecorderTask):
+        """Task to report the pending writes without committing them."""
+
+        commit_before = False
+
+        def run(self, instance: Recorder) -> None:
+            hass.loop.call_soon_threadsafe(
+                future.set_result,
+                instance.group_commit.pending_events
+                if instance._event_session_has_pending_writes
+                else None,
+            )
+
+    instance.queue_task(PendingWritesTask())
+    return await future
+
+
+async def test_group_commit_on_commit_size(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+) -> None:
+    """Test the event session is committed once the commit size is reached."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 60}
+    )
+    # Refreshing a new event type commits, so record it first
+    hass.bus.async_fire("test_event")
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+    size_histogram = instance.group_commit.size_histogram
+    counts = list(size_histogram.counts)
+
+    with patch("homeassistant.components.recorder.group_commit.COMMIT_MAX_EVENTS", 3):
+        hass.bus.async_fire("test_event")
+        hass.bus.async_fire("test_event")
+        assert await _async_pending_events(hass, instance) == 2
+
+        hass.bus.async_fire("test_event")
+        assert await _async_pending_events(hass, instance) is None
+
+    # The commit of 3 events is counted in the ≤10 bucket
+    counts[1] += 1
+    assert size_histogram.counts == counts
+
+
+async def test_group_commit_on_idle(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+) -> None:
+    """Test the event session is committed once no new events arrive."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 60}
+    )
+    await async_wait_recording_done(hass)
+    instance.group_commit.idle_seconds = 0.01
+
+    hass.bus.async_fire("test_event")
+    for _ in range(100):
+        await asyncio.sleep(0.02)
+        if await _async_pending_events(hass, instance) is None:
+            break
+    else:
+        pytest.fail("The event session was not committed")
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert (
+            session.query(Events)
+            .filter(Events.event_type_id.in_(select_event_type_ids(("test_event",))))
+            .count()
+            == 1
+        )
+
+
+def test_group_commit_on_latency(freezer: FrozenDateTimeFactory) -> None:
+    """Test writes are committed once the oldest reaches the commit interval."""
+    group_commit = GroupCommit(5)
+    assert group_commit.timeout(False) is None
+    assert not group_commit.add_event()
+    assert group_commit.timeout(True) == COMMIT_IDLE_SECONDS
+
+    freezer.tick(4.5)
+    assert not group_commit.add_event()
+    # Only waits for the rest of the commit interval
+    assert group_commit.timeout(True) == 0.5
+
+    freezer.tick(0.5)
+    assert group_commit.add_event()
+    group_commit.committed()
+    assert group_commit.pending_events == 0
+    assert group_commit.size_histogram.summary() == "≤10: 1"
+    assert group_commit.latency_histogram.summary() == "≤5 s: 1"
+
+    # Commit after every event without a commit interval
+    assert GroupCommit(0).add_event()
@@ -0,0 +1,172 @@
+"""The tests for compacting numeric states in chunks."""
+
+from datetime import timedelta
+import random
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+from homeassistant.components.recorder import gorilla, history
+from homeassistant.components.recorder.db_schema import (
+    StateAttributes,
+    States,
+    StatesNumericChunks,
+)
+from homeassistant.components.recorder.numeric_chunks import parse_numeric_state
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.tasks import CompactNumericStatesTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+ENTITY_IDS = ["sensor.count", "sensor.mode", "sensor.power"]
+
+
+def test_gorilla_round_trip() -> None:
+    """Test timestamps and values are restored exactly."""
+    rng = random.Random(42)
+    timestamps = [1_700_000_000_000_000]
+    for _ in range(500):
+        timestamps.append(
+            timestamps[-1] + rng.choice([1, 10_000_000, 10_000_123, 2**40])
+        )
+    values = [
+        rng.choice([21.5, 21.5, -3.25, 1e300, 0.0, rng.random() * 1000])
+        for _ in timestamps
+    ]
+
+    data = gorilla.encode(timestamps, values)
+    assert gorilla.decode(data, len(timestamps)) == (timestamps, values)
+    assert gorilla.decode(gorilla.encode([5], [1.0]), 1) == ([5], [1.0])
+
+
+def test_parse_numeric_state() -> None:
+    """Test only states which can be restored exactly are parsed."""
+    assert parse_numeric_state("21.5") == (21.5, False)
+    assert parse_numeric_state("-3") == (-3.0, True)
+    assert parse_numeric_state("21.50") is None
+    assert parse_numeric_state("1e3") is None
+    assert parse_numeric_state("on") is None
+    assert parse_numeric_state("") is None
+    assert parse_numeric_state(None) is None
+
+
+async def test_compact_numeric_states(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test compacted states are read by history and purged."""
+    instance = await async_setup_recorder_instance(hass)
+    start = (dt_util.utcnow() + timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+    with freeze_time(start) as freezer:
+        for i in range(10):
+            freezer.move_to(start + timedelta(minutes=i))
+            hass.states.async_set("sensor.power", str(i * 1.5), {"unit": "W"})
+            hass.states.async_set("sensor.count", str(i))
+            hass.states.async_set("sensor.mode", "on" if i % 2 else "off")
+            await async_wait_recording_done(hass)
+
+    def _get_history() -> list:
+        return [
+            {
+                entity_id: [state.as_dict() for state in states]
+                for entity_id, states in history.get_significant_states(
+                    hass,
+                    start + timedelta(minutes=period_start),
+                    start + timedelta(minutes=period_end),
+                    entity_ids,
+                    significant_changes_only=False,
+                    no_attributes=no_attributes,
+                ).items()
+            }
+            for entity_ids in (ENTITY_IDS, ["sensor.power"])
+            for period_start, period_end in ((-1, 20), (4.5, 7.5), (12, 15))
+            for no_attributes in (False, True)
+        ]
+
+    expected = await instance.async_add_executor_job(_get_history)
+    # The state at the start of the period is included
+    assert [state["state"] for state in expected[2]["sensor.power"]] == [
+        "6.0",
+        "7.5",
+        "9.0",
+        "10.5",
+    ]
+    assert not instance.numeric_chunks_recorded
+
+    instance.queue_task(
+        CompactNumericStatesTask(list(ENTITY_IDS), start + timedelta(days=1))
+    )
+    await async_wait_recording_done(hass)
+
+    assert instance.numeric_chunks_recorded
+    with session_scope(hass=hass) as session:
+        chunks = session.query(StatesNumericChunks)
+        assert chunks.count() == 2
+        assert {chunk.count for chunk in chunks} == {9}
+        # Only the last numeric states are kept in the states table
+        assert session.query(States).count() == 12
+
+    assert await instance.async_add_executor_job(_get_history) == expected
+
+    # The states of the entities are kept when purging older states
+    purge_before = start - timedelta(days=1)
+    assert await instance.async_add_executor_job(
+        purge_old_data, instance, purge_before, False
+    )
+    with session_scope(hass=hass) as session:
+        assert session.query(StatesNumericChunks).count() == 2
+
+    purge_before = start + timedelta(hours=1)
+    while not await instance.async_add_executor_job(
+        purge_old_data, instance, purge_before, False
+    ):
+        pass
+    with session_scope(hass=hass) as session:
+        assert session.query(StatesNumericChunks).count() == 0
+        assert session.query(States).count() == 0
+        assert session.query(StateAttributes).count() == 0
+
+
+async def test_compact_states_with_same_timestamp(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test states with the same timestamp are compacted across batches."""
+    instance = await async_setup_recorder_instance(hass)
+    start = (dt_util.utcnow() + timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+    with freeze_time(start) as freezer:
+        # Every batch of 5 states ends between two states with the same timestamp
+        for i in range(13):
+            freezer.move_to(start + timedelta(seconds=(i + 1) // 2))
+            hass.states.async_set("sensor.count", str(i))
+        await async_wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.recorder.numeric_chunks.COMPACT_STATES_PER_BATCH",
+        5,
+    ):
+        instance.queue_task(
+            CompactNumericStatesTask(["sensor.count"], start + timedelta(days=1))
+        )
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        chunks = session.query(StatesNumericChunks).order_by(
+            StatesNumericChunks.start_ts
+        )
+        assert [chunk.count for chunk in chunks] == [4, 4, 4]
+        # Only the last state is kept in the states table
+        assert [state.state for state in session.query(States)] == ["12"]
+        values = [
+            value for chunk in chunks for value in gorilla.decode(chunk.data, 4)[1]
+        ]
+    assert values == list(range(12))
@@ -0,0 +1,225 @@
+"""The tests for the partitioned states and events tables."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateTable
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import Base, StateAttributes, States
+from homeassistant.components.recorder.partitions import (
+    PARTITIONED_TABLES,
+    Partition,
+    _add_postgresql_partitions,
+    list_partitions,
+    partition_expired,
+    partition_start,
+    partitioned_table_definition,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+STATES_TABLE, EVENTS_TABLE = PARTITIONED_TABLES
+
+
+@pytest.mark.parametrize(
+    ("now", "interval", "expected"),
+    [
+        (
+            datetime(2024, 3, 6, 23, 59, 59, tzinfo=dt_util.UTC),
+            timedelta(days=1),
+            datetime(2024, 3, 6, tzinfo=dt_util.UTC),
+        ),
+        (
+            datetime(2024, 3, 6, 12, tzinfo=dt_util.UTC),
+            timedelta(weeks=1),
+            datetime(2024, 3, 4, tzinfo=dt_util.UTC),
+        ),
+    ],
+)
+def test_partition_start(
+    now: datetime, interval: timedelta, expected: datetime
+) -> None:
+    """Test the start of the partition periods."""
+    assert partition_start(now, interval) == expected
+
+
+def test_partitioned_table_definition() -> None:
+    """Test the unique keys include the partition columns."""
+    table = partitioned_table_definition(
+        Base.metadata.tables["states"], STATES_TABLE, SupportedDialect.POSTGRESQL
+    )
+    ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (state_id, last_updated_ts)" in ddl
+    assert "DEFAULT nextval('states_state_id_seq')" in ddl
+    assert "PARTITION BY RANGE (last_updated_ts)" in ddl
+    assert "REFERENCES states_meta (metadata_id)" in ddl
+    # Foreign keys referencing the table itself are not supported
+    assert "REFERENCES states " not in ddl
+    assert {index.name for index in table.indexes} == {
+        index.name for index in Base.metadata.tables["states"].indexes
+    }
+
+    table = partitioned_table_definition(
+        Base.metadata.tables["events"], EVENTS_TABLE, SupportedDialect.MYSQL
+    )
+    ddl = str(CreateTable(table).compile(dialect=mysql.dialect()))
+    assert "event_id INTEGER NOT NULL AUTO_INCREMENT" in ddl
+    assert "PRIMARY KEY (event_id)" in ddl
+    assert "REFERENCES" not in ddl
+
+
+def test_list_partitions() -> None:
+    """Test the partitions are listed in the order of their ranges."""
+    session = MagicMock()
+    session.execute.return_value = [
+        ("states_default", "DEFAULT"),
+        ("states_p20240307", "FOR VALUES FROM ('1709769600') TO ('1709856000')"),
+        ("states_p20240306", "FOR VALUES FROM ('1709683200') TO ('1709769600')"),
+    ]
+    partitions = list_partitions(session, SupportedDialect.POSTGRESQL, STATES_TABLE)
+    assert partitions == [
+        Partition("states_p20240306", 1709769600.0),
+        Partition("states_p20240307", 1709856000.0),
+        Partition("states_default", None),
+    ]
+    assert partition_expired(
+        session, SupportedDialect.POSTGRESQL, STATES_TABLE, partitions[0], 1709769600
+    )
+    assert not partition_expired(
+        session, SupportedDialect.POSTGRESQL, STATES_TABLE, partitions[1], 1709769600
+    )
+
+    session.execute.return_value = [("pmax", "MAXVALUE"), ("p20240306", "1234")]
+    assert list_partitions(session, SupportedDialect.MYSQL, EVENTS_TABLE) == [
+        Partition("p20240306", 1234.0),
+        Partition("pmax", None),
+    ]
+    assert list_partitions(session, SupportedDialect.SQLITE, EVENTS_TABLE) == []
+
+
+def test_add_postgresql_partitions() -> None:
+    """Test each partition is added on its own and takes its rows from the default."""
+    statements: list[str] = []
+
+    def _execute(statement, parameters=None):
+        sql = str(statement)
+        statements.append(sql)
+        result = MagicMock()
+        # The default partition has rows of the second period
+        result.first.return_value = (
+            (1,)
+            if sql.startswith("SELECT") and parameters["start"] == 1709769600
+            else None
+        )
+        if sql.startswith("CREATE TABLE states_p20240306"):
+            raise OperationalError(sql, None, Exception("could not create"))
+        return result
+
+    connection = MagicMock()
+    connection.execute.side_effect = _execute
+    # Roll back the savepoint and raise if creating the partition fails
+    connection.begin_nested.return_value.__exit__.return_value = False
+
+    _add_postgresql_partitions(
+        connection,
+        STATES_TABLE,
+        [Partition("states_default", None)],
+        timedelta(days=1),
+        datetime(2024, 3, 6, 12, tzinfo=dt_util.UTC),
+    )
+
+    assert connection.begin_nested.call_count == 3
+    assert [sql for sql in statements if not sql.startswith("SELECT")] == [
+        "CREATE TABLE states_p20240306 PARTITION OF states"
+        " FOR VALUES FROM (1709683200.0) TO (1709769600.0)",
+        "ALTER TABLE states DETACH PARTITION states_default",
+        "CREATE TABLE states_p20240307 PARTITION OF states"
+        " FOR VALUES FROM (1709769600.0) TO (1709856000.0)",
+        "INSERT INTO states_p20240307 SELECT * FROM states_default"
+        " WHERE last_updated_ts >= :start AND last_updated_ts < :end",
+        "DELETE FROM states_default"
+        " WHERE last_updated_ts >= :start AND last_updated_ts < :end",
+        "ALTER TABLE states ATTACH PARTITION states_default DEFAULT",
+        "CREATE TABLE states_p20240308 PARTITION OF states"
+        " FOR VALUES FROM (1709856000.0) TO (1709942400.0)",
+    ]
+
+
+@pytest.mark.parametrize("recorder_config", [{"partition_interval": "day"}])
+async def test_sqlite_is_not_partitioned(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test SQLite keeps the tables without partitions."""
+    assert recorder_mock.partition_interval == timedelta(days=1)
+    assert not recorder_mock.partitioned_tables
+
+
+async def test_purge_drops_expired_partitions(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test purging drops the partitions of expired rows."""
+    now = dt_util.utcnow()
+    freezer.move_to(now - timedelta(days=5))
+    hass.states.async_set("sensor.old", "1", {"old": True})
+    await async_wait_recording_done(hass)
+    freezer.move_to(now)
+    hass.states.async_set("sensor.new", "1", {"new": True})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        old_state = session.query(States).filter(States.state == "1").first()
+        assert old_state is not None
+        old_state_id = old_state.state_id
+        old_attributes_id = old_state.attributes_id
+
+    dropped: list[str] = []
+
+    def _drop_partition(session, dialect_name, partitioned_table, partition):
+        dropped.append(partition.name)
+        if partitioned_table is STATES_TABLE:
+            # The row of the dropped partition is gone
+            session.query(States).filter(States.state_id == old_state_id).delete()
+            return {old_attributes_id}, old_state_id
+        return set(), None
+
+    partitions = [Partition("p1", 1.0), Partition("p2", 2.0), Partition("pmax", None)]
+    recorder_mock.partitioned_tables = True
+    with (
+        patch(
+            "homeassistant.components.recorder.partitions.list_partitions",
+            return_value=partitions,
+        ),
+        patch(
+            "homeassistant.components.recorder.partitions.partition_expired",
+            side_effect=lambda session, dialect_name, table, partition, ts: (
+                partition.name == "p1"
+            ),
+        ),
+        patch(
+            "homeassistant.components.recorder.partitions.drop_partition",
+            side_effect=_drop_partition,
+        ),
+    ):
+        assert await recorder_mock.async_add_executor_job(
+            purge_old_data, recorder_mock, now - timedelta(days=1), False
+        )
+
+    assert dropped == ["p1", "p1"]
+    # The next state of the entity is not linked to the dropped state
+    assert recorder_mock.states_manager.pop_committed("sensor.old") is None
+    assert recorder_mock.states_manager.pop_committed("sensor.new") is not None
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+        assert [
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        ] == ['{"new":true}']
@@ -1854,6 +1854,62 @@ def test_monthly_statistics_sum(
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+def test_reduce_statistics_per_day_with_gaps_and_none() -> None:
+    """Test reducing hourly statistics with missing hours and None values."""
+    day1 = dt_util.parse_datetime("2022-10-03 00:00:00+00:00").timestamp()
+    day2 = day1 + 86400
+    day4 = day1 + 3 * 86400
+    hourly = [
+        (day1, 10, None, 5),
+        (day1 + 3600, None, None, 1),
+        (day1 + 23 * 3600, 20, 2, None),
+        (day2 + 7200, None, None, None),
+        (day4, 30, 3, 30),
+    ]
+    stats = {
+        "sensor.test": [
+            {
+                "start": start,
+                "end": start + 3600,
+                "mean": mean,
+                "min": min_,
+                "max": max_,
+                "sum": start - day1,
+            }
+            for start, mean, min_, max_ in hourly
+        ]
+    }
+    types = {"max", "mean", "min", "sum"}
+    assert statistics._reduce_statistics_per_day(stats, types) == {
+        "sensor.test": [
+            {
+                "start": day1,
+                "end": day2,
+                "mean": 15,
+                "min": 2,
+                "max": 5,
+                "sum": 23 * 3600,
+            },
+            {
+                "start": day2,
+                "end": day2 + 86400,
+                "mean": None,
+                "min": None,
+                "max": None,
+                "sum": day2 + 7200 - day1,
+            },
+            {
+                "start": day4,
+                "end": day4 + 86400,
+                "mean": 30,
+                "min": 3,
+                "max": 30,
+                "sum": day4 - day1,
+            },
+        ]
+    }
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
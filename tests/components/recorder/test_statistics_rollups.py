@@ -0,0 +1,239 @@
+"""The tests for the daily and monthly statistics rollups."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    Statistics,
+    StatisticsDaily,
+    StatisticsMonthly,
+)
+from homeassistant.components.recorder.statistics import (
+    _compile_statistics_rollups,
+    async_add_external_statistics,
+    statistics_rollups_match_time_zone,
+)
+from homeassistant.components.recorder.tasks import StatisticsRollupsTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done, statistics_during_period
+
+MEAN_METADATA = {
+    "has_mean": True,
+    "has_sum": False,
+    "name": "Temperature",
+    "source": "test",
+    "statistic_id": "test:temperature",
+    "unit_of_measurement": "°C",
+}
+SUM_METADATA = {
+    "has_mean": False,
+    "has_sum": True,
+    "name": "Total imported energy",
+    "source": "test",
+    "statistic_id": "test:total_energy_import",
+    "unit_of_measurement": "kWh",
+}
+STATISTIC_IDS = {"test:temperature", "test:total_energy_import"}
+TYPES = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
+
+
+async def _add_hourly_statistics(hass: HomeAssistant) -> datetime:
+    """Add hourly statistics over the end of daylight saving time in October."""
+    hass.config.set_time_zone("Europe/Amsterdam")
+    start = dt_util.as_utc(dt_util.parse_datetime("2021-09-29 00:00:00"))
+    mean_statistics = []
+    sum_statistics = []
+    for hour in range(24 * 40):
+        if hour % 7 == 3:
+            # A gap in the statistics
+            continue
+        mean = hour % 10 + 0.5
+        mean_statistics.append(
+            {
+                "start": start + timedelta(hours=hour),
+                "mean": mean,
+                "min": mean - 1,
+                "max": mean + 1,
+            }
+        )
+        sum_statistics.append(
+            {
+                "start": start + timedelta(hours=hour),
+                "last_reset": None,
+                "state": hour % 24,
+                "sum": hour * 2,
+            }
+        )
+    async_add_external_statistics(hass, MEAN_METADATA, mean_statistics)
+    async_add_external_statistics(hass, SUM_METADATA, sum_statistics)
+    await async_wait_recording_done(hass)
+    return start
+
+
+async def _statistics_during_period(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    start_time: datetime,
+    period: str,
+    rollups_active: bool,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the statistics read from the rollups or reduced from the hours."""
+    recorder_mock.statistics_rollups_active = rollups_active
+    try:
+        return await recorder_mock.async_add_executor_job(
+            statistics_during_period,
+            hass,
+            start_time + timedelta(days=2),
+            start_time + timedelta(days=35),
+            STATISTIC_IDS,
+            period,
+            None,
+            TYPES,
+        )
+    finally:
+        recorder_mock.statistics_rollups_active = True
+
+
+async def _assert_rollups_match_hourly_statistics(
+    recorder_mock: Recorder, hass: HomeAssistant, start: datetime
+) -> None:
+    """Assert reading the rollups returns the reduced hourly statistics."""
+    for period in ("day", "month"):
+        hourly = await _statistics_during_period(
+            recorder_mock, hass, start, period, False
+        )
+        rollups = await _statistics_during_period(
+            recorder_mock, hass, start, period, True
+        )
+        assert rollups == hourly
+        assert rollups.keys() == STATISTIC_IDS
+
+
+async def test_statistics_rollups_during_period(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the daily and monthly statistics are read from the rollups."""
+    assert recorder_mock.statistics_rollups_active
+    start = await _add_hourly_statistics(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        # 40 days from the 29th of September
+        assert session.query(StatisticsDaily).count() == 2 * 40
+        assert session.query(StatisticsMonthly).count() == 2 * 3
+        october = (
+            session.query(StatisticsMonthly)
+            .filter(StatisticsMonthly.sum.isnot(None))
+            .order_by(StatisticsMonthly.start_ts)
+            .all()[1]
+        )
+        # October is one hour longer than 31 days
+        assert october.start_ts == dt_util.as_timestamp("2021-09-30 22:00:00+00:00")
+        assert october.end_ts == dt_util.as_timestamp("2021-10-31 23:00:00+00:00")
+        assert statistics_rollups_match_time_zone(session)
+
+    stats = await _statistics_during_period(recorder_mock, hass, start, "month", True)
+    assert [row["end"] for row in stats["test:total_energy_import"]] == [
+        dt_util.as_timestamp("2021-10-31 23:00:00+00:00"),
+        dt_util.as_timestamp("2021-11-30 23:00:00+00:00"),
+    ]
+    await _assert_rollups_match_hourly_statistics(recorder_mock, hass, start)
+
+
+async def test_monthly_rollups_compiled_from_daily_rollups(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the monthly rollups are compiled from the daily rollups."""
+    await _add_hourly_statistics(hass)
+    october_start = dt_util.as_timestamp("2021-09-30 22:00:00+00:00")
+    october_end = dt_util.as_timestamp("2021-10-31 23:00:00+00:00")
+
+    def _october_mean_rollup(session: Session) -> StatisticsMonthly:
+        return (
+            session.query(StatisticsMonthly)
+            .filter(StatisticsMonthly.mean.isnot(None))
+            .filter(StatisticsMonthly.start_ts == october_start)
+            .one()
+        )
+
+    with session_scope(hass=hass) as session:
+        hourly_means = (
+            session.query(Statistics)
+            .filter(Statistics.mean.isnot(None))
+            .filter(Statistics.start_ts >= october_start)
+            .filter(Statistics.start_ts < october_end)
+            .count()
+        )
+        assert _october_mean_rollup(session).mean_count == hourly_means
+
+        # Compiling another day of October compiles October from its days
+        session.query(StatisticsDaily).filter(StatisticsDaily.mean.isnot(None)).filter(
+            StatisticsDaily.start_ts == october_start
+        ).update({StatisticsDaily.max: 1000})
+        _compile_statistics_rollups(session, {october_start + 10 * 86400})
+        october = _october_mean_rollup(session)
+        assert october.max == 1000
+        assert october.mean_count == hourly_means
+
+
+async def test_adjust_statistics_updates_rollups(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test adjusting the sum of the statistics also adjusts the rollups."""
+    start = await _add_hourly_statistics(hass)
+
+    recorder_mock.async_adjust_statistics(
+        "test:total_energy_import", start + timedelta(days=20, hours=5), 100, "kWh"
+    )
+    await async_wait_recording_done(hass)
+
+    stats = await _statistics_during_period(recorder_mock, hass, start, "month", True)
+    # The last hours of October and of the statistics
+    assert [row["sum"] for row in stats["test:total_energy_import"]] == [
+        792 * 2 + 100,
+        959 * 2 + 100,
+    ]
+    await _assert_rollups_match_hourly_statistics(recorder_mock, hass, start)
+
+
+async def test_statistics_rollups_migration(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the rollups of the existing statistics are compiled."""
+    start = await _add_hourly_statistics(hass)
+    with session_scope(hass=hass) as session:
+        session.query(StatisticsDaily).delete()
+        session.query(StatisticsMonthly).delete()
+    recorder_mock.statistics_rollups_active = False
+
+    recorder_mock.queue_task(StatisticsRollupsTask())
+    # The task is queued again for each of the three months
+    for _ in range(4):
+        await async_wait_recording_done(hass)
+
+    assert recorder_mock.statistics_rollups_active
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(StatisticsDaily).count() == 2 * 40
+        assert session.query(StatisticsMonthly).count() == 2 * 3
+    await _assert_rollups_match_hourly_statistics(recorder_mock, hass, start)
+
+
+async def test_statistics_rollups_time_zone_changed(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the hourly statistics are reduced if the time zone changed."""
+    start = await _add_hourly_statistics(hass)
+    hass.config.set_time_zone("America/New_York")
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert not statistics_rollups_match_time_zone(session)
+    stats = await _statistics_during_period(recorder_mock, hass, start, "day", True)
+    assert stats["test:total_energy_import"][0]["start"] == dt_util.as_timestamp(
+        "2021-09-30 04:00:00+00:00"
+    )
+    await _assert_rollups_match_hourly_statistics(recorder_mock, hass, start)
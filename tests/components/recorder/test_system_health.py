@@ -33,6 +33,8 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "commit_size": ANY,
+        "commit_latency": ANY,
     }
 
 
@@ -62,6 +64,8 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "commit_size": ANY,
+        "commit_latency": ANY,
     }
 
 
@@ -97,6 +101,8 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "commit_size": ANY,
+        "commit_latency": ANY,
     }
 
 
@@ -123,4 +129,20 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "commit_size": ANY,
+        "commit_latency": ANY,
     }
+
+
+async def test_recorder_system_health_commit_histograms(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test recorder system health reports the commit histograms."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    instance.group_commit.size_histogram.counts = [2, 1, 0, 0, 3]
+    instance.group_commit.latency_histogram.counts = [0, 4, 0, 0, 0, 1]
+    info = await get_system_health_info(hass, "recorder")
+    assert info["commit_size"] == "≤1: 2, ≤10: 1, >1000: 3"
+    assert info["commit_latency"] == "≤0.5 s: 4, >10 s: 1"
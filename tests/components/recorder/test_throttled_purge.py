@@ -0,0 +1,155 @@
+"""Test purging data continuously within a budget of rows per second."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy.orm.session import Session
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.purge import (
+    PurgeRangeResult,
+    purge_old_data_range,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.common import async_fire_time_changed
+from tests.typing import RecorderInstanceGenerator, WebSocketGenerator
+
+
+async def _add_test_data(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Add 6 old and 2 new states and events."""
+    now = dt_util.utcnow()
+    freezer.move_to(now - timedelta(days=5))
+    for i in range(6):
+        hass.states.async_set("sensor.old", str(i), {"index": i})
+        hass.bus.async_fire("test_event", {"index": i})
+        await async_wait_recording_done(hass)
+    freezer.move_to(now)
+    for i in range(2):
+        hass.states.async_set("sensor.new", str(i), {"index": i})
+        hass.bus.async_fire("test_event", {"new": i})
+        await async_wait_recording_done(hass)
+
+
+def _test_event_data(session: Session) -> list[str]:
+    """Return the data of the test events."""
+    return [
+        shared_data
+        for (shared_data,) in session.query(EventData.shared_data)
+        .join(Events, Events.data_id == EventData.data_id)
+        .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+        .filter(EventTypes.event_type == "test_event")
+        .order_by(Events.event_id)
+    ]
+
+
+async def test_purge_old_data_range(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test purging the states and events of ranges of ids."""
+    instance = await async_setup_recorder_instance(hass)
+    await _add_test_data(hass, freezer)
+    purge_before = dt_util.utcnow() - timedelta(days=1)
+
+    def _purge(
+        state_ids: tuple[int, int] | None,
+        event_ids: tuple[int, int] | None,
+        find_ranges: bool = False,
+    ) -> PurgeRangeResult:
+        return purge_old_data_range(
+            instance, purge_before, state_ids, event_ids, 4, find_ranges
+        )
+
+    result = await instance.async_add_executor_job(_purge, None, None, True)
+    assert result.purged_rows == 4
+    assert result.state_ids is not None
+    assert result.event_ids is not None
+    assert result.total_rows == 12
+    event_ids = result.event_ids
+
+    result = await instance.async_add_executor_job(_purge, result.state_ids, event_ids)
+    assert result == (2, None, event_ids, None)
+
+    result = await instance.async_add_executor_job(_purge, None, event_ids)
+    assert result.purged_rows == 4
+    result = await instance.async_add_executor_job(_purge, None, result.event_ids)
+    assert result == (2, None, None, None)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        assert session.query(StateAttributes).count() == 2
+        assert _test_event_data(session) == ['{"new":0}', '{"new":1}']
+
+
+@pytest.mark.parametrize("recorder_config", [{"purge_rate": 4}])
+async def test_throttled_purge(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the throttled purge pauses on a backlog and reports its progress."""
+    await _add_test_data(hass, freezer)
+    throttled_purge = recorder_mock.throttled_purge
+    client = await hass_ws_client()
+
+    await client.send_json_auto_id({"type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["result"] == {
+        "running": False,
+        "paused": False,
+        "purge_before": None,
+        "purged_rows": 0,
+        "remaining_rows": None,
+        "rows_per_second": 4,
+        "eta": None,
+    }
+
+    purge_before = dt_util.utcnow() - timedelta(days=1)
+    with patch("homeassistant.components.recorder.throttled_purge.PAUSE_BACKLOG", -1):
+        throttled_purge.async_start(purge_before, cleanup=True)
+        assert throttled_purge.paused
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await async_wait_recording_done(hass)
+    assert not throttled_purge.paused
+
+    await client.send_json_auto_id({"type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["result"] == {
+        "running": True,
+        "paused": False,
+        "purge_before": purge_before.isoformat(),
+        "purged_rows": 4,
+        "remaining_rows": 8,
+        "rows_per_second": 4,
+        # The time spent paused slows down the purge
+        "eta": 20,
+    }
+
+    while throttled_purge.running:
+        freezer.tick(timedelta(seconds=1))
+        async_fire_time_changed(hass)
+        await async_wait_recording_done(hass)
+    # Wait for the regular purge queued once done
+    await async_wait_recording_done(hass)
+
+    assert throttled_purge.purged_rows == 12
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        assert _test_event_data(session) == ['{"new":0}', '{"new":1}']
@@ -33,7 +33,12 @@ from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
-from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN, SensorDeviceClass
+from homeassistant.components.sensor import (
+    ATTR_OPTIONS,
+    DOMAIN,
+    SensorDeviceClass,
+    recorder as sensor_recorder,
+)
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.setup import async_setup_component, setup_component
@@ -5212,3 +5217,124 @@ async def test_exclude_attributes(
     assert len(states) == 1
     assert ATTR_OPTIONS not in states[0].attributes
     assert ATTR_FRIENDLY_NAME in states[0].attributes
+
+
+async def test_compile_statistics_from_states_window(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test statistics are compiled from the recent states without the history."""
+    assert await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.power", "10", POWER_SENSOR_ATTRIBUTES)
+    hass.states.async_set("sensor.energy", "100", ENERGY_SENSOR_ATTRIBUTES)
+    await async_wait_recording_done(hass)
+
+    now = dt_util.utcnow()
+    start = (
+        now
+        - timedelta(minutes=now.minute % 5 - 5, seconds=now.second)
+        - (timedelta(microseconds=now.microsecond))
+    )
+    end = start + timedelta(minutes=5)
+    for seconds, power, energy, attributes in (
+        (0, "20", "101", {}),
+        (30, "20", "103", {"extra": 1}),
+        (60, "30", "104", {}),
+        (120, "unavailable", "104", {"extra": 2}),
+        (240, "5", "110", {}),
+        (300, "100", "120", {}),
+    ):
+        freezer.move_to(start + timedelta(seconds=seconds))
+        hass.states.async_set(
+            "sensor.power", power, POWER_SENSOR_ATTRIBUTES | attributes
+        )
+        hass.states.async_set(
+            "sensor.energy", energy, ENERGY_SENSOR_ATTRIBUTES | attributes
+        )
+        await async_wait_recording_done(hass)
+
+    def _compile_statistics() -> list:
+        with session_scope(hass=hass, read_only=True) as session:
+            return sensor_recorder.compile_statistics(
+                hass, session, start, end
+            ).platform_stats
+
+    window = hass.data[sensor_recorder.STATES_WINDOW]
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_history_mock:
+        window_stats = await recorder_mock.async_add_executor_job(_compile_statistics)
+        get_history_mock.assert_not_called()
+
+        # The history is queried after a restart
+        del hass.data[sensor_recorder.STATES_WINDOW]
+        history_stats = await recorder_mock.async_add_executor_job(_compile_statistics)
+        assert get_history_mock.call_count == 2
+
+    assert window_stats == history_stats
+    assert {
+        result["meta"]["statistic_id"]: result["stat"] for result in window_stats
+    } == {
+        "sensor.power": {
+            "start": start,
+            "max": 30.0,
+            "min": 5.0,
+            "mean": pytest.approx((20 * 60 + 30 * 180 + 5 * 60) / 300),
+        },
+        "sensor.energy": {"start": start, "sum": 10.0, "state": 110.0},
+    }
+    # The states before the end, except the last one, are forgotten
+    assert [state.state for state in window.states["sensor.power"]] == ["5", "100"]
+
+
+async def test_compile_statistics_states_window_missing_states(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the history is queried if the recent states are missing states."""
+    assert await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.power", "10", POWER_SENSOR_ATTRIBUTES)
+    await async_wait_recording_done(hass)
+
+    now = dt_util.utcnow()
+    start = (
+        now
+        - timedelta(minutes=now.minute % 5 - 5, seconds=now.second)
+        - (timedelta(microseconds=now.microsecond))
+    )
+    end = start + timedelta(minutes=5)
+    freezer.move_to(start + timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "20", POWER_SENSOR_ATTRIBUTES)
+    await async_wait_recording_done(hass)
+    freezer.move_to(end)
+
+    window = hass.data[sensor_recorder.STATES_WINDOW]
+    # The new state was not added to the window
+    window.states["sensor.power"].pop()
+
+    def _compile_statistics() -> list:
+        with session_scope(hass=hass, read_only=True) as session:
+            return sensor_recorder.compile_statistics(
+                hass, session, start, end
+            ).platform_stats
+
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_history_mock:
+        stats = await recorder_mock.async_add_executor_job(_compile_statistics)
+        get_history_mock.assert_called_once()
+
+    assert stats[0]["stat"] == {
+        "start": start,
+        "max": 20.0,
+        "min": 10.0,
+        "mean": pytest.approx(18.0),
+    }
+    # The window starts over from the current states
+    new_window = hass.data[sensor_recorder.STATES_WINDOW]
+    assert new_window is not window
+    assert [state.state for state in new_window.states["sensor.power"]] == ["20"]
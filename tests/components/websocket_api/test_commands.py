@@ -2511,6 +2511,40 @@ async def test_integration_setup_info(
     ]
 
 
+async def test_integration_setup_timeline(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test getting the integration setup timeline."""
+    with (
+        patch(
+            "homeassistant.components.websocket_api.commands.async_get_setup_critical_path",
+            return_value=[
+                {"domain": "august", "start": 0.0, "end": 12.5, "phases": {}}
+            ],
+        ),
+        patch(
+            "homeassistant.components.websocket_api.commands.async_get_setup_trace_events",
+            return_value={"traceEvents": [], "displayTimeUnit": "ms"},
+        ),
+    ):
+        await websocket_client.send_json(
+            {"id": 7, "type": "integration/setup_timeline"}
+        )
+        msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == {
+        "critical_path": [
+            {"domain": "august", "start": 0.0, "end": 12.5, "phases": {}}
+        ],
+        "trace": {"traceEvents": [], "displayTimeUnit": "ms"},
+    }
+
+
 @pytest.mark.parametrize(
     ("key", "config"),
     [
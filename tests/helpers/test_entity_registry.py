@@ -1,6 +1,8 @@
 """Tests for the Entity Registry."""
 
 from datetime import timedelta
+import json
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
@@ -23,6 +25,7 @@ from tests.common import (
     MockConfigEntry,
     async_capture_events,
     async_fire_time_changed,
+    async_test_home_assistant,
     flush_store,
 )
 
@@ -281,7 +284,7 @@ async def test_loading_saving_data(
     )
     entity_registry.async_update_entity(
         orig_entry2.entity_id,
-        categories={"scope", "id"},
+        categories={"scope": "id"},
         labels={"label1", "label2"},
     )
     orig_entry2 = entity_registry.async_get(orig_entry2.entity_id)
@@ -312,7 +315,7 @@ async def test_loading_saving_data(
     assert orig_entry4 == new_entry4
 
     assert new_entry2.area_id == "mock-area-id"
-    assert new_entry2.categories == {"scope", "id"}
+    assert new_entry2.categories == {"scope": "id"}
     assert new_entry2.capabilities == {"max": 100}
     assert new_entry2.config_entry_id == mock_config.entry_id
     assert new_entry2.device_class == "user-class"
@@ -1988,3 +1991,77 @@ async def test_entries_for_category(entity_registry: er.EntityRegistry) -> None:
     assert not er.async_entries_for_category(entity_registry, "", "id")
     assert not er.async_entries_for_category(entity_registry, "scope1", "unknown")
     assert not er.async_entries_for_category(entity_registry, "scope1", "")
+
+
+async def test_entries_for_platform_and_domain(
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test getting entity entries by platform and domain."""
+    hue_light = entity_registry.async_get_or_create(
+        domain="light", platform="hue", unique_id="123"
+    )
+    hue_sensor = entity_registry.async_get_or_create(
+        domain="sensor", platform="hue", unique_id="123"
+    )
+    zha_light = entity_registry.async_get_or_create(
+        domain="light", platform="zha", unique_id="123"
+    )
+
+    assert er.async_entries_for_platform(entity_registry, "hue") == [
+        hue_light,
+        hue_sensor,
+    ]
+    assert er.async_entries_for_platform(entity_registry, "zha") == [zha_light]
+    assert er.async_entries_for_domain(entity_registry, "light") == [
+        hue_light,
+        zha_light,
+    ]
+    assert er.async_entries_for_domain(entity_registry, "sensor") == [hue_sensor]
+
+    entity_registry.async_remove(hue_sensor.entity_id)
+    assert er.async_entries_for_platform(entity_registry, "hue") == [hue_light]
+    assert not er.async_entries_for_domain(entity_registry, "sensor")
+    assert not er.async_entries_for_platform(entity_registry, "unknown")
+
+
+async def test_rename_entity_journals_single_entry(tmp_path: Path) -> None:
+    """Test renaming an entity after a restart only journals the entity."""
+    config_dir = str(tmp_path)
+    async with async_test_home_assistant(
+        config_dir=config_dir, load_registries=False
+    ) as hass:
+        await er.async_load(hass)
+        registry = er.async_get(hass)
+        for unique_id in ("1", "2", "3"):
+            registry.async_get_or_create("light", "hue", unique_id)
+        await flush_store(registry._store)
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(
+        config_dir=config_dir, load_registries=False
+    ) as hass:
+        await er.async_load(hass)
+        registry = er.async_get(hass)
+        store_path = registry._store.path
+
+        def _read_files() -> tuple[bytes, list[bytes]]:
+            with open(store_path, "rb") as store_file:
+                snapshot = store_file.read()
+            with open(f"{store_path}.journal", "rb") as journal_file:
+                journal = journal_file.read().splitlines()
+            return snapshot, journal
+
+        snapshot, journal = await hass.async_add_executor_job(_read_files)
+        assert len(journal) == 1
+
+        entry = registry.async_update_entity("light.hue_2", name="Renamed")
+        await flush_store(registry._store)
+
+        new_snapshot, journal = await hass.async_add_executor_job(_read_files)
+        assert new_snapshot == snapshot
+        assert len(journal) == 2
+        change = json.loads(journal[1])
+        assert change["key"] == "entities"
+        assert change["id"] == entry.id
+        assert change["value"]["name"] == "Renamed"
+        await hass.async_stop(force=True)
@@ -6,6 +6,7 @@ import logging
 from typing import Any
 from unittest.mock import Mock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
@@ -17,6 +18,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.reload import async_get_platform_without_config_entry
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE,
+    STATE_LAST_SEEN_REFRESH_INTERVAL,
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
@@ -24,6 +26,7 @@ from homeassistant.helpers.restore_state import (
     async_get,
     async_load,
 )
+from homeassistant.helpers.storage import get_internal_store_manager
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.util import dt as dt_util
 
@@ -353,6 +356,76 @@ async def test_dump_data(hass: HomeAssistant) -> None:
     assert state1["state"]["state"] == "off"
 
 
+async def test_dump_keeps_last_seen_of_unchanged_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test unchanged states keep their last seen time between dumps."""
+    platform = MockEntityPlatform(hass, domain="input_boolean")
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    await platform.async_add_entities([entity])
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b2"
+    await platform.async_add_entities([entity])
+
+    data = async_get(hass)
+    hass.states.async_set("input_boolean.b1", "on")
+    hass.states.async_set("input_boolean.b2", "on")
+
+    async def _async_dump() -> dict[str, dict[str, Any]]:
+        with patch(
+            "homeassistant.helpers.restore_state.Store.async_save"
+        ) as mock_write_data:
+            await data.async_dump_states()
+        return {
+            state["id"]: state
+            for state in json_round_trip(mock_write_data.mock_calls[0][1][0])
+        }
+
+    first_dump = await _async_dump()
+    freezer.tick(timedelta(minutes=15))
+    hass.states.async_set("input_boolean.b2", "off")
+    second_dump = await _async_dump()
+
+    assert second_dump["input_boolean.b1"] == first_dump["input_boolean.b1"]
+    assert (
+        second_dump["input_boolean.b2"]["last_seen"]
+        > first_dump["input_boolean.b2"]["last_seen"]
+    )
+
+    # The last seen time is refreshed once in a while
+    freezer.tick(STATE_LAST_SEEN_REFRESH_INTERVAL)
+    third_dump = await _async_dump()
+    assert (
+        third_dump["input_boolean.b1"]["last_seen"]
+        > first_dump["input_boolean.b1"]["last_seen"]
+    )
+
+
+async def test_warm_start_snapshot(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the warm start snapshot has the states of the last dump."""
+    manager = get_internal_store_manager(hass)
+    # The stored states are loaded from storage until they are dumped
+    assert manager.snapshot([STORAGE_KEY]) == {}
+
+    platform = MockEntityPlatform(hass, domain="input_boolean")
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    await platform.async_add_entities([entity])
+    hass.states.async_set("input_boolean.b1", "on", {"brightness": 100})
+
+    await async_get(hass).async_dump_states()
+    await hass.async_block_till_done()
+
+    snapshot = manager.snapshot([STORAGE_KEY])
+    assert json_round_trip(snapshot[STORAGE_KEY]) == hass_storage[STORAGE_KEY]
+
+
 async def test_dump_error(hass: HomeAssistant) -> None:
     """Test that we cache data."""
     states = [
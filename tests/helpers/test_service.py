@@ -44,6 +44,8 @@ from homeassistant.setup import async_setup_component
 
 from tests.common import (
     MockEntity,
+    MockEntityPlatform,
+    MockPlatform,
     MockUser,
     async_mock_service,
     mock_area_registry,
@@ -781,6 +783,45 @@ async def test_extract_entity_ids_from_labels(hass: HomeAssistant) -> None:
     )
 
 
+async def test_extract_entity_ids_resolution_cache(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test resolved targets are cached until the registries change."""
+    area = area_registry.async_create("Kitchen")
+    entry = entity_registry.async_get_or_create("light", "hue", "1234")
+    entity_registry.async_update_entity(entry.entity_id, area_id=area.id)
+    call = ServiceCall("light", "turn_on", {"area_id": area.id})
+
+    assert await service.async_extract_entity_ids(hass, call) == {entry.entity_id}
+    assert await service.async_extract_entity_ids(hass, call) == {entry.entity_id}
+    assert service.async_get_target_resolution_stats(hass) == {
+        "size": 1,
+        "hits": 1,
+        "misses": 1,
+        "invalidations": 0,
+    }
+
+    # Changes which can't change the resolved targets keep the cache
+    entity_registry.async_update_entity(entry.entity_id, name="Ceiling")
+    assert await service.async_extract_entity_ids(hass, call) == {entry.entity_id}
+    assert service.async_get_target_resolution_stats(hass)["hits"] == 2
+
+    other_entry = entity_registry.async_get_or_create("light", "hue", "5678")
+    entity_registry.async_update_entity(other_entry.entity_id, area_id=area.id)
+    assert await service.async_extract_entity_ids(hass, call) == {
+        entry.entity_id,
+        other_entry.entity_id,
+    }
+    assert service.async_get_target_resolution_stats(hass) == {
+        "size": 1,
+        "hits": 2,
+        "misses": 2,
+        "invalidations": 1,
+    }
+
+
 async def test_async_get_all_descriptions(hass: HomeAssistant) -> None:
     """Test async_get_all_descriptions."""
     group_config = {DOMAIN_GROUP: {}}
@@ -1219,6 +1260,214 @@ async def test_call_with_sync_attr(hass: HomeAssistant, mock_entities) -> None:
     assert mock_method.mock_calls[0][2] == {}
 
 
+async def test_call_with_platform_batch_handler(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test platforms implementing a batch handler are called once."""
+    batch_platform = MockPlatform()
+    batch_platform.async_handle_batch = AsyncMock(
+        return_value={"light.kitchen": {"batched": True}}
+    )
+    platform_with_batch = MockEntityPlatform(hass, platform=batch_platform)
+    platform_without_batch = MockEntityPlatform(hass, platform=MockPlatform())
+    mock_entities["light.kitchen"].platform = platform_with_batch
+    mock_entities["light.living_room"].platform = platform_with_batch
+    mock_entities["light.bedroom"].platform = platform_without_batch
+    mock_entities["light.bedroom"].async_test_method = AsyncMock(
+        return_value={"batched": False}
+    )
+
+    response = await service.entity_service_call(
+        hass,
+        mock_entities,
+        "async_test_method",
+        ServiceCall(
+            "test_domain",
+            "test_service",
+            {
+                "entity_id": ["light.kitchen", "light.living_room", "light.bedroom"],
+                "value": 1,
+            },
+            return_response=True,
+        ),
+    )
+
+    assert response == {
+        "light.kitchen": {"batched": True},
+        "light.living_room": None,
+        "light.bedroom": {"batched": False},
+    }
+    assert batch_platform.async_handle_batch.call_count == 1
+    call_hass, call_entities, call_func, call_data = (
+        batch_platform.async_handle_batch.mock_calls[0][1]
+    )
+    assert call_hass is hass
+    assert {entity.entity_id for entity in call_entities} == {
+        "light.kitchen",
+        "light.living_room",
+    }
+    assert call_func == "async_test_method"
+    assert call_data == {"value": 1}
+    mock_entities["light.bedroom"].async_test_method.assert_called_once_with(value=1)
+
+
+async def test_call_with_platform_batch_handler_failure(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test a failing batch handler does not stop other platforms."""
+    batch_platform = MockPlatform()
+    batch_platform.async_handle_batch = AsyncMock(
+        side_effect=exceptions.HomeAssistantError("bridge offline")
+    )
+    mock_entities["light.kitchen"].platform = MockEntityPlatform(
+        hass, platform=batch_platform
+    )
+    mock_entities["light.bedroom"].platform = MockEntityPlatform(
+        hass, platform=MockPlatform()
+    )
+    mock_entities["light.bedroom"].async_test_method = AsyncMock(return_value=None)
+
+    with pytest.raises(exceptions.HomeAssistantError, match="bridge offline"):
+        await service.entity_service_call(
+            hass,
+            mock_entities,
+            "async_test_method",
+            ServiceCall(
+                "test_domain",
+                "test_service",
+                {"entity_id": ["light.kitchen", "light.bedroom"]},
+            ),
+        )
+
+    mock_entities["light.bedroom"].async_test_method.assert_called_once_with()
+
+
+async def test_call_with_partial_failure_raises(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test a failing platform raises after the other platforms are called."""
+    batch_platform = MockPlatform()
+    batch_platform.async_handle_batch = AsyncMock(
+        side_effect=exceptions.HomeAssistantError("bridge offline")
+    )
+    mock_entities["light.kitchen"].platform = MockEntityPlatform(
+        hass, platform=batch_platform
+    )
+    mock_entities["light.bedroom"].platform = MockEntityPlatform(
+        hass, platform=MockPlatform()
+    )
+    mock_entities["light.bedroom"].async_test_method = AsyncMock(
+        return_value={"value": 1}
+    )
+
+    with pytest.raises(exceptions.HomeAssistantError, match="bridge offline"):
+        await service.entity_service_call(
+            hass,
+            mock_entities,
+            "async_test_method",
+            ServiceCall(
+                "test_domain",
+                "test_service",
+                {"entity_id": ["light.kitchen", "light.bedroom"]},
+                return_response=True,
+            ),
+        )
+
+    mock_entities["light.bedroom"].async_test_method.assert_called_once_with()
+
+
+async def test_call_entities_by_platform_results(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test the results, errors and durations of the entities are returned."""
+    batch_platform = MockPlatform()
+    batch_platform.async_handle_batch = AsyncMock(
+        side_effect=exceptions.HomeAssistantError("bridge offline")
+    )
+    mock_entities["light.kitchen"].platform = MockEntityPlatform(
+        hass, platform=batch_platform
+    )
+    mock_entities["light.bedroom"].platform = MockEntityPlatform(
+        hass, platform=MockPlatform()
+    )
+    mock_entities["light.bedroom"].async_test_method = AsyncMock(
+        return_value={"value": 1}
+    )
+
+    results = await service.async_call_entities_by_platform(
+        hass,
+        [mock_entities["light.kitchen"], mock_entities["light.bedroom"]],
+        "async_test_method",
+        {},
+        Context(),
+    )
+
+    assert results.responses == {"light.bedroom": {"value": 1}}
+    assert list(results.errors) == ["light.kitchen"]
+    assert str(results.errors["light.kitchen"]) == "bridge offline"
+    assert results.durations.keys() == {"light.kitchen", "light.bedroom"}
+    assert all(duration >= 0 for duration in results.durations.values())
+
+
+async def test_call_with_platform_batch_handler_parallel_updates(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test a batch is a single request against PARALLEL_UPDATES."""
+    batch_platform = MockPlatform()
+    batch_platform.async_handle_batch = AsyncMock(return_value=None)
+    semaphore = asyncio.Semaphore(1)
+    platform = MockEntityPlatform(hass, platform=batch_platform)
+    for entity in mock_entities.values():
+        entity.platform = platform
+        entity.parallel_updates = semaphore
+
+    async def _handle_batch(*args: Any) -> None:
+        assert semaphore.locked()
+
+    batch_platform.async_handle_batch.side_effect = _handle_batch
+
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        "async_test_method",
+        ServiceCall("test_domain", "test_service", {"entity_id": ENTITY_MATCH_ALL}),
+    )
+
+    assert batch_platform.async_handle_batch.call_count == 1
+    assert not semaphore.locked()
+
+
+async def test_call_with_parallel_service_calls(
+    hass: HomeAssistant, mock_entities
+) -> None:
+    """Test PARALLEL_SERVICE_CALLS limits concurrent calls of a platform."""
+    limited_platform = MockPlatform()
+    limited_platform.PARALLEL_SERVICE_CALLS = 2
+    platform = MockEntityPlatform(hass, platform=limited_platform)
+    running = 0
+    max_running = 0
+
+    async def _test_method() -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    for entity in mock_entities.values():
+        entity.platform = platform
+        entity.async_test_method = _test_method
+
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        "async_test_method",
+        ServiceCall("test_domain", "test_service", {"entity_id": ENTITY_MATCH_ALL}),
+    )
+
+    assert max_running == 2
+
+
 async def test_call_context_user_not_exist(hass: HomeAssistant) -> None:
     """Check we don't allow deleted users to do things."""
     with pytest.raises(exceptions.UnknownUser) as err:
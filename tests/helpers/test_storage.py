@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch
 from freezegun.api import FrozenDateTimeFactory
 import py
 import pytest
+from pytest_unordered import unordered
 
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -20,7 +21,7 @@ from homeassistant.const import (
 from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN, CoreState, HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir, storage
-from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.util import dt as dt_util
 from homeassistant.util.color import RGBColor
 
@@ -664,6 +665,329 @@ async def test_saving_load_round_trip(tmpdir: py.path.local) -> None:
         await hass.async_stop(force=True)
 
 
+async def test_journal_round_trip(tmpdir: py.path.local) -> None:
+    """Test journaled changes are appended and replayed on load."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        data = {
+            "entities": [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}],
+            "deleted_entities": [],
+            "name": "original",
+        }
+        await store.async_save(data)
+
+        def _read_files() -> tuple[str, list[bytes]]:
+            with open(store.path, encoding="utf8") as store_file:
+                snapshot = store_file.read()
+            with open(f"{store.path}.journal", "rb") as journal_file:
+                journal = journal_file.read().splitlines()
+            return snapshot, journal
+
+        snapshot, journal = await hass.async_add_executor_job(_read_files)
+        assert (
+            json.loads(journal[0])["journal_id"] == json.loads(snapshot)["journal_id"]
+        )
+        assert len(journal) == 1
+
+        data = {
+            "entities": [
+                {"id": "a", "name": "A renamed"},
+                {"id": "c", "name": "C"},
+            ],
+            "deleted_entities": [{"id": "b", "name": "B"}],
+            "name": "changed",
+        }
+        await store.async_save(data)
+
+        new_snapshot, journal = await hass.async_add_executor_job(_read_files)
+        # Only the changes are appended to the journal
+        assert new_snapshot == snapshot
+        assert [json.loads(line) for line in journal[1:]] == unordered(
+            [
+                {
+                    "op": "set",
+                    "key": "entities",
+                    "id": "a",
+                    "value": {"id": "a", "name": "A renamed"},
+                },
+                {
+                    "op": "set",
+                    "key": "entities",
+                    "id": "c",
+                    "value": {"id": "c", "name": "C"},
+                },
+                {"op": "remove", "key": "entities", "id": "b"},
+                {
+                    "op": "set",
+                    "key": "deleted_entities",
+                    "value": [{"id": "b", "name": "B"}],
+                },
+                {"op": "set", "key": "name", "value": "changed"},
+            ]
+        )
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == data
+
+        await store2.async_remove()
+        assert not await hass.async_add_executor_job(
+            os.path.exists, f"{store.path}.journal"
+        )
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_incomplete_and_stale(tmpdir: py.path.local) -> None:
+    """Test incomplete changes and stale journals are ignored on load."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        await store.async_save({"items": [{"id": "a", "value": 1}]})
+        await store.async_save({"items": [{"id": "a", "value": 2}]})
+        journal_path = f"{store.path}.journal"
+
+        def _append_incomplete_change() -> None:
+            with open(journal_path, "ab") as journal_file:
+                journal_file.write(b'{"op":"set","key":"items","id":"a","val')
+
+        await hass.async_add_executor_job(_append_incomplete_change)
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == {"items": [{"id": "a", "value": 2}]}
+
+        # Changes are not appended after the incomplete change
+        await store2.async_save({"items": [{"id": "a", "value": 3}]})
+        store2b = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2b.async_load() == {"items": [{"id": "a", "value": 3}]}
+
+        def _make_journal_stale() -> None:
+            with open(journal_path, "wb") as journal_file:
+                journal_file.write(
+                    b'{"journal_id":"stale"}\n'
+                    b'{"op":"set","key":"items","id":"a","value":{"id":"a"}}\n'
+                )
+
+        await hass.async_add_executor_job(_make_journal_stale)
+
+        store3 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store3.async_load() == {"items": [{"id": "a", "value": 3}]}
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_compaction(tmpdir: py.path.local) -> None:
+    """Test the journal is compacted into the storage file once it grows."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        journal_path = f"{store.path}.journal"
+
+        def _read_journal() -> list[bytes]:
+            with open(journal_path, "rb") as journal_file:
+                return journal_file.read().splitlines()
+
+        journal_ids = set()
+        with patch.object(storage, "JOURNAL_COMPACT_MIN_SIZE", 200):
+            for value in range(10):
+                await store.async_save({"items": [{"id": "a", "value": value}]})
+                journal = await hass.async_add_executor_job(_read_journal)
+                journal_ids.add(json.loads(journal[0])["journal_id"])
+                assert len(journal) < 6
+
+        assert len(journal_ids) > 1
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == {"items": [{"id": "a", "value": 9}]}
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_top_level_list(tmpdir: py.path.local) -> None:
+    """Test changes to the items of a top level list are journaled."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        await store.async_save([{"id": "a", "value": 1}, {"id": "b", "value": 1}])
+        await store.async_save([{"id": "a", "value": 2}, {"id": "c", "value": 1}])
+
+        def _read_journal() -> list[bytes]:
+            with open(f"{store.path}.journal", "rb") as journal_file:
+                return journal_file.read().splitlines()
+
+        journal = await hass.async_add_executor_job(_read_journal)
+        assert [json.loads(line) for line in journal[1:]] == unordered(
+            [
+                {"op": "set", "id": "a", "value": {"id": "a", "value": 2}},
+                {"op": "set", "id": "c", "value": {"id": "c", "value": 1}},
+                {"op": "remove", "id": "b"},
+            ]
+        )
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == unordered(
+            [{"id": "a", "value": 2}, {"id": "c", "value": 1}]
+        )
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_continued_after_load(tmpdir: py.path.local) -> None:
+    """Test the first save after loading appends to the existing journal."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        await store.async_save({"items": [{"id": "a", "value": 1}, {"id": "b"}]})
+        await store.async_save({"items": [{"id": "a", "value": 2}, {"id": "b"}]})
+
+        def _read_files() -> tuple[bytes, list[bytes]]:
+            with open(store.path, "rb") as store_file:
+                snapshot = store_file.read()
+            with open(f"{store.path}.journal", "rb") as journal_file:
+                journal = journal_file.read().splitlines()
+            return snapshot, journal
+
+        snapshot, _ = await hass.async_add_executor_job(_read_files)
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == {
+            "items": [{"id": "a", "value": 2}, {"id": "b"}]
+        }
+        await store2.async_save({"items": [{"id": "a", "value": 3}, {"id": "b"}]})
+
+        new_snapshot, journal = await hass.async_add_executor_job(_read_files)
+        assert new_snapshot == snapshot
+        assert [json.loads(line) for line in journal[1:]] == [
+            {"op": "set", "key": "items", "id": "a", "value": {"id": "a", "value": 2}},
+            {"op": "set", "key": "items", "id": "a", "value": {"id": "a", "value": 3}},
+        ]
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_migrated_once(tmpdir: py.path.local) -> None:
+    """Test migrated data is written with the new version and not migrated again."""
+    migrations = 0
+
+    class MigratingStore(storage.Store):
+        async def _async_migrate_func(
+            self, old_major_version, old_minor_version, old_data
+        ):
+            nonlocal migrations
+            migrations += 1
+            return {**old_data, "migrated": True}
+
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(
+            hass, MOCK_VERSION, MOCK_KEY, minor_version=1, journal=True
+        )
+        await store.async_save({"items": [{"id": "a"}]})
+        await store.async_save({"items": [{"id": "a", "value": 1}]})
+
+        for _ in range(2):
+            store2 = MigratingStore(
+                hass, MOCK_VERSION, MOCK_KEY, minor_version=2, journal=True
+            )
+            assert await store2.async_load() == {
+                "items": [{"id": "a", "value": 1}],
+                "migrated": True,
+            }
+        assert migrations == 1
+
+        def _read_snapshot() -> dict[str, Any]:
+            with open(store.path, encoding="utf8") as store_file:
+                return json.load(store_file)
+
+        snapshot = await hass.async_add_executor_job(_read_snapshot)
+        assert snapshot["minor_version"] == 2
+
+        await hass.async_stop(force=True)
+
+
+async def test_journal_json_fragments(tmpdir: py.path.local) -> None:
+    """Test items serialized as JSON fragments are journaled per item."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        await store.async_save(
+            {
+                "items": [
+                    json_fragment(b'{"id":"a","value":1}'),
+                    json_fragment(b'{"id":"b","value":1}'),
+                ]
+            }
+        )
+        await store.async_save(
+            {
+                "items": [
+                    json_fragment(b'{"id":"a","value":1}'),
+                    json_fragment(b'{"id":"b","value":2}'),
+                ]
+            }
+        )
+
+        def _read_journal() -> list[bytes]:
+            with open(f"{store.path}.journal", "rb") as journal_file:
+                return journal_file.read().splitlines()
+
+        journal = await hass.async_add_executor_job(_read_journal)
+        assert [json.loads(line) for line in journal[1:]] == [
+            {"op": "set", "key": "items", "id": "b", "value": {"id": "b", "value": 2}}
+        ]
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == {
+            "items": [{"id": "a", "value": 1}, {"id": "b", "value": 2}]
+        }
+
+        await hass.async_stop(force=True)
+
+
+async def test_compact_encoding(tmpdir: py.path.local) -> None:
+    """Test data is stored in the compact encoding and loaded in either format."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True, compact=True)
+        data = {
+            "items": [
+                {"id": "a", "platform": "hue"},
+                {"id": "b", "platform": "hue"},
+            ],
+            "name": "original",
+        }
+        await store.async_save(data)
+        data["items"][0] = {"id": "a", "platform": "zha"}
+        await store.async_save(data)
+
+        def _read_snapshot() -> dict[str, Any]:
+            with open(store.path, encoding="utf8") as store_file:
+                return json.load(store_file)
+
+        snapshot = await hass.async_add_executor_job(_read_snapshot)
+        assert snapshot["encoding"] == "compact"
+        assert snapshot["data"]["strings"] == ["hue"]
+
+        store2 = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+        assert await store2.async_load() == data
+
+        # Disabling the compact encoding writes plain JSON again
+        await store2.async_save(data)
+        snapshot = await hass.async_add_executor_job(_read_snapshot)
+        assert "encoding" not in snapshot
+        assert snapshot["data"] == data
+
+        await hass.async_stop(force=True)
+
+
 async def test_loading_corrupt_core_file(
     tmpdir: py.path.local, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1110,11 +1434,52 @@ async def test_store_manager_cleanup_after_started(
         # recover the memory
         assert "integration1" not in store_manager._data_preload
         assert "integration2" not in store_manager._data_preload
+        assert store_manager.async_get_preload_timings() == {}
         assert store_manager.async_fetch("integration1") is None
         assert store_manager.async_fetch("integration2") is None
         await hass.async_stop(force=True)
 
 
+async def test_store_manager_preload_concurrently(tmpdir: py.path.local) -> None:
+    """Test preloading many files records their timings and sizes."""
+    loop = asyncio.get_running_loop()
+    contents = {
+        f"integration{index}": json_bytes(
+            {"data": {"index": index}, "version": 1, "key": f"integration{index}"}
+        )
+        for index in range(storage.MAX_LOAD_CONCURRENTLY * 2 + 1)
+    }
+
+    def _setup_mock_storage():
+        config_dir = tmpdir.mkdir("temp_config")
+        tmp_storage = config_dir.mkdir(".storage")
+        for key, content in contents.items():
+            tmp_storage.join(key).write_binary(content)
+        tmp_storage.join("empty").write_binary(b"")
+        return config_dir
+
+    config_dir = await loop.run_in_executor(None, _setup_mock_storage)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store_manager = storage.get_internal_store_manager(hass)
+        await store_manager.async_initialize()
+        await store_manager.async_preload([*contents, "empty", "missing"])
+
+        timings = store_manager.async_get_preload_timings()
+        assert timings.keys() == contents.keys()
+        for key, (started, finished, size) in timings.items():
+            assert finished >= started
+            assert size == len(contents[key])
+            exists, data = store_manager.async_fetch(key)
+            assert exists is True
+            assert data["data"] == {"index": int(key.removeprefix("integration"))}
+
+        # Empty files are left to the store to handle
+        assert store_manager.async_fetch("empty") is None
+
+        await hass.async_stop(force=True)
+
+
 async def test_store_manager_cleanup_after_stop(
     tmpdir: py.path.local, freezer: FrozenDateTimeFactory
 ) -> None:
@@ -0,0 +1,196 @@
+"""Tests for the warm start snapshot helper."""
+
+import asyncio
+from collections.abc import Generator
+import os
+from typing import Any
+from unittest.mock import patch
+import zlib
+
+import py
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import storage, translation, warm_start
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.file import write_utf8_file
+from homeassistant.util.json import json_loads_object
+
+from tests.common import async_test_home_assistant
+
+ENTITIES = [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}]
+AREAS = [{"id": "kitchen", "name": "Kitchen"}]
+
+
+@pytest.fixture(autouse=True)
+def snapshot_storage_keys() -> Generator[None, None, None]:
+    """Snapshot test storage keys instead of the registries."""
+    with patch(
+        "homeassistant.helpers.warm_start.SNAPSHOT_STORAGE_KEYS",
+        ("test.areas", "test.entities"),
+    ):
+        yield
+
+
+class MockRegistry:
+    """Keep the data of a store in memory like a registry."""
+
+    def __init__(self, hass: HomeAssistant, key: str, **kwargs: Any) -> None:
+        """Initialize the registry."""
+        self.store = storage.Store[dict[str, Any]](hass, 1, key, **kwargs)
+        self.data: dict[str, Any] | None = None
+
+    async def async_load(self) -> None:
+        """Load the data and add it to the snapshot."""
+        self.data = await self.store.async_load()
+        storage.get_internal_store_manager(self.store.hass).async_register_snapshot(
+            self.store, lambda: self.data
+        )
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Save the data."""
+        self.data = data
+        await self.store.async_save(data)
+
+
+async def _async_start(
+    hass: HomeAssistant, registries: list[MockRegistry]
+) -> storage._StoreManager:
+    """Restore the snapshot while the registries are loading."""
+    translation.async_setup(hass)
+    await asyncio.gather(
+        warm_start.async_load(hass),
+        *(registry.async_load() for registry in registries),
+    )
+    return storage.get_internal_store_manager(hass)
+
+
+async def test_warm_start_round_trip(tmpdir: py.path.local) -> None:
+    """Test the snapshot is saved on close and restored on the next start."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_config")
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        entities = MockRegistry(hass, "test.entities", journal=True)
+        areas = MockRegistry(hass, "test.areas", compact=True)
+        await _async_start(hass, [entities, areas])
+        await entities.async_save({"entities": ENTITIES[:1]})
+        # The second save is appended to the journal
+        await entities.async_save({"entities": ENTITIES})
+        await areas.async_save({"areas": AREAS})
+        await translation.async_load_integrations(hass, {"light"})
+        await hass.async_stop(force=True)
+
+    def _read_snapshot() -> tuple[dict[str, Any], dict[str, Any]]:
+        with open(config_dir.join(".storage", "core.warm_start").strpath, "rb") as file:
+            header = json_loads_object(file.readline())
+            body = json_loads_object(zlib.decompress(file.read()))
+        return header, body
+
+    header, body = await loop.run_in_executor(None, _read_snapshot)
+    assert header["version"] == warm_start.STORAGE_VERSION
+    assert "storage" not in header
+    assert body["storage"]["test.entities"]["data"] == {"entities": ENTITIES}
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        entities = MockRegistry(hass, "test.entities", journal=True)
+        areas = MockRegistry(hass, "test.areas", compact=True)
+        with patch(
+            "homeassistant.helpers.storage.json_util.load_json"
+        ) as mock_load_json:
+            await _async_start(hass, [entities, areas])
+        # The stores waited for the snapshot instead of reading their files
+        assert not mock_load_json.called
+        assert entities.data == {"entities": ENTITIES}
+        assert areas.data == {"areas": AREAS}
+        assert translation.async_translations_loaded(hass, {"light"})
+
+        await entities.async_save({"entities": ENTITIES[1:]})
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        entities = MockRegistry(hass, "test.entities", journal=True)
+        await _async_start(hass, [entities])
+        assert entities.data == {"entities": ENTITIES[1:]}
+        await hass.async_stop(force=True)
+
+
+async def test_warm_start_validation(tmpdir: py.path.local) -> None:
+    """Test changed files and other versions are not restored."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_config")
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        areas = MockRegistry(hass, "test.areas")
+        await _async_start(hass, [areas])
+        await areas.async_save({"areas": AREAS})
+        await translation.async_load_integrations(hass, {"light"})
+        await hass.async_stop(force=True)
+
+    def _edit_files() -> None:
+        # A new custom integration could override the translations
+        os.mkdir(config_dir.join("custom_components").strpath)
+        write_utf8_file(
+            config_dir.join(".storage", "test.areas").strpath,
+            json_bytes({"version": 1, "data": {"areas": []}}),
+            mode="wb",
+        )
+
+    await loop.run_in_executor(None, _edit_files)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        areas = MockRegistry(hass, "test.areas")
+        await _async_start(hass, [areas])
+        assert areas.data == {"areas": []}
+        assert not translation.async_translations_loaded(hass, {"light"})
+        await translation.async_load_integrations(hass, {"light"})
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        areas = MockRegistry(hass, "test.areas")
+        with patch(
+            "homeassistant.helpers.storage.json_util.load_json"
+        ) as mock_load_json:
+            await _async_start(hass, [areas])
+        assert not mock_load_json.called
+        assert areas.data == {"areas": []}
+        assert translation.async_translations_loaded(hass, {"light"})
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        areas = MockRegistry(hass, "test.areas")
+        with patch("homeassistant.helpers.warm_start.__version__", "1.0.0"):
+            await _async_start(hass, [areas])
+        assert areas.data == {"areas": []}
+        assert not translation.async_translations_loaded(hass, {"light"})
+        await hass.async_stop(force=True)
+
+
+async def test_warm_start_invalid_snapshot(
+    tmpdir: py.path.local, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the stores are loaded from their files if the snapshot is invalid."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_config")
+
+    def _write_files() -> None:
+        os.mkdir(config_dir.join(".storage").strpath)
+        write_utf8_file(
+            config_dir.join(".storage", "test.areas").strpath,
+            json_bytes({"version": 1, "data": {"areas": AREAS}}),
+            mode="wb",
+        )
+        write_utf8_file(
+            config_dir.join(".storage", "core.warm_start").strpath,
+            b'{"version":1}\nnot compressed',
+            mode="wb",
+        )
+
+    await loop.run_in_executor(None, _write_files)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        areas = MockRegistry(hass, "test.areas")
+        await _async_start(hass, [areas])
+        assert areas.data == {"areas": AREAS}
+        assert "Ignoring invalid warm start snapshot" in caplog.text
+        await hass.async_stop(force=True)
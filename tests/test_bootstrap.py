@@ -122,6 +122,26 @@ async def test_preload_translations(hass: HomeAssistant) -> None:
     assert async_translations_loaded(hass, BASE_PLATFORMS)
 
 
+@pytest.mark.parametrize("load_registries", [False])
+@pytest.mark.parametrize("preimport_integrations", [False, True])
+async def test_preimport_integrations(
+    hass: HomeAssistant, preimport_integrations: bool
+) -> None:
+    """Test integrations are only pre-imported when enabled."""
+    hass.config.preimport_integrations = preimport_integrations
+    with patch(
+        "homeassistant.loader.async_preimport_integrations",
+        return_value=loader.PreImportStats(),
+    ) as mock_preimport:
+        await bootstrap._async_set_up_integrations(hass, {"group": {}})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert mock_preimport.called is preimport_integrations
+    if preimport_integrations:
+        integrations = mock_preimport.call_args[0][1]
+        assert "group" in {integration.domain for integration in integrations}
+
+
 async def test_core_failure_loads_recovery_mode(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -10,6 +10,7 @@ from typing import Any
 from unittest import mock
 from unittest.mock import AsyncMock, Mock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from syrupy.assertion import SnapshotAssertion
 import voluptuous as vol
@@ -61,6 +62,7 @@ from .common import (
     MockModule,
     MockPlatform,
     MockUser,
+    async_fire_time_changed,
     get_test_config_dir,
     mock_integration,
     mock_platform,
@@ -1084,6 +1086,42 @@ async def test_async_hass_config_yaml_merge(
     assert len(conf["light"]) == 1
 
 
+@pytest.mark.parametrize(
+    "hass_config_yaml_files",
+    [
+        {
+            YAML_PATH: "light: !include light.yaml\nsensor: !secret sensor\n",
+            SECRET_PATH: "sensor:\n  - platform: demo\n",
+            os.path.join(CONFIG_DIR, "light.yaml"): "- platform: test\n",
+        }
+    ],
+)
+async def test_async_hass_config_yaml_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    mock_hass_config_yaml: None,
+) -> None:
+    """Test included files are cached across config reloads and restarts."""
+    conf = await config_util.async_hass_config_yaml(hass)
+    assert conf["light"] == [{"platform": "test"}]
+    assert conf["sensor"] == [{"platform": "demo"}]
+
+    freezer.tick(config_util.YAML_CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    entries = hass_storage[config_util.YAML_CACHE_STORAGE_KEY]["data"]["entries"]
+    assert len(entries) == 1
+
+    # The cache is loaded from storage again after a restart
+    hass.data.pop(config_util.DATA_YAML_CACHE)
+    assert await config_util.async_hass_config_yaml(hass) == conf
+    yaml_cache = hass.data[config_util.DATA_YAML_CACHE].cache
+    assert yaml_cache.hits == 1
+    assert yaml_cache.misses == 1
+    assert conf["light"][0].__config_file__ == os.path.join(CONFIG_DIR, "light.yaml")
+
+
 @pytest.fixture
 def merge_log_err(hass):
     """Patch _merge_log_error from packages."""
@@ -2,21 +2,30 @@
 
 import asyncio
 import os
+import pathlib
 import sys
 import threading
+from types import ModuleType
 from typing import Any
 from unittest.mock import MagicMock, Mock, patch
 
 from awesomeversion import AwesomeVersion
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.const import __version__
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import frame
 
-from .common import MockModule, async_get_persistent_notifications, mock_integration
+from .common import (
+    MockModule,
+    async_fire_time_changed,
+    async_get_persistent_notifications,
+    mock_integration,
+)
 
 
 async def test_circular_component_dependencies(hass: HomeAssistant) -> None:
@@ -1869,3 +1878,128 @@ async def test_hass_helpers_use_reported(
             "Detected that custom integration 'test_integration_frame' "
             "accesses hass.helpers.aiohttp_client. This is deprecated"
         ) in caplog.text
+
+
+async def test_integration_index(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test manifests and files are loaded from the index after a restart."""
+    await loader.async_load_integration_index(hass)
+    integration = await loader.async_get_integration(hass, "hue")
+
+    freezer.tick(loader.INTEGRATION_INDEX_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    data = hass_storage[loader.INTEGRATION_INDEX_STORAGE_KEY]["data"]
+    assert data["version"] == __version__
+    assert str(integration.file_path) in data["integrations"]
+
+    # Simulate a restart
+    hass.data[loader.DATA_INTEGRATIONS] = {}
+    hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+    await loader.async_load_integration_index(hass)
+    with (
+        patch("homeassistant.loader.json_loads") as mock_json_loads,
+        patch("homeassistant.loader.os.listdir") as mock_listdir,
+    ):
+        cached_integration = await loader.async_get_integration(hass, "hue")
+    assert mock_json_loads.call_count == 0
+    assert mock_listdir.call_count == 0
+    assert cached_integration.manifest == integration.manifest
+    assert cached_integration.platforms_exists(["light", "missing"]) == ["light"]
+
+    # The index is discarded after an update
+    hass_storage[loader.INTEGRATION_INDEX_STORAGE_KEY]["data"]["version"] = "1.0.0"
+    hass.data[loader.DATA_INTEGRATIONS] = {}
+    hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+    await loader.async_load_integration_index(hass)
+    with patch("homeassistant.loader.os.listdir", wraps=os.listdir) as mock_listdir:
+        await loader.async_get_integration(hass, "hue")
+    assert mock_listdir.call_count == 1
+
+
+async def test_integration_index_validation(
+    hass: HomeAssistant, hass_storage: dict[str, Any], tmp_path: pathlib.Path
+) -> None:
+    """Test index entries are refreshed when the files were changed."""
+    index = loader.IntegrationIndex(hass)
+    file_path = tmp_path / "test"
+    file_path.mkdir()
+    manifest_path = file_path / "manifest.json"
+    manifest_path.write_text('{"domain": "test", "name": "Test"}')
+    assert index.load_integration(file_path) == (
+        {"domain": "test", "name": "Test"},
+        ["manifest.json"],
+    )
+
+    manifest_path.write_text('{"domain": "test", "name": "Changed"}')
+    mtime = manifest_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(manifest_path, ns=(mtime, mtime))
+    assert index.load_integration(file_path) == (
+        {"domain": "test", "name": "Changed"},
+        ["manifest.json"],
+    )
+
+    (file_path / "light.py").touch()
+    dir_mtime = file_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(file_path, ns=(dir_mtime, dir_mtime))
+    manifest, files = index.load_integration(file_path)
+    assert manifest["name"] == "Changed"
+    assert sorted(files) == ["light.py", "manifest.json"]
+
+    manifest_path.unlink()
+    assert index.load_integration(file_path) is None
+    assert index.load_integration(tmp_path / "missing") is None
+
+
+async def test_plan_preimport(hass: HomeAssistant) -> None:
+    """Test integrations are imported after their dependencies."""
+    integrations = [
+        mock_integration(hass, MockModule("mod1")),
+        mock_integration(hass, MockModule("mod2", ["mod1"])),
+        mock_integration(hass, MockModule("mod3", ["mod1", "mod2", "not_loaded"])),
+        mock_integration(hass, MockModule("mod4")),
+        mock_integration(hass, MockModule("circular1", ["circular2"])),
+        mock_integration(hass, MockModule("circular2", ["circular1"])),
+        mock_integration(
+            hass, MockModule("loop", partial_manifest={"import_executor": False})
+        ),
+    ]
+
+    waves = loader.plan_preimport(integrations)
+    assert [[integration.domain for integration in wave] for wave in waves] == [
+        ["circular2", "mod1", "mod4"],
+        ["circular1", "mod2"],
+        ["mod3"],
+    ]
+
+
+async def test_preimport_integrations(hass: HomeAssistant) -> None:
+    """Test integrations and their platforms are pre-imported."""
+    integration = await loader.async_get_integration(hass, "hue")
+    failing = mock_integration(hass, MockModule("failing"))
+    with patch.object(failing, "get_component", side_effect=ImportError):
+        stats = await loader.async_preimport_integrations(
+            hass, [integration, failing], {"hue": {"light"}}
+        )
+
+    assert stats.failed == 1
+    assert hass.data[loader.DATA_COMPONENTS]["hue"] is hue
+    assert integration.get_platform_cached("light") is hue_light
+    assert integration.get_platform_cached("config_flow") is not None
+
+
+def test_preimport_contended_module() -> None:
+    """Test imports waiting for an import in another thread are counted."""
+    stats = loader.PreImportStats()
+    module = ModuleType("test_contended")
+    module.__spec__ = Mock(_initializing=True)
+    with patch.dict(sys.modules, {"test_contended": module}):
+        assert loader._preimport_module(stats, "test_contended", lambda: None)
+    assert stats.contended == 1
+    assert stats.modules == 0
+
+    assert loader._preimport_module(stats, "test_not_imported", lambda: None)
+    assert stats.modules == 1
@@ -1110,6 +1110,62 @@ async def test_async_get_setup_timings(hass) -> None:
     }
 
 
+async def test_async_get_setup_critical_path(hass: HomeAssistant) -> None:
+    """Test the critical path follows the slowest dependency chain."""
+    hass.set_state(CoreState.not_running)
+    slow_dep_done = asyncio.Event()
+
+    async def _slow_setup(hass: HomeAssistant, config: dict) -> bool:
+        await slow_dep_done.wait()
+        return True
+
+    mock_integration(hass, MockModule("fast_dep"))
+    mock_integration(hass, MockModule("slow_dep", async_setup=_slow_setup))
+    mock_integration(
+        hass, MockModule("top_level", dependencies=["fast_dep", "slow_dep"])
+    )
+
+    setup_task = hass.async_create_task(
+        setup.async_setup_component(hass, "top_level", {})
+    )
+    await asyncio.sleep(0.01)
+    slow_dep_done.set()
+    assert await setup_task
+
+    timeline = setup.async_get_setup_timeline(hass)
+    phases = {(span.integration, span.phase) for span in timeline}
+    assert ("top_level", setup.SetupPhases.WAIT_DEPENDENCIES) in phases
+    assert ("top_level", setup.SetupPhases.IMPORT) in phases
+    assert ("slow_dep", setup.SetupPhases.SETUP) in phases
+    assert all(span.end >= span.start for span in timeline)
+
+    critical_path = setup.async_get_setup_critical_path(hass)
+    assert [step["domain"] for step in critical_path] == ["slow_dep", "top_level"]
+    assert critical_path[0]["phases"][setup.SetupPhases.SETUP] > 0
+    assert critical_path[1]["start"] <= critical_path[0]["end"]
+
+    trace = setup.async_get_setup_trace_events(hass)
+    thread_names = {
+        event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"
+    }
+    assert thread_names == {"top_level", "fast_dep", "slow_dep"}
+    complete_events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete_events) == len(timeline)
+    assert min(event["ts"] for event in complete_events) == 0
+
+
+async def test_async_get_setup_critical_path_empty(hass: HomeAssistant) -> None:
+    """Test nothing is recorded once running."""
+    mock_integration(hass, MockModule("comp"))
+    assert await setup.async_setup_component(hass, "comp", {})
+    assert setup.async_get_setup_timeline(hass) == []
+    assert setup.async_get_setup_critical_path(hass) == []
+    assert setup.async_get_setup_trace_events(hass) == {
+        "traceEvents": [],
+        "displayTimeUnit": "ms",
+    }
+
+
 async def test_setup_config_entry_from_yaml(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
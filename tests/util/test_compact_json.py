@@ -0,0 +1,50 @@
+"""Test Home Assistant compact JSON encoding util methods."""
+
+from homeassistant.util import compact_json
+
+from tests.common import json_round_trip
+
+
+def test_round_trip_tables() -> None:
+    """Test lists of dicts with the same keys are stored as columns."""
+    data = {
+        "entities": [
+            {
+                "id": f"id_{index}",
+                "platform": "hue" if index % 2 else "zha",
+                "config_entry_id": "entry_1",
+                "name": None if index % 3 else f"Name {index}",
+                "options": {"sensor": {"display_precision": index}},
+                "aliases": ["alias"],
+            }
+            for index in range(10)
+        ],
+        "deleted_entities": [],
+    }
+
+    encoded = json_round_trip(compact_json.encode(data))
+    assert encoded["items"]["entities"]["interned"] == ["platform", "config_entry_id"]
+    assert encoded["items"]["deleted_entities"] == {"value": []}
+    assert sorted(encoded["strings"]) == ["entry_1", "hue", "zha"]
+
+    decoded = compact_json.decode(encoded)
+    assert decoded == data
+    assert list(decoded["entities"][0]) == list(data["entities"][0])
+
+
+def test_round_trip_mixed_values() -> None:
+    """Test values which can't be stored as tables are kept as they are."""
+    data = {
+        "mixed_keys": [{"id": "a", "name": "A"}, {"name": "B", "id": "b"}],
+        "not_dicts": [{"id": "a"}, "b"],
+        "mixed_types": [{"value": "a"}, {"value": "a"}, {"value": 1}],
+        "string": "value",
+        "none": None,
+    }
+
+    encoded = json_round_trip(compact_json.encode(data))
+    assert encoded["items"]["mixed_keys"] == {"value": data["mixed_keys"]}
+    assert encoded["items"]["not_dicts"] == {"value": data["not_dicts"]}
+    assert encoded["items"]["mixed_types"]["interned"] == []
+    assert compact_json.decode(encoded) == data
+    assert compact_json.decode({"strings": [], "items": {}}) == {}
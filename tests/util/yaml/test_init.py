@@ -19,7 +19,12 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util import yaml
 from homeassistant.util.yaml import loader as yaml_loader
 
-from tests.common import extract_stack_to_frame, get_test_config_dir, patch_yaml_files
+from tests.common import (
+    extract_stack_to_frame,
+    get_test_config_dir,
+    json_round_trip,
+    patch_yaml_files,
+)
 
 
 @pytest.fixture(params=["enable_c_loader", "disable_c_loader"])
@@ -729,3 +734,115 @@ def test_load_yaml_dict_fail(try_both_loaders, mock_hass_config_yaml: None) -> N
     """Test item without a key."""
     with pytest.raises(yaml_loader.YamlTypeError):
         yaml_loader.load_yaml_dict(YAML_CONFIG_FILE)
+
+
+def test_parsed_yaml_cache(try_both_loaders, tmp_path: pathlib.Path) -> None:
+    """Test files are parsed once and cached with their annotations."""
+    (tmp_path / "automations").mkdir()
+    for idx in range(3):
+        (tmp_path / "automations" / f"{idx}.yaml").write_text(
+            f"- alias: automation {idx}\n  trigger:\n    - platform: state\n"
+            f"  action: !input action\n  mode: {idx}\n"
+        )
+    (tmp_path / "automations" / "env.yaml").write_text("- alias: !env_var ALIAS\n")
+    config_path = tmp_path / YAML_CONFIG_FILE
+    config_path.write_text("automation: !include_dir_merge_list automations\n")
+
+    cache = yaml.ParsedYamlCache()
+    with patch.dict(os.environ, {"ALIAS": "env"}):
+        doc = yaml.load_yaml_dict(str(config_path), cache=cache)
+    assert cache.hits == 0
+    assert cache.misses == 5
+    assert len(cache.entries) == 3
+    assert cache.prune() is True
+
+    # A cache loaded from storage returns the same result
+    cache = yaml.ParsedYamlCache(json_round_trip(cache.entries))
+    with patch.dict(os.environ, {"ALIAS": "env"}):
+        cached_doc = yaml.load_yaml_dict(str(config_path), cache=cache)
+    assert cache.hits == 3
+    assert cache.misses == 2
+    assert cached_doc == doc
+    assert [item["alias"] for item in cached_doc["automation"]] == [
+        "automation 0",
+        "automation 1",
+        "automation 2",
+        "env",
+    ]
+    automation = cached_doc["automation"][1]
+    assert automation["action"] == yaml.Input("action")
+    assert automation["mode"] == 1
+    for node, line in (
+        (automation, 1),
+        (automation["alias"], 1),
+        (automation["trigger"], 3),
+        (automation["trigger"][0]["platform"], 3),
+    ):
+        assert node.__config_file__ == str(tmp_path / "automations" / "1.yaml")
+        assert node.__line__ == line
+    assert cache.prune() is False
+
+    # Files which changed are parsed again and the old entries are dropped
+    (tmp_path / "automations" / "0.yaml").write_text("- alias: changed\n")
+    with patch.dict(os.environ, {"ALIAS": "env"}):
+        doc = yaml.load_yaml_dict(str(config_path), cache=cache)
+    assert doc["automation"][0] == {"alias": "changed"}
+    assert cache.hits == 5
+    assert len(cache.entries) == 4
+    assert cache.prune() is True
+    assert len(cache.entries) == 3
+
+
+@pytest.mark.parametrize(
+    "content", ["key: 2024-01-01", "key: .inf", "key: !!binary aGVsbG8=", "{}"]
+)
+def test_parsed_yaml_cache_skips_unsupported_values(
+    tmp_path: pathlib.Path, content: str
+) -> None:
+    """Test files with values which can't be stored are not cached."""
+    path = tmp_path / "test.yaml"
+    path.write_text(content)
+    cache = yaml.ParsedYamlCache()
+    assert yaml.load_yaml(str(path), cache=cache) == yaml.load_yaml(str(path))
+    assert cache.entries == {} or content == "{}"
+
+
+def test_nested_include_dirs_share_one_pool(
+    try_both_loaders, tmp_path: pathlib.Path
+) -> None:
+    """Test nested included directories with secrets are loaded on one pool."""
+    (tmp_path / "secrets.yaml").write_text("password: config_secret\n")
+    packages = tmp_path / "packages"
+    packages.mkdir()
+    for idx in range(3):
+        package = tmp_path / "automations" / f"package_{idx}"
+        package.mkdir(parents=True)
+        (packages / f"package_{idx}.yaml").write_text(
+            f"automation: !include_dir_list ../automations/package_{idx}\n"
+        )
+        for automation in range(3):
+            (package / f"{automation}.yaml").write_text(
+                f"alias: automation {idx}.{automation}\npassword: !secret password\n"
+            )
+    (tmp_path / "automations" / "package_1" / "secrets.yaml").write_text(
+        "password: package_secret\n"
+    )
+    config_path = tmp_path / YAML_CONFIG_FILE
+    config_path.write_text("homeassistant:\n  packages: !include_dir_named packages\n")
+
+    secrets = yaml.Secrets(tmp_path)
+    cache = yaml.ParsedYamlCache()
+    with patch.object(
+        yaml_loader, "ThreadPoolExecutor", wraps=yaml_loader.ThreadPoolExecutor
+    ) as mock_executor:
+        doc = yaml.load_yaml_dict(str(config_path), secrets, cache)
+    assert mock_executor.call_count == 1
+
+    packages_conf = doc["homeassistant"]["packages"]
+    assert list(packages_conf) == ["package_0", "package_1", "package_2"]
+    for idx, package_conf in enumerate(packages_conf.values()):
+        password = "package_secret" if idx == 1 else "config_secret"
+        assert package_conf["automation"] == [
+            {"alias": f"automation {idx}.{automation}", "password": password}
+            for automation in range(3)
+        ]